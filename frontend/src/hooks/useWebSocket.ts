@@ -6,7 +6,9 @@ import type { Agent, Task, Lease, Message, LodestarEvent } from '../types'
 interface WsUpdateMessage {
   type: 'update'
   scope: 'agents' | 'tasks' | 'leases' | 'messages' | 'events'
+  repo?: string | null
   data: unknown
+  version?: number | null
   timestamp: string
 }
 
@@ -14,6 +16,7 @@ interface WsConnectedMessage {
   type: 'connected'
   client_id: string
   subscriptions: string[]
+  epoch?: string | null
   timestamp: string
 }
 
@@ -86,6 +89,9 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectAttemptsRef = useRef(0)
   const reconnectTimeoutRef = useRef<number | null>(null)
+  // Scope versions held, sent back on reconnect so only missed updates are resent
+  const epochRef = useRef<string | null>(null)
+  const versionsRef = useRef<Record<string, number>>({})
 
   const [connectionState, setConnectionState] = useState<'connecting' | 'connected' | 'disconnected'>('disconnected')
   const [error, setError] = useState<string | null>(null)
@@ -111,6 +117,14 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
         case 'update': {
           const updateMsg = message as WsUpdateMessage
           store.updateLastSync()
+          if (updateMsg.repo && typeof updateMsg.version === 'number') {
+            const versionKey = `${updateMsg.repo}:${updateMsg.scope}`
+            // Never replace newer data with an older snapshot
+            if (updateMsg.version < (versionsRef.current[versionKey] ?? 0)) {
+              break
+            }
+            versionsRef.current[versionKey] = updateMsg.version
+          }
 
           // Validate data is an array
           const data = updateMsg.data
@@ -142,9 +156,16 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
         }
 
         // Connection acknowledgment
-        case 'connected':
-          console.log('WebSocket connected with client ID:', (message as WsConnectedMessage).client_id)
+        case 'connected': {
+          const connectedMsg = message as WsConnectedMessage
+          console.log('WebSocket connected with client ID:', connectedMsg.client_id)
+          // Versions from an earlier server run cannot be resumed
+          if (connectedMsg.epoch !== epochRef.current) {
+            epochRef.current = connectedMsg.epoch ?? null
+            versionsRef.current = {}
+          }
           break
+        }
 
         // Subscription acknowledgment
         case 'subscribed':
@@ -252,8 +273,14 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
         store.setConnectionError(null)
         store.setReconnectAttempts(0)
 
-        // Subscribe to all data scopes for real-time updates
-        ws.send(JSON.stringify({ type: 'subscribe', scopes: ['all'] }))
+        // Subscribe to all data scopes for real-time updates, resuming from
+        // the versions already held after a reconnect
+        ws.send(JSON.stringify({
+          type: 'subscribe',
+          scopes: ['all'],
+          resume: versionsRef.current,
+          epoch: epochRef.current,
+        }))
       }
 
       ws.onmessage = handleMessage
@@ -0,0 +1,9 @@
+"""Benchmarks for lsspy against synthetic Lodestar repositories.
+
+Run ``python -m lsspy.bench --help`` for the command line interface.
+"""
+
+from lsspy.bench.generate import generate_repo
+from lsspy.bench.suite import compare_results, load_results, run_benchmarks
+
+__all__ = ["compare_results", "generate_repo", "load_results", "run_benchmarks"]
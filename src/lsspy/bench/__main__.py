@@ -0,0 +1,209 @@
+"""Command line interface of the benchmarks (``python -m lsspy.bench run|load|imports|memory``)."""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from lsspy.bench.generate import generate_repo
+from lsspy.bench.imports import IMPORT_BUDGET_MS, bench_imports
+from lsspy.bench.load import run_load
+from lsspy.bench.memory import bench_memory
+from lsspy.bench.suite import compare_results, load_results, run_benchmarks
+
+app = typer.Typer(
+    help="Benchmark lsspy against a synthetic Lodestar repository", add_completion=False
+)
+console = Console(stderr=True)
+
+
+def _write(results: dict[str, object], output: Path | None) -> None:
+    """Print results as JSON, or write them to a file."""
+    text = json.dumps(results, indent=2)
+    if output is None:
+        print(text)
+    else:
+        output.write_text(text + "\n", encoding="utf-8")
+        console.print(f"Results written to {output}")
+
+
+@app.command()
+def run(
+    path: Path | None = typer.Argument(
+        None,
+        help="Existing .lodestar directory (or its parent) to benchmark instead of a generated one",
+    ),
+    tasks: int = typer.Option(10_000, "--tasks", help="Tasks in the generated spec"),
+    events: int = typer.Option(100_000, "--events", help="Events in the generated database"),
+    agents: int = typer.Option(1_000, "--agents", help="Agents in the generated database"),
+    messages: int = typer.Option(5_000, "--messages", help="Messages in the generated database"),
+    leases: int = typer.Option(500, "--leases", help="Leases in the generated database"),
+    seed: int = typer.Option(0, "--seed", help="Random seed of the generated repository"),
+    repeat: int = typer.Option(5, "--repeat", "-r", min=1, help="Timed runs per benchmark"),
+    clients: int = typer.Option(
+        100, "--clients", min=1, help="Simulated WebSocket clients for the fan-out benchmark"
+    ),
+    only: list[str] | None = typer.Option(
+        None, "--only", help="Benchmark group to run (readers, gather, api, fanout); repeatable"
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write the JSON results here instead of stdout"
+    ),
+    compare: Path | None = typer.Option(
+        None, "--compare", help="Earlier results file to compare median times against"
+    ),
+    threshold: float = typer.Option(
+        1.25,
+        "--threshold",
+        help="With --compare, exit with status 1 if a benchmark got slower than this ratio",
+    ),
+) -> None:
+    """Generate a repository, benchmark it and write the results as JSON."""
+    groups = tuple(only) if only else ("readers", "gather", "api", "fanout")
+    with tempfile.TemporaryDirectory(prefix="lsspy-bench-") as tmp:
+        if path is None:
+            sizes: dict[str, Any] = {
+                "tasks": tasks,
+                "events": events,
+                "agents": agents,
+                "messages": messages,
+                "leases": leases,
+                "seed": seed,
+            }
+            console.print(f"Generating repository: {sizes}")
+            started = time.perf_counter()
+            lodestar_dir = generate_repo(Path(tmp), **sizes)
+            parameters: dict[str, object] = {
+                **sizes,
+                "generate_seconds": time.perf_counter() - started,
+            }
+        else:
+            lodestar_dir = path if path.name == ".lodestar" else path / ".lodestar"
+            parameters = {"path": str(lodestar_dir.absolute())}
+
+        console.print(f"Running benchmarks: {', '.join(groups)}")
+        try:
+            results = run_benchmarks(lodestar_dir, repeat, clients, groups, parameters)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(2) from e
+
+    _write(results, output)
+
+    if compare is not None:
+        baseline = load_results(compare)
+        ratios = compare_results(baseline, results)
+        table = Table("Benchmark", "Baseline ms", "Current ms", "Ratio")
+        for name, ratio in ratios.items():
+            style = "red" if ratio > threshold else ""
+            table.add_row(
+                name,
+                f"{baseline['results'][name]['median_ms']:.2f}",
+                f"{results['results'][name]['median_ms']:.2f}",
+                f"[{style}]{ratio:.2f}x[/{style}]" if style else f"{ratio:.2f}x",
+            )
+        console.print(table)
+        if any(ratio > threshold for ratio in ratios.values()):
+            raise typer.Exit(1)
+
+
+@app.command()
+def load(
+    duration: float = typer.Option(10.0, "--duration", "-d", help="Seconds the writer runs"),
+    clients: int = typer.Option(
+        50, "--clients", min=1, help="Simulated WebSocket clients subscribed to all"
+    ),
+    event_rate: float = typer.Option(20.0, "--event-rate", help="Events inserted per second"),
+    lease_rate: float = typer.Option(5.0, "--lease-rate", help="Lease renewals per second"),
+    spec_rate: float = typer.Option(0.5, "--spec-rate", help="spec.yaml rewrites per second"),
+    tasks: int = typer.Option(200, "--tasks", help="Tasks in the generated spec"),
+    seed: int = typer.Option(0, "--seed", help="Random seed"),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write the JSON report here instead of stdout"
+    ),
+) -> None:
+    """Drive a fake Lodestar writer against a watched repository and report client latency."""
+    console.print(
+        f"Writing {event_rate:g} events, {lease_rate:g} lease renewals and {spec_rate:g} spec "
+        f"rewrites per second for {duration:g}s to {clients} clients"
+    )
+    report = run_load(duration, clients, event_rate, lease_rate, spec_rate, tasks, seed)
+    _write(report, output)
+    latency = report["latency"]
+    if latency["runs"]:
+        console.print(
+            f"Change to client latency: median {latency['median_ms']:.1f}ms, "
+            f"p95 {latency['p95_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms; "
+            f"dropped updates: {report['dropped_updates']}"
+        )
+
+
+@app.command()
+def imports(
+    module: str = typer.Option("lsspy.cli", "--module", help="Module to import"),
+    repeat: int = typer.Option(5, "--repeat", "-r", min=1, help="Timed interpreter runs"),
+    budget_ms: float = typer.Option(
+        IMPORT_BUDGET_MS, "--budget-ms", help="Median import time allowed in milliseconds"
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write the JSON results here instead of stdout"
+    ),
+) -> None:
+    """Time importing the CLI (python -X importtime); exit with status 1 over budget."""
+    results = bench_imports(module, repeat, budget_ms)
+    _write(results, output)
+
+    table = Table("Direct import", "Cumulative ms", "Self ms")
+    for entry in results["slowest_imports"]:
+        table.add_row(entry["module"], f"{entry['cumulative_ms']:.1f}", f"{entry['self_ms']:.1f}")
+    console.print(table)
+    median = results["results"][f"import.{module}"]["median_ms"]
+    console.print(f"import {module}: median {median:.1f}ms (budget {budget_ms:g}ms)")
+    if results["heavy_modules"]:
+        console.print(f"[red]Loaded at import: {', '.join(results['heavy_modules'])}[/red]")
+    if not results["within_budget"] or results["heavy_modules"]:
+        raise typer.Exit(1)
+
+
+@app.command()
+def memory(
+    tasks: int = typer.Option(10_000, "--tasks", help="Tasks in the generated spec"),
+    events: int = typer.Option(100_000, "--events", help="Events in the generated database"),
+    seed: int = typer.Option(0, "--seed", help="Random seed of the generated repository"),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write the JSON results here instead of stdout"
+    ),
+) -> None:
+    """Measure the memory of cached tasks and events, as JSON dicts and as compact tables."""
+    console.print(f"Measuring {tasks} tasks and {events} events")
+    results = bench_memory(tasks, events, seed)
+    _write(results, output)
+
+    table = Table("Scope", "Layout", "Rows", "Retained MB", "Bytes/row", "RSS growth MB")
+    for name, result in results["results"].items():
+        _, scope, layout = name.split(".")
+        rss = result["rss_mb"]
+        per_row = result["bytes_per_row"]
+        table.add_row(
+            scope,
+            layout,
+            str(result["rows"]),
+            f"{result['retained_mb']:.1f}",
+            "-" if per_row is None else f"{per_row:.0f}",
+            "-" if rss is None else f"{rss:.1f}",
+        )
+    console.print(table)
+
+
+def main() -> None:
+    """Main entry point."""
+    app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Synthetic Lodestar repositories for benchmarks.
+
+Generates a ``.lodestar`` directory shaped like a busy real one: a spec with
+a dependency DAG, and a runtime database with agents, leases, task messages
+and a long event log, all following the schema lsspy reads.
+"""
+
+import json
+import random
+import sqlite3
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+
+TASK_STATUSES = ("todo", "ready", "blocked", "done", "verified", "deleted")
+TASK_STATUS_WEIGHTS = (20, 25, 10, 25, 18, 2)
+EVENT_TYPES = (
+    "task.claimed",
+    "task.released",
+    "task.done",
+    "task.verified",
+    "agent.joined",
+    "agent.heartbeat",
+    "message.sent",
+)
+LABELS = ("backend", "frontend", "api", "docs", "testing", "infra", "bug", "feature")
+ROLES = ("code-review", "implementer", "tester", "planner", "")
+
+# Rows per executemany batch when filling the runtime database
+INSERT_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE agents (
+    agent_id TEXT PRIMARY KEY,
+    display_name TEXT DEFAULT '',
+    role TEXT DEFAULT '',
+    created_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    capabilities TEXT DEFAULT '[]',
+    session_meta TEXT DEFAULT '{}'
+);
+CREATE TABLE leases (
+    lease_id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL
+);
+CREATE TABLE messages (
+    message_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    from_agent_id TEXT NOT NULL,
+    to_type TEXT NOT NULL,
+    to_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    meta TEXT DEFAULT '{}',
+    read_by TEXT DEFAULT '[]'
+);
+CREATE TABLE events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    agent_id TEXT,
+    task_id TEXT,
+    target_agent_id TEXT,
+    correlation_id TEXT,
+    data TEXT DEFAULT '{}'
+);
+"""
+
+
+def _timestamp(moment: datetime) -> str:
+    """Format a time the way Lodestar stores it."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _task_id(index: int) -> str:
+    """Format a task ID."""
+    return f"T{index:06d}"
+
+
+def _agent_id(index: int) -> str:
+    """Format an agent ID."""
+    return f"A{index:05d}"
+
+
+def generate_spec(tasks: int, rng: random.Random, now: datetime) -> dict[str, Any]:
+    """Build spec.yaml contents with a dependency DAG.
+
+    Tasks only depend on earlier tasks (up to three from the previous 200),
+    so the graph is acyclic with chains as deep as real plans get.
+
+    Args:
+        tasks: Number of tasks
+        rng: Random source
+        now: Reference time for creation dates
+
+    Returns:
+        Spec dictionary
+    """
+    spec_tasks: dict[str, dict[str, Any]] = {}
+    for index in range(1, tasks + 1):
+        window = range(max(1, index - 200), index)
+        depends_on = sorted(rng.sample(window, min(len(window), rng.choice((0, 0, 1, 2, 3)))))
+        created = now - timedelta(days=30, minutes=-index)
+        task: dict[str, Any] = {
+            "title": f"Task {index}: implement part {index % 97} of component {index % 31}",
+            "description": f"Generated task {index}. " * rng.randint(1, 8),
+            "status": rng.choices(TASK_STATUSES, TASK_STATUS_WEIGHTS)[0],
+            "priority": rng.randint(1, 5),
+            "labels": rng.sample(LABELS, rng.randint(0, 3)),
+            "locks": [f"file:src/module_{index % 400}.py"] if rng.random() < 0.3 else [],
+            "dependsOn": [_task_id(dep) for dep in depends_on],
+            "createdAt": _timestamp(created),
+            "updatedAt": _timestamp(created + timedelta(hours=rng.randint(0, 48))),
+        }
+        if rng.random() < 0.1:
+            task["prdSource"] = "PRD.md"
+        spec_tasks[_task_id(index)] = task
+    return {"project": {"name": "benchmark"}, "tasks": spec_tasks}
+
+
+def _agent_rows(agents: int, rng: random.Random, now: datetime) -> Iterator[tuple[Any, ...]]:
+    """Yield agent rows."""
+    for index in range(1, agents + 1):
+        # About a third have been seen recently enough to count as online
+        seen = now - timedelta(minutes=rng.choice((1, 5, 30, 120, 600, 6000)))
+        yield (
+            _agent_id(index),
+            f"Agent {index}",
+            rng.choice(ROLES),
+            _timestamp(now - timedelta(days=10)),
+            _timestamp(seen),
+            json.dumps(rng.sample(LABELS, 2)),
+            json.dumps({"host": f"worker-{index % 50}"}),
+        )
+
+
+def _lease_rows(
+    leases: int, tasks: int, agents: int, rng: random.Random, now: datetime
+) -> Iterator[tuple[Any, ...]]:
+    """Yield lease rows."""
+    for index in range(1, leases + 1):
+        created = now - timedelta(minutes=rng.randint(0, 120))
+        # Most leases are still active, the rest expired
+        expires = created + timedelta(minutes=rng.choice((15, 30, 60, 240, 240, 240)))
+        yield (
+            f"L{index:06d}",
+            _task_id(rng.randint(1, max(tasks, 1))),
+            _agent_id(rng.randint(1, max(agents, 1))),
+            _timestamp(created),
+            _timestamp(expires),
+        )
+
+
+def _message_rows(
+    messages: int, tasks: int, agents: int, rng: random.Random, now: datetime
+) -> Iterator[tuple[Any, ...]]:
+    """Yield message rows."""
+    for index in range(1, messages + 1):
+        readers = [_agent_id(rng.randint(1, max(agents, 1))) for _ in range(rng.randint(0, 3))]
+        yield (
+            f"M{index:07d}",
+            _timestamp(now - timedelta(seconds=(messages - index) * 7)),
+            _agent_id(rng.randint(1, max(agents, 1))),
+            "task",
+            _task_id(rng.randint(1, max(tasks, 1))),
+            f"Progress update {index}: " + "details " * rng.randint(1, 20),
+            json.dumps({"subject": f"Update {index}", "severity": "info"}),
+            json.dumps(readers),
+        )
+
+
+def _event_rows(
+    events: int, tasks: int, agents: int, rng: random.Random, now: datetime
+) -> Iterator[tuple[Any, ...]]:
+    """Yield event rows."""
+    start = now - timedelta(days=30)
+    step = timedelta(days=30) / max(events, 1)
+    for index in range(events):
+        event_type = rng.choice(EVENT_TYPES)
+        task_id = _task_id(rng.randint(1, max(tasks, 1))) if event_type.startswith("task") else None
+        yield (
+            _timestamp(start + step * index),
+            event_type,
+            _agent_id(rng.randint(1, max(agents, 1))),
+            task_id,
+            None,
+            None,
+            json.dumps({"seq": index}) if task_id else "{}",
+        )
+
+
+def _insert(
+    conn: sqlite3.Connection, table: str, columns: str, rows: Iterator[tuple[Any, ...]]
+) -> None:
+    """Insert rows in batches."""
+    placeholders = ", ".join("?" * (columns.count(",") + 1))
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    batch: list[tuple[Any, ...]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def generate_repo(
+    root: Path,
+    tasks: int = 10_000,
+    events: int = 100_000,
+    agents: int = 1_000,
+    messages: int = 5_000,
+    leases: int = 500,
+    seed: int = 0,
+    now: datetime | None = None,
+) -> Path:
+    """Write a synthetic .lodestar directory.
+
+    Args:
+        root: Project directory to create ``.lodestar`` in
+        tasks: Number of spec tasks
+        events: Number of events
+        agents: Number of agents
+        messages: Number of task messages
+        leases: Number of leases (mostly active)
+        seed: Random seed; the same arguments (and ``now``) give the same
+            repository
+        now: Reference time of the generated timestamps, in UTC (defaults to
+            the current time, so agents and leases look live)
+
+    Returns:
+        Path of the .lodestar directory
+
+    Raises:
+        FileExistsError: If ``root`` already contains a runtime database
+    """
+    rng = random.Random(seed)
+    if now is None:
+        now = datetime.now(UTC)
+    now = now.replace(microsecond=0, tzinfo=None)
+    lodestar_dir = root / ".lodestar"
+    lodestar_dir.mkdir(parents=True, exist_ok=True)
+    db_path = lodestar_dir / "runtime.sqlite"
+    if db_path.exists():
+        raise FileExistsError(f"Runtime database already exists: {db_path}")
+
+    # The C emitter, where available, keeps generating 100k tasks quick
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(lodestar_dir / "spec.yaml", "w", encoding="utf-8") as f:
+        yaml.dump(generate_spec(tasks, rng, now), f, Dumper=dumper, sort_keys=False)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            _insert(
+                conn,
+                "agents",
+                "agent_id, display_name, role, created_at, last_seen_at, capabilities, "
+                "session_meta",
+                _agent_rows(agents, rng, now),
+            )
+            _insert(
+                conn,
+                "leases",
+                "lease_id, task_id, agent_id, created_at, expires_at",
+                _lease_rows(leases, tasks, agents, rng, now),
+            )
+            _insert(
+                conn,
+                "messages",
+                "message_id, created_at, from_agent_id, to_type, to_id, text, meta, read_by",
+                _message_rows(messages, tasks, agents, rng, now),
+            )
+            _insert(
+                conn,
+                "events",
+                "created_at, event_type, agent_id, task_id, target_agent_id, correlation_id, data",
+                _event_rows(events, tasks, agents, rng, now),
+            )
+    finally:
+        conn.close()
+    return lodestar_dir
@@ -0,0 +1,140 @@
+"""Import time benchmark of the command line interface.
+
+The ``lsspy`` command runs in CI health checks, where ``lsspy --version``
+should return without loading the web stack. Each run imports the module in
+a fresh interpreter with ``python -X importtime`` and reads its cumulative
+import time from the report.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import lsspy
+from lsspy import __version__
+from lsspy.bench.suite import RESULTS_FORMAT, summarize
+
+# Target median time to import the CLI module
+IMPORT_BUDGET_MS = 150.0
+
+# Modules the CLI must not import before it starts a server
+HEAVY_MODULES = ("fastapi", "pydantic", "uvicorn", "watchdog", "yaml", "lsspy.server")
+
+# Slowest direct imports reported
+SLOWEST = 10
+
+
+def parse_importtime(report: str) -> list[tuple[str, int, int, int]]:
+    """Parse the stderr of ``python -X importtime``.
+
+    Args:
+        report: Text written by the interpreter
+
+    Returns:
+        One (module, depth, self microseconds, cumulative microseconds) tuple
+        per import, in the order reported (dependencies before their importer)
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append((stripped, depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def _direct_imports(
+    imports: list[tuple[str, int, int, int]], module: str
+) -> list[tuple[str, int, int, int]]:
+    """Get the imports made directly by a module, slowest first."""
+    for index, (name, depth, _, _) in enumerate(imports):
+        if name == module:
+            break
+    else:
+        return []
+    children = []
+    for entry in reversed(imports[:index]):
+        if entry[1] <= depth:
+            break
+        if entry[1] == depth + 1:
+            children.append(entry)
+    return sorted(children, key=lambda entry: entry[3], reverse=True)
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Run a fresh interpreter that imports this copy of lsspy."""
+    env = dict(os.environ)
+    source = str(Path(lsspy.__file__).parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source, env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def bench_imports(
+    module: str = "lsspy.cli", repeat: int = 5, budget_ms: float = IMPORT_BUDGET_MS
+) -> dict[str, Any]:
+    """Measure the import time of a module and the ``lsspy --version`` run time.
+
+    Args:
+        module: Module to import
+        repeat: Timed interpreter runs per benchmark
+        budget_ms: Median import time the module should stay under
+
+    Returns:
+        JSON-ready results: ``import.<module>`` (cumulative import time) and
+        ``cli.version`` (wall time of ``lsspy --version``) summaries, the
+        module's slowest direct imports, the heavy modules it loaded, and
+        whether the median import time is within the budget
+    """
+    # Untimed run first, so bytecode is compiled and cached
+    _python("-c", f"import {module}")
+
+    samples = []
+    imports: list[tuple[str, int, int, int]] = []
+    for _ in range(repeat):
+        imports = parse_importtime(_python("-X", "importtime", "-c", f"import {module}").stderr)
+        cumulative = next((entry[3] for entry in imports if entry[0] == module), 0)
+        samples.append(cumulative / 1_000_000)
+
+    version_samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _python("-m", "lsspy.cli", "--version")
+        version_samples.append(time.perf_counter() - started)
+
+    check = (
+        f"import sys, json, {module}; "
+        f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))"
+    )
+    heavy = json.loads(_python("-c", check).stdout)
+
+    results = {
+        f"import.{module}": summarize(samples),
+        "cli.version": summarize(version_samples),
+    }
+    return {
+        "format": RESULTS_FORMAT,
+        "lsspy_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "parameters": {"module": module, "repeat": repeat, "budget_ms": budget_ms},
+        "results": results,
+        "slowest_imports": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, _, self_us, cumulative_us in _direct_imports(imports, module)[:SLOWEST]
+        ],
+        "heavy_modules": heavy,
+        "within_budget": results[f"import.{module}"].get("median_ms", 0.0) <= budget_ms,
+    }
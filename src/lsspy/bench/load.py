@@ -0,0 +1,319 @@
+"""Load test of the file change to client pipeline.
+
+A fake Lodestar writer, running in its own process, inserts events, renews
+leases and rewrites ``spec.yaml`` at fixed rates in a generated repository,
+while a local server watches it and broadcasts to simulated WebSocket
+clients subscribed to ``all``. Every inserted event carries its write time,
+so each client measures how long a change took to reach it.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+
+import yaml  # type: ignore[import-untyped]
+
+from lsspy import __version__, server
+from lsspy.bench.generate import generate_repo
+from lsspy.bench.suite import RESULTS_FORMAT, SimulatedClient, serve, summarize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# Seconds to keep listening after the writer stops, for the last broadcasts
+DRAIN_SECONDS = 2.0
+
+
+def _write_load(
+    lodestar_dir: str,
+    duration: float,
+    event_rate: float,
+    lease_rate: float,
+    spec_rate: float,
+    seed: int,
+    results: Any,
+) -> None:
+    """Write to a repository like a busy Lodestar would (writer process).
+
+    Args:
+        lodestar_dir: Repository to write to
+        duration: Seconds to write for
+        event_rate: Events inserted per second
+        lease_rate: Lease renewals per second
+        spec_rate: spec.yaml rewrites per second
+        seed: Random seed
+        results: Queue receiving the write counts when done
+    """
+    rng = random.Random(seed)
+    spec_path = Path(lodestar_dir) / "spec.yaml"
+    with open(spec_path, encoding="utf-8") as f:
+        spec = yaml.safe_load(f)
+    task_ids = list(spec["tasks"])
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    conn = sqlite3.connect(Path(lodestar_dir) / "runtime.sqlite", timeout=5)
+    lease_ids = [row[0] for row in conn.execute("SELECT lease_id FROM leases")]
+
+    counts = {"events": 0, "leases": 0, "spec": 0}
+
+    def write_event() -> None:
+        payload = {"load_seq": counts["events"] + 1, "written_at": time.time()}
+        with conn:
+            conn.execute(
+                "INSERT INTO events (created_at, event_type, agent_id, task_id, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "task.progress",
+                    "A00001",
+                    rng.choice(task_ids),
+                    json.dumps(payload),
+                ),
+            )
+
+    def renew_lease() -> None:
+        if not lease_ids:
+            return
+        expires = datetime.now(UTC) + timedelta(minutes=15)
+        with conn:
+            conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE lease_id = ?",
+                (expires.strftime("%Y-%m-%dT%H:%M:%SZ"), rng.choice(lease_ids)),
+            )
+
+    def rewrite_spec() -> None:
+        task = spec["tasks"][rng.choice(task_ids)]
+        task["updatedAt"] = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        # In place, like an editor save: the watcher reacts to modifications
+        with open(spec_path, "w", encoding="utf-8") as f:
+            yaml.dump(spec, f, Dumper=dumper, sort_keys=False)
+
+    writers: list[tuple[str, float, Callable[[], None]]] = [
+        ("events", event_rate, write_event),
+        ("leases", lease_rate, renew_lease),
+        ("spec", spec_rate, rewrite_spec),
+    ]
+    # Write n of a kind is due n / rate seconds in, for rate * duration writes
+    due = [(kind, rate, write) for kind, rate, write in writers if rate > 0]
+    start = time.monotonic()
+    try:
+        while due:
+            kind, rate, write = min(due, key=lambda w: counts[w[0]] / w[1])
+            offset = counts[kind] / rate
+            if offset >= duration - 1e-9:
+                break
+            time.sleep(max(0.0, start + offset - time.monotonic()))
+            write()
+            counts[kind] += 1
+    finally:
+        conn.close()
+        results.put(counts)
+
+
+class LoadClient(SimulatedClient):
+    """Simulated client measuring how long written events took to reach it."""
+
+    def __init__(self, probe: "_Probe") -> None:
+        """Initialize the client.
+
+        Args:
+            probe: Shared decoder of the messages sent to every client
+        """
+        super().__init__()
+        self.probe = probe
+        self.last_seq = 0
+        self.missed = 0
+        self.latencies: list[float] = []
+        self.by_scope: dict[str, int] = {}
+
+    async def send_text(self, data: str) -> None:
+        """Record an update's arrival and the latency of new events in it."""
+        received_at = time.time()
+        await super().send_text(data)
+        scope, writes = self.probe.decode(data)
+        if not scope:
+            return
+        self.by_scope[scope] = self.by_scope.get(scope, 0) + 1
+        new = [(seq, written_at) for seq, written_at in writes if seq > self.last_seq]
+        if not new:
+            return
+        # Events between the last one seen and the oldest one sent never arrived
+        self.missed += new[0][0] - self.last_seq - 1
+        self.latencies.extend(received_at - written_at for _, written_at in new)
+        self.last_seq = new[-1][0]
+
+
+class _Probe:
+    """Decode each broadcast message once for all clients receiving it."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._message: str | None = None
+        self._decoded: tuple[str, list[tuple[int, float]]] = ("", [])
+
+    def decode(self, message: str) -> tuple[str, list[tuple[int, float]]]:
+        """Decode a message.
+
+        Returns:
+            Tuple of (scope of an update message, empty for other messages;
+            load events in it as (seq, write time), oldest first)
+        """
+        if message is not self._message:
+            update = json.loads(message)
+            writes = []
+            if update.get("type") == "update" and update.get("scope") == "events":
+                for event in update.get("data") or []:
+                    payload = event.get("payload") or {}
+                    if "load_seq" in payload:
+                        writes.append((payload["load_seq"], payload["written_at"]))
+            writes.sort()
+            self._message = message
+            scope = update.get("scope", "") if update.get("type") == "update" else ""
+            self._decoded = (scope, writes)
+        return self._decoded
+
+
+def _rss_bytes() -> int | None:
+    """Get the current resident set size, where /proc provides it."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _cpu_seconds() -> tuple[float, float]:
+    """Get the user and system CPU time of this process."""
+    times = os.times()
+    return times.user, times.system
+
+
+def _max_rss_bytes() -> int | None:
+    """Get the peak resident set size of this process."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+async def _connect(clients: list[LoadClient]) -> None:
+    """Connect clients to the running server and subscribe them to ``all``."""
+    manager = server.connection_manager
+    for client in clients:
+        client_id = await manager.connect(cast(Any, client))
+        await manager.subscribe(client_id, ["all"])
+
+
+def run_load(
+    duration: float = 10.0,
+    clients: int = 50,
+    event_rate: float = 20.0,
+    lease_rate: float = 5.0,
+    spec_rate: float = 0.5,
+    tasks: int = 200,
+    seed: int = 0,
+    drain: float = DRAIN_SECONDS,
+) -> dict[str, Any]:
+    """Run the load test in a temporary repository.
+
+    Args:
+        duration: Seconds the writer runs
+        clients: Simulated WebSocket clients subscribed to ``all``
+        event_rate: Events inserted per second
+        lease_rate: Lease renewals per second
+        spec_rate: spec.yaml rewrites per second
+        tasks: Tasks in the generated spec (every rewrite is parsed again)
+        seed: Random seed
+        drain: Seconds to wait for the last broadcasts after the writer stops
+
+    Returns:
+        JSON-ready report: writes per kind, change to client latency of the
+        written events, updates received, dropped updates (written events
+        a client never saw), and CPU and RSS of the server process
+    """
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="lsspy-load-") as tmp:
+        lodestar_dir = generate_repo(
+            Path(tmp), tasks=tasks, events=1_000, agents=50, messages=100, leases=50, seed=seed
+        )
+        server.set_lodestar_dir(lodestar_dir, name="load")
+        probe = _Probe()
+        load_clients = [LoadClient(probe) for _ in range(clients)]
+        with serve():
+            loop = server._event_loop
+            if loop is None:
+                raise RuntimeError("Load test server has no event loop")
+            asyncio.run_coroutine_threadsafe(_connect(load_clients), loop).result(timeout=30)
+
+            queue = context.Queue()
+            writer = context.Process(
+                target=_write_load,
+                args=(str(lodestar_dir), duration, event_rate, lease_rate, spec_rate, seed, queue),
+            )
+            cpu_before = _cpu_seconds()
+            started = time.monotonic()
+            writer.start()
+            writes: dict[str, int] = queue.get(timeout=duration + 60)
+            writer.join(timeout=10)
+            time.sleep(drain)
+            elapsed = time.monotonic() - started
+            cpu_after = _cpu_seconds()
+            rss = _rss_bytes()
+
+    latencies = [latency for client in load_clients for latency in client.latencies]
+    # Events written after the last one a client saw are dropped too
+    dropped = sum(client.missed + writes["events"] - client.last_seq for client in load_clients)
+    by_scope: dict[str, int] = {}
+    for client in load_clients:
+        for scope, count in client.by_scope.items():
+            by_scope[scope] = by_scope.get(scope, 0) + count
+    user = cpu_after[0] - cpu_before[0]
+    system = cpu_after[1] - cpu_before[1]
+    max_rss = _max_rss_bytes()
+    return {
+        "format": RESULTS_FORMAT,
+        "lsspy_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "parameters": {
+            "duration": duration,
+            "clients": clients,
+            "event_rate": event_rate,
+            "lease_rate": lease_rate,
+            "spec_rate": spec_rate,
+            "tasks": tasks,
+            "seed": seed,
+            "drain": drain,
+        },
+        "writes": writes,
+        "latency": summarize(latencies),
+        "updates": {
+            "received": sum(by_scope.values()),
+            "bytes": sum(client.bytes for client in load_clients),
+            "by_scope": by_scope,
+        },
+        "dropped_updates": dropped,
+        "stale_clients": sum(client.last_seq < writes["events"] for client in load_clients),
+        "cpu": {
+            "user_seconds": user,
+            "system_seconds": system,
+            "percent": (user + system) / elapsed * 100,
+        },
+        "rss": {
+            "current_mb": None if rss is None else rss / 2**20,
+            "max_mb": None if max_rss is None else max_rss / 2**20,
+        },
+    }
@@ -0,0 +1,127 @@
+"""Memory benchmark of cached scope data.
+
+Measures what holding a repository's tasks and events costs, once as the
+API's JSON dictionaries (how broadcast data used to be cached) and once as
+the compact tables the server caches now. Each measurement runs in a fresh
+process, so the RSS growth it reports is not muddied by earlier runs.
+"""
+
+import gc
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from lsspy import __version__
+from lsspy.bench.generate import generate_repo
+from lsspy.bench.load import _rss_bytes
+from lsspy.bench.suite import RESULTS_FORMAT
+
+# Cached forms compared per scope
+LAYOUTS = ("dicts", "compact")
+
+
+def deep_sizeof(root: Any) -> int:
+    """Get the size of an object and everything it references, once each.
+
+    Shared objects (interned strings, repeated values) are counted once, so
+    the result is what the object graph costs on its own.
+
+    Args:
+        root: Object to measure
+
+    Returns:
+        Size in bytes
+    """
+    seen: set[int] = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, list | tuple | set | frozenset):
+            stack.extend(obj)
+        elif not isinstance(obj, str | bytes | int | float | bool | type(None)):
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+    return total
+
+
+def _measure(lodestar_dir: str, scope: str, layout: str, events: int) -> dict[str, Any]:
+    """Hold one scope in one layout and report its memory (runs in a fresh process)."""
+    from lsspy import server
+    from lsspy.repos import Repo
+
+    repo = Repo("bench", Path(lodestar_dir))
+    gc.collect()
+    before = _rss_bytes()
+    data: Any
+    if scope == "tasks" and layout == "dicts":
+        data = [
+            task.model_dump(mode="json", by_alias=True)
+            for task in repo.spec_reader.get_tasks_typed()
+        ]
+    elif scope == "tasks":
+        data = server._tasks_table(repo)
+    elif layout == "dicts":
+        data = [
+            server._event_from_row(row).model_dump(mode="json", by_alias=True)
+            for row in repo.runtime_reader.get_events(limit=events)
+        ]
+    else:
+        data = server._events_table(repo.runtime_reader.get_events(limit=events))
+    gc.collect()
+    after = _rss_bytes()
+    retained = deep_sizeof(data)
+    return {
+        "rows": len(data),
+        "rss_mb": None if before is None or after is None else (after - before) / 2**20,
+        "retained_mb": retained / 2**20,
+        "bytes_per_row": retained / len(data) if len(data) else None,
+    }
+
+
+def bench_memory(tasks: int = 10_000, events: int = 100_000, seed: int = 0) -> dict[str, Any]:
+    """Measure the memory of cached tasks and events in each layout.
+
+    Args:
+        tasks: Tasks in the generated spec
+        events: Events in the generated database (all of them are loaded)
+        seed: Random seed of the generated repository
+
+    Returns:
+        JSON-ready results with ``memory.<scope>.<layout>`` entries giving
+        the rows held, the RSS growth and the retained size in megabytes,
+        and the retained bytes per row
+    """
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="lsspy-memory-") as tmp:
+        lodestar_dir = generate_repo(
+            Path(tmp), tasks=tasks, events=events, agents=100, messages=10, leases=10, seed=seed
+        )
+        for scope in ("tasks", "events"):
+            for layout in LAYOUTS:
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                    future = pool.submit(_measure, str(lodestar_dir), scope, layout, events)
+                    results[f"memory.{scope}.{layout}"] = future.result()
+    return {
+        "format": RESULTS_FORMAT,
+        "lsspy_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "parameters": {"tasks": tasks, "events": events, "seed": seed},
+        "results": results,
+    }
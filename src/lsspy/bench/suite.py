@@ -0,0 +1,317 @@
+"""Benchmarks of the read, gather, API and fan-out paths.
+
+Each benchmark runs a step repeatedly against a (usually generated)
+repository and reports its latency distribution in milliseconds. The
+results are plain JSON, so runs of different versions can be compared
+with :func:`compare_results`.
+"""
+
+import asyncio
+import http.client
+import json
+import platform
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, cast
+
+import uvicorn
+
+from lsspy import __version__, server
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.readers.spec import SpecReader
+from lsspy.repos import Repo
+
+# Endpoints timed by the API benchmark, relative to the server root
+API_PATHS = (
+    "/api/status",
+    "/api/tasks",
+    "/api/agents",
+    "/api/leases",
+    "/api/messages",
+    "/api/events",
+    "/api/snapshot",
+    "/api/graph",
+)
+
+# Results format version, bumped when the meaning of a field changes
+RESULTS_FORMAT = 1
+
+
+def summarize(samples: list[float]) -> dict[str, Any]:
+    """Summarize durations in seconds as milliseconds.
+
+    Args:
+        samples: Measured durations in seconds
+
+    Returns:
+        Dictionary with ``runs`` and ``min_ms``, ``median_ms``, ``p95_ms``,
+        ``p99_ms``, ``max_ms`` and ``mean_ms`` (only ``runs`` without samples)
+    """
+    if not samples:
+        return {"runs": 0}
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        """Get a percentile in milliseconds (nearest rank)."""
+        return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))] * 1000
+
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> dict[str, Any]:
+    """Time a call.
+
+    Args:
+        fn: Call to time
+        repeat: Timed runs
+        warmup: Untimed runs first (warming caches and imports)
+
+    Returns:
+        Summary as returned by :func:`summarize`
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_readers(lodestar_dir: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time spec parsing and runtime database queries.
+
+    Args:
+        lodestar_dir: Repository to read
+        repeat: Timed runs per benchmark
+
+    Returns:
+        Results by benchmark name
+    """
+    spec = SpecReader(lodestar_dir / "spec.yaml")
+    runtime = RuntimeReader(lodestar_dir / "runtime.sqlite")
+    max_event_id = runtime.get_max_event_id() or 0
+    return {
+        "spec.parse": measure(spec.read, repeat),
+        "spec.tasks_typed": measure(spec.get_tasks_typed, repeat),
+        "runtime.agents": measure(runtime.get_agents, repeat),
+        "runtime.leases": measure(runtime.get_leases, repeat),
+        "runtime.messages": measure(lambda: runtime.get_messages(limit=50), repeat),
+        "runtime.events": measure(lambda: runtime.get_events(limit=100), repeat),
+        "runtime.events_since": measure(
+            lambda: runtime.get_events_since(max(0, max_event_id - 5000)), repeat
+        ),
+        "runtime.snapshot": measure(runtime.snapshot, repeat),
+    }
+
+
+def bench_gather(lodestar_dir: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time gathering every broadcast scope of a repository.
+
+    Args:
+        lodestar_dir: Repository to read
+        repeat: Timed runs
+
+    Returns:
+        Results by benchmark name
+    """
+    repo = Repo("bench", lodestar_dir)
+    return {"gather.all_scopes": measure(lambda: server._gather_repo(repo), repeat)}
+
+
+@contextmanager
+def serve() -> Iterator[int]:
+    """Run the app on a free local port in a thread, yielding the port.
+
+    Raises:
+        RuntimeError: If the server does not start
+    """
+    config = uvicorn.Config(server.create_app(), host="127.0.0.1", port=0, log_level="warning")
+    uv_server = uvicorn.Server(config)
+    thread = threading.Thread(target=uv_server.run, daemon=True)
+    thread.start()
+    while not uv_server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Benchmark server failed to start")
+        time.sleep(0.01)
+    try:
+        yield uv_server.servers[0].sockets[0].getsockname()[1]
+    finally:
+        uv_server.should_exit = True
+        thread.join(timeout=10)
+
+
+def bench_api(lodestar_dir: Path, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time REST endpoints over HTTP on a local server.
+
+    Args:
+        lodestar_dir: Repository to serve
+        repeat: Timed requests per endpoint
+
+    Returns:
+        Results by benchmark name (``api./api/tasks`` etc.)
+
+    Raises:
+        RuntimeError: If an endpoint does not answer 200
+    """
+    server.set_lodestar_dir(lodestar_dir, name="bench")
+    results: dict[str, dict[str, Any]] = {}
+    with serve() as port:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        try:
+            for path in API_PATHS:
+
+                def get(path: str = path) -> None:
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        raise RuntimeError(f"GET {path} returned {response.status}")
+
+                results[f"api.{path}"] = measure(get, repeat)
+        finally:
+            conn.close()
+    return results
+
+
+class SimulatedClient:
+    """Stand-in for a WebSocket that only counts what it is sent."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.messages = 0
+        self.bytes = 0
+
+    async def accept(self) -> None:
+        """Accept the connection (nothing to do)."""
+
+    async def send_text(self, data: str) -> None:
+        """Count a message, yielding to the loop like a real send may."""
+        self.messages += 1
+        self.bytes += len(data)
+        await asyncio.sleep(0)
+
+
+async def _fanout(repo: Repo, clients: int, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time broadcasts of each scope to simulated clients."""
+    manager = server.ConnectionManager()
+    data = server._gather_repo(repo)
+    for _ in range(clients):
+        client_id = await manager.connect(cast(Any, SimulatedClient()))
+        await manager.subscribe(client_id, [f"{repo.name}:all"])
+
+    results: dict[str, dict[str, Any]] = {}
+    for scope, scope_data in data.items():
+        await manager.broadcast(scope, scope_data, repo_name=repo.name)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await manager.broadcast(scope, scope_data, repo_name=repo.name)
+            samples.append(time.perf_counter() - start)
+        results[f"fanout.{scope}"] = summarize(samples)
+    return results
+
+
+def bench_fanout(lodestar_dir: Path, clients: int, repeat: int) -> dict[str, dict[str, Any]]:
+    """Time serializing and sending each scope to N simulated WebSocket clients.
+
+    Args:
+        lodestar_dir: Repository whose data is broadcast
+        clients: Number of subscribed clients
+        repeat: Timed broadcasts per scope
+
+    Returns:
+        Results by benchmark name (``fanout.tasks`` etc.)
+    """
+    repo = server.set_lodestar_dir(lodestar_dir, name="bench")
+    return asyncio.run(_fanout(repo, clients, repeat))
+
+
+def run_benchmarks(
+    lodestar_dir: Path,
+    repeat: int = 5,
+    clients: int = 100,
+    groups: tuple[str, ...] = ("readers", "gather", "api", "fanout"),
+    parameters: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run benchmark groups against a repository.
+
+    Args:
+        lodestar_dir: Repository to benchmark
+        repeat: Timed runs per benchmark
+        clients: Simulated clients for the fan-out benchmark
+        groups: Benchmark groups to run (readers, gather, api, fanout)
+        parameters: Extra values recorded with the results, e.g. the sizes
+            the repository was generated with
+
+    Returns:
+        JSON-ready results with environment details and a ``results``
+        dictionary by benchmark name
+
+    Raises:
+        ValueError: If a group is unknown
+    """
+    runners: dict[str, Callable[[], dict[str, dict[str, Any]]]] = {
+        "readers": lambda: bench_readers(lodestar_dir, repeat),
+        "gather": lambda: bench_gather(lodestar_dir, repeat),
+        "api": lambda: bench_api(lodestar_dir, repeat),
+        "fanout": lambda: bench_fanout(lodestar_dir, clients, repeat),
+    }
+    unknown = set(groups) - set(runners)
+    if unknown:
+        raise ValueError(f"Unknown benchmark groups: {', '.join(sorted(unknown))}")
+
+    results: dict[str, dict[str, Any]] = {}
+    for group in groups:
+        results.update(runners[group]())
+    return {
+        "format": RESULTS_FORMAT,
+        "lsspy_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "parameters": {"repeat": repeat, "clients": clients, **(parameters or {})},
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], metric: str = "median_ms"
+) -> dict[str, float]:
+    """Compare two result files benchmark by benchmark.
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        metric: Summary field to compare
+
+    Returns:
+        Ratio of current to baseline per benchmark present in both (above 1
+        means slower)
+    """
+    ratios: dict[str, float] = {}
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before and before.get(metric):
+            ratios[name] = result[metric] / before[metric]
+    return ratios
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Read a results file written by ``python -m lsspy.bench``."""
+    with open(path, encoding="utf-8") as f:
+        return cast(dict[str, Any], json.load(f))
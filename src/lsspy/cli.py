@@ -1,15 +1,17 @@
 """CLI interface for LSSPY."""
 
+import os
 import sys
-import webbrowser
 from pathlib import Path
 
 import typer
-import uvicorn
 from rich.console import Console
 
 from lsspy import __version__
-from lsspy.server import create_app, set_lodestar_dir
+
+# The server, uvicorn and their dependencies (FastAPI, Pydantic, watchdog) are
+# imported where they are used, so `lsspy --version` and argument errors
+# return without loading them
 
 app = typer.Typer(
     help="LSSPY - Lodestar Visualizer Dashboard",
@@ -18,6 +20,10 @@ app = typer.Typer(
 )
 console = Console()
 
+# Event streams (/api/stream) stay open until the client leaves: stop waiting
+# for them after this long when shutting down
+SHUTDOWN_TIMEOUT_SECONDS = 3
+
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
@@ -29,9 +35,12 @@ def version_callback(value: bool) -> None:
 @app.callback(invoke_without_command=True)
 def start(
     ctx: typer.Context,
-    path: str = typer.Argument(
+    paths: list[str] | None = typer.Argument(
         None,
-        help="Path to the .lodestar directory or parent directory (auto-detects .lodestar)",
+        help=(
+            "Paths to .lodestar directories or their parent directories (auto-detects "
+            ".lodestar); prefix a path with NAME= to choose its repository name"
+        ),
     ),
     port: int = typer.Option(8000, "--port", "-p", help="Port to run the web server on"),
     host: str = typer.Option("127.0.0.1", "--host", "-h", help="Host address to bind to"),
@@ -42,6 +51,46 @@ def start(
         help="File polling interval in seconds (if file watching fails)",
     ),
     debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Worker processes serving clients; with more than one, this process "
+        "watches the repositories and fans changes out to them",
+    ),
+    record_history: bool = typer.Option(
+        False,
+        "--record-history",
+        help="Record agent, lease and task status changes for /api/history",
+    ),
+    history_days: float = typer.Option(
+        30.0,
+        "--history-days",
+        help="Days of recorded history to keep before compacting",
+    ),
+    debug_endpoints: bool = typer.Option(
+        False,
+        "--debug-endpoints",
+        help="Serve /api/debug/stats and /api/debug/profile (sampling profiler) to local clients",
+    ),
+    loop_monitor: bool = typer.Option(
+        False,
+        "--loop-monitor",
+        help="Measure event loop lag and log callbacks blocking the loop, with their stack",
+    ),
+    slow_callback_ms: int = typer.Option(
+        100,
+        "--slow-callback-ms",
+        min=1,
+        help="With --loop-monitor, milliseconds a callback may block the loop",
+    ),
+    trace: Path | None = typer.Option(
+        None,
+        "--trace",
+        help="Append a JSON line per pipeline step of every file change (file event, "
+        "debounce, gather, serialize, deliver) to this file",
+    ),
     version: bool = typer.Option(
         False,
         "--version",
@@ -54,56 +103,77 @@ def start(
     """Start the LSSPY dashboard server.
 
     If no path is provided, auto-detects .lodestar in the current directory.
+    Several paths monitor several repositories from one server; the first is
+    served by the plain /api routes and each one under /api/repos/NAME.
     """
     # Skip if version flag was handled
     if ctx.resilient_parsing:
         return
 
     # Auto-detect .lodestar directory
-    if path is None:
+    if not paths:
         lodestar_path = Path.cwd() / ".lodestar"
         if not lodestar_path.exists():
             console.print("[red]Error: .lodestar directory not found in current directory[/red]")
             console.print("Please specify the path to .lodestar directory")
             raise typer.Exit(1)
+        repos: list[tuple[str | None, Path]] = [(None, lodestar_path)]
     else:
-        lodestar_path = Path(path)
-        # If path points to parent directory, look for .lodestar inside
-        if not lodestar_path.name == ".lodestar":
-            lodestar_path = lodestar_path / ".lodestar"
-
-    # Validate .lodestar directory
-    if not lodestar_path.exists():
-        console.print(f"[red]Error: Directory not found: {lodestar_path}[/red]")
-        raise typer.Exit(1)
+        repos = [_resolve_repo_path(path) for path in paths]
 
-    if not lodestar_path.is_dir():
-        console.print(f"[red]Error: Not a directory: {lodestar_path}[/red]")
-        raise typer.Exit(1)
-
-    runtime_db = lodestar_path / "runtime.sqlite"
-    spec_file = lodestar_path / "spec.yaml"
-
-    if not runtime_db.exists():
-        console.print(f"[yellow]Warning: runtime.sqlite not found at {runtime_db}[/yellow]")
-
-    if not spec_file.exists():
-        console.print(f"[yellow]Warning: spec.yaml not found at {spec_file}[/yellow]")
+    from lsspy.server import (
+        add_lodestar_dir,
+        set_debug_endpoints,
+        set_lodestar_dir,
+        set_loop_monitor,
+        set_trace_file,
+    )
 
     # Display startup info
     if debug:
         console.print("[bold cyan]Debug mode enabled[/bold cyan]")
 
     console.print("[bold green]Starting LSSPY dashboard...[/bold green]")
-    console.print(f"Monitoring: {lodestar_path.absolute()}")
+    for _, lodestar_path in repos:
+        console.print(f"Monitoring: {lodestar_path.absolute()}")
     console.print(f"Server: http://{host}:{port}")
     console.print(f"Poll interval: {poll_interval}s")
+    if workers > 1:
+        console.print(f"Workers: {workers}")
+    if record_history:
+        console.print(f"Recording history (keeping {history_days:g} days)")
+    if debug_endpoints:
+        set_debug_endpoints(True)
+        console.print("Debug endpoints: /api/debug/stats, /api/debug/profile (local clients only)")
+    if loop_monitor:
+        set_loop_monitor(slow_callback_ms / 1000)
+        console.print(f"Loop monitor: reporting callbacks blocking over {slow_callback_ms}ms")
+    if trace is not None:
+        set_trace_file(trace)
+        console.print(f"Tracing to: {trace.absolute()}")
+
+    # Register the repositories
+    try:
+        for index, (name, lodestar_path) in enumerate(repos):
+            register = set_lodestar_dir if index == 0 else add_lodestar_dir
+            repo = register(
+                lodestar_path,
+                name=name,
+                record_history=record_history,
+                history_retention_days=history_days,
+            )
+            if len(repos) > 1:
+                console.print(f"[dim]  {repo.name}: /api/repos/{repo.name}[/dim]")
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from e
 
     # Open browser if requested
     if not no_open:
         console.print("[dim]Opening browser...[/dim]")
         # Open browser after a short delay to allow server to start
         import threading
+        import webbrowser
 
         def open_browser() -> None:
             import time
@@ -113,19 +183,114 @@ def start(
 
         threading.Thread(target=open_browser, daemon=True).start()
 
+    log_level = "debug" if debug else "info"
+    if workers > 1:
+        _run_workers(host, port, workers, log_level, access_log=debug)
+        return
+
+    import uvicorn
+
+    from lsspy.server import create_app
+
     # Configure and start server
-    set_lodestar_dir(lodestar_path)
     app = create_app()
 
     # Start uvicorn server
-    log_level = "debug" if debug else "info"
     try:
-        uvicorn.run(app, host=host, port=port, log_level=log_level, access_log=debug)
+        uvicorn.run(
+            app,
+            host=host,
+            port=port,
+            log_level=log_level,
+            access_log=debug,
+            timeout_graceful_shutdown=SHUTDOWN_TIMEOUT_SECONDS,
+        )
     except KeyboardInterrupt:
         console.print("\n[yellow]Server stopped[/yellow]")
         raise typer.Exit(0)
 
 
+def _run_workers(host: str, port: int, workers: int, log_level: str, access_log: bool) -> None:
+    """Serve through several worker processes fed by this (leader) process.
+
+    Args:
+        host: Host address to bind to
+        port: Port to run the web server on
+        workers: Number of uvicorn worker processes
+        log_level: uvicorn log level
+        access_log: Enable uvicorn access logging
+    """
+    import uvicorn
+
+    from lsspy.server import start_fanout_leader, stop_fanout_leader, worker_environment
+
+    address = start_fanout_leader()
+    # Workers are separate interpreters: hand them the configuration via the environment
+    os.environ.update(worker_environment(address))
+    try:
+        uvicorn.run(
+            "lsspy.server:create_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            log_level=log_level,
+            access_log=access_log,
+            timeout_graceful_shutdown=SHUTDOWN_TIMEOUT_SECONDS,
+        )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Server stopped[/yellow]")
+        raise typer.Exit(0)
+    finally:
+        stop_fanout_leader()
+
+
+def _resolve_repo_path(path: str) -> tuple[str | None, Path]:
+    """Resolve a repository argument to an optional name and a .lodestar directory.
+
+    Args:
+        path: ``PATH`` or ``NAME=PATH``, where PATH is the .lodestar directory
+            or its parent
+
+    Returns:
+        Tuple of (repository name or None, .lodestar path)
+
+    Raises:
+        typer.Exit: If the directory does not exist
+    """
+    from lsspy.repos import REPO_NAME_PATTERN
+
+    name: str | None = None
+    prefix, sep, rest = path.partition("=")
+    if sep and REPO_NAME_PATTERN.match(prefix):
+        name, path = prefix, rest
+
+    lodestar_path = Path(path)
+    # If path points to parent directory, look for .lodestar inside
+    if not lodestar_path.name == ".lodestar":
+        lodestar_path = lodestar_path / ".lodestar"
+
+    # Validate .lodestar directory
+    if not lodestar_path.exists():
+        console.print(f"[red]Error: Directory not found: {lodestar_path}[/red]")
+        raise typer.Exit(1)
+
+    if not lodestar_path.is_dir():
+        console.print(f"[red]Error: Not a directory: {lodestar_path}[/red]")
+        raise typer.Exit(1)
+
+    runtime_db = lodestar_path / "runtime.sqlite"
+    spec_file = lodestar_path / "spec.yaml"
+
+    if not runtime_db.exists():
+        console.print(f"[yellow]Warning: runtime.sqlite not found at {runtime_db}[/yellow]")
+
+    if not spec_file.exists():
+        console.print(f"[yellow]Warning: spec.yaml not found at {spec_file}[/yellow]")
+
+    return name, lodestar_path
+
+
 def main() -> None:
     """Main entry point."""
     try:
@@ -0,0 +1,271 @@
+"""Compact in-memory tables of tasks and events.
+
+A watched repository keeps its last broadcast data cached between
+broadcasts. Holding that as the API's JSON dictionaries costs a dict and
+fresh strings per field of every row. The tables here keep one slotted
+record per row instead, with the low-cardinality strings (statuses, labels,
+task and agent IDs, event types) interned so each distinct value is stored
+once, and produce the API's JSON output directly.
+
+Values parsed from JSON columns (agent capabilities, event payloads) are
+shared through :class:`SharedValues`, so rows holding the same text hold
+one parsed object.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Protocol, TypeVar, cast
+
+T = TypeVar("T")
+
+# Distinct JSON texts whose parsed values are kept for sharing
+SHARED_VALUES_MAX = 10_000
+
+# Longer texts are rarely repeated: their values are not shared
+SHARED_VALUE_MAX_LENGTH = 1024
+
+
+def _intern(value: Any) -> Any:
+    """Intern a string, passing other values (None) through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _interned(values: Iterable[Any]) -> tuple[Any, ...]:
+    """Intern the strings of a list."""
+    return tuple(_intern(value) for value in values)
+
+
+def intern_fields(row: dict[str, Any], fields: Iterable[str]) -> dict[str, Any]:
+    """Intern the string values of some fields of a row, in place.
+
+    Args:
+        row: JSON-ready row
+        fields: Low-cardinality fields (statuses, IDs, types)
+
+    Returns:
+        The row
+    """
+    for field in fields:
+        value = row.get(field)
+        if isinstance(value, str):
+            row[field] = sys.intern(value)
+    return row
+
+
+class SharedValues:
+    """Hand out one shared value per distinct JSON text.
+
+    Rows of runtime tables store JSON as text, and many rows repeat the same
+    text (the same capabilities, an empty payload). Keyed by that text,
+    every row gets the value parsed first instead of its own copy. The most
+    recently used texts are kept, up to a bound. Shared values are read-only:
+    callers must copy them before changing anything.
+    """
+
+    def __init__(
+        self, max_entries: int = SHARED_VALUES_MAX, max_length: int = SHARED_VALUE_MAX_LENGTH
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Distinct texts to keep values for
+            max_length: Longest text whose value is shared
+        """
+        self.max_entries = max_entries
+        self.max_length = max_length
+        self._values: OrderedDict[tuple[str, str | None], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def share(self, field: str, text: str | None, value: T) -> T:
+        """Get the shared value of a JSON text, registering this one if it is new.
+
+        Args:
+            field: Column the text comes from (texts of different columns may
+                be parsed differently)
+            text: JSON text as stored (None for NULL)
+            value: Value parsed from this row's text
+
+        Returns:
+            The value first registered for the text, or ``value``
+        """
+        if text is not None and len(text) > self.max_length:
+            return value
+        key = (field, text)
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return cast(T, self._values[key])
+            self._values[key] = value
+            if len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        """Number of distinct texts with a shared value."""
+        return len(self._values)
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    """One task, as served by the API."""
+
+    id: str
+    title: str
+    description: str
+    acceptance_criteria: tuple[str, ...]
+    status: str
+    priority: int
+    labels: tuple[str, ...]
+    locks: tuple[str, ...]
+    dependencies: tuple[str, ...]
+    dependents: tuple[str, ...]
+    created_at: str | None
+    updated_at: str | None
+    prd_source: str | None
+
+    @classmethod
+    def from_json(cls, task: dict[str, Any]) -> "TaskRecord":
+        """Build a record from a serialized task.
+
+        Args:
+            task: ``Task.model_dump(mode="json", by_alias=True)`` output
+
+        Returns:
+            The task as a record
+        """
+        return cls(
+            id=_intern(task["id"]),
+            title=task["title"],
+            description=task["description"],
+            acceptance_criteria=tuple(task["acceptanceCriteria"]),
+            status=_intern(task["status"]),
+            priority=task["priority"],
+            labels=_interned(task["labels"]),
+            locks=_interned(task["locks"]),
+            dependencies=_interned(task["dependencies"]),
+            dependents=_interned(task["dependents"]),
+            created_at=task["createdAt"],
+            updated_at=task["updatedAt"],
+            prd_source=_intern(task["prdSource"]),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize the task like ``Task.model_dump(mode="json", by_alias=True)``."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "acceptanceCriteria": list(self.acceptance_criteria),
+            "status": self.status,
+            "priority": self.priority,
+            "labels": list(self.labels),
+            "locks": list(self.locks),
+            "dependencies": list(self.dependencies),
+            "dependents": list(self.dependents),
+            "createdAt": self.created_at,
+            "updatedAt": self.updated_at,
+            "prdSource": self.prd_source,
+        }
+
+
+@dataclass(slots=True)
+class EventRecord:
+    """One event, as served by the API."""
+
+    id: int
+    created_at: str
+    type: str
+    actor_agent_id: str | None
+    task_id: str | None
+    target_agent_id: str | None
+    correlation_id: str | None
+    payload: dict[str, Any]
+
+    @classmethod
+    def from_json(cls, event: dict[str, Any]) -> "EventRecord":
+        """Build a record from a serialized event.
+
+        Args:
+            event: ``Event.model_dump(mode="json", by_alias=True)`` output
+
+        Returns:
+            The event as a record
+        """
+        return cls(
+            id=event["id"],
+            created_at=event["createdAt"],
+            type=_intern(event["type"]),
+            actor_agent_id=_intern(event["actorAgentId"]),
+            task_id=_intern(event["taskId"]),
+            target_agent_id=_intern(event["targetAgentId"]),
+            correlation_id=event["correlationId"],
+            payload=event["payload"],
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize the event like ``Event.model_dump(mode="json", by_alias=True)``."""
+        return {
+            "id": self.id,
+            "createdAt": self.created_at,
+            "type": self.type,
+            "actorAgentId": self.actor_agent_id,
+            "taskId": self.task_id,
+            "targetAgentId": self.target_agent_id,
+            "correlationId": self.correlation_id,
+            "payload": self.payload,
+        }
+
+
+class _Record(Protocol):
+    """A row that serializes itself to the API's JSON form."""
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize the row."""
+        ...
+
+
+class CompactTable:
+    """The rows of one data scope, in API order."""
+
+    __slots__ = ("records",)
+
+    def __init__(self, records: Iterable[_Record]) -> None:
+        """Initialize the table.
+
+        Args:
+            records: Rows in the order the API lists them
+        """
+        self.records = tuple(records)
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the records."""
+        return iter(self.records)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the rows of two tables."""
+        return isinstance(other, CompactTable) and self.records == other.records
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def to_json(self) -> list[dict[str, Any]]:
+        """Serialize the rows as the API's JSON-ready list."""
+        return [record.to_json() for record in self.records]
+
+
+def as_json(data: Any) -> Any:
+    """Get the JSON-ready form of scope data, expanding compact tables.
+
+    Args:
+        data: Scope data (a compact table, or already JSON-ready)
+
+    Returns:
+        JSON-ready data
+    """
+    return data.to_json() if isinstance(data, CompactTable) else data
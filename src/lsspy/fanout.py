@@ -0,0 +1,235 @@
+"""Leader-to-worker fan-out of update notifications over a local socket.
+
+With ``--workers N`` a single leader process watches the repositories and
+gathers their data. It writes every changed scope as an already-encoded
+WebSocket message to a shared :class:`~lsspy.snapshots.SnapshotStore` and
+announces the new version on this channel; the uvicorn worker processes read
+the bytes from the store and only forward them to their clients. The channel
+is a Unix domain socket (a loopback TCP socket where Unix sockets are
+unavailable), so no external broker is needed.
+
+Each frame is a fixed header followed by a ``repo:scope`` key and the
+payload::
+
+    !HI (key length, payload length) | key (UTF-8) | payload
+"""
+
+import asyncio
+import contextlib
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+from collections.abc import Awaitable, Callable
+
+# Environment variables handing the leader's configuration to worker processes
+FANOUT_ADDRESS_ENV = "LSSPY_FANOUT_ADDRESS"
+REPOS_ENV = "LSSPY_REPOS"
+EPOCH_ENV = "LSSPY_EPOCH"
+
+_HEADER = struct.Struct("!HI")
+
+
+def encode_frame(key: str, payload: bytes) -> bytes:
+    """Encode one frame.
+
+    Args:
+        key: Frame key (``repo:scope``)
+        payload: Pre-encoded message
+
+    Returns:
+        Frame bytes ready to be written to the channel
+    """
+    key_bytes = key.encode()
+    return _HEADER.pack(len(key_bytes), len(payload)) + key_bytes + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[str, bytes]:
+    """Read one frame from the channel.
+
+    Args:
+        reader: Stream connected to the leader
+
+    Returns:
+        Tuple of (key, payload)
+
+    Raises:
+        asyncio.IncompleteReadError: If the leader closed the connection
+    """
+    key_length, payload_length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    key = (await reader.readexactly(key_length)).decode()
+    payload = await reader.readexactly(payload_length)
+    return key, payload
+
+
+class FanoutPublisher:
+    """Leader side of the channel: accepts workers and sends them frames.
+
+    The newest frame for every key is kept, so a worker that connects (or
+    reconnects) late starts from the current state of every scope.
+    """
+
+    def __init__(self, send_timeout: float = 5.0) -> None:
+        """Initialize the publisher.
+
+        Args:
+            send_timeout: Drop a worker whose socket stays full this long (it
+                reconnects and is resent the newest frames)
+        """
+        self.send_timeout = send_timeout
+        self.address: str | None = None
+        self._server: socket.socket | None = None
+        self._clients: list[socket.socket] = []
+        self._latest: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._tmpdir: str | None = None
+
+    def start(self) -> str:
+        """Bind the channel and start accepting workers.
+
+        Returns:
+            Channel address (``unix:<path>`` or ``tcp:<host>:<port>``)
+        """
+        if self.address is not None:
+            return self.address
+
+        if hasattr(socket, "AF_UNIX"):
+            self._tmpdir = tempfile.mkdtemp(prefix="lsspy-")
+            path = os.path.join(self._tmpdir, "fanout.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            self.address = f"unix:{path}"
+        else:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(("127.0.0.1", 0))
+            host, port = server.getsockname()
+            self.address = f"tcp:{host}:{port}"
+
+        server.listen()
+        self._server = server
+        self._thread = threading.Thread(target=self._accept_loop, name="lsspy-fanout", daemon=True)
+        self._thread.start()
+        return self.address
+
+    def _accept_loop(self) -> None:
+        """Accept worker connections until the server socket is closed."""
+        server = self._server
+        while server is not None:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.settimeout(self.send_timeout)
+            with self._lock:
+                try:
+                    for frame in self._latest.values():
+                        conn.sendall(frame)
+                except OSError:
+                    conn.close()
+                    continue
+                self._clients.append(conn)
+
+    def publish(self, key: str, payload: bytes) -> int:
+        """Send a frame to every connected worker.
+
+        Args:
+            key: Frame key (``repo:scope``)
+            payload: Pre-encoded message
+
+        Returns:
+            Number of workers the frame was sent to
+        """
+        frame = encode_frame(key, payload)
+        with self._lock:
+            self._latest[key] = frame
+            for conn in list(self._clients):
+                try:
+                    conn.sendall(frame)
+                except OSError:
+                    self._clients.remove(conn)
+                    conn.close()
+            return len(self._clients)
+
+    @property
+    def worker_count(self) -> int:
+        """Number of connected workers."""
+        return len(self._clients)
+
+    def stop(self) -> None:
+        """Close the channel and every worker connection."""
+        if self._server is not None:
+            with contextlib.suppress(OSError):
+                self._server.shutdown(socket.SHUT_RDWR)
+            self._server.close()
+            self._server = None
+        with self._lock:
+            for conn in self._clients:
+                conn.close()
+            self._clients.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+        self.address = None
+
+
+async def open_channel(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a leader's channel.
+
+    Args:
+        address: Address returned by :meth:`FanoutPublisher.start`
+
+    Returns:
+        Stream reader and writer
+
+    Raises:
+        ValueError: If the address is malformed
+        OSError: If the leader cannot be reached
+    """
+    kind, _, location = address.partition(":")
+    if kind == "unix":
+        return await asyncio.open_unix_connection(location)
+    if kind == "tcp":
+        host, _, port = location.rpartition(":")
+        return await asyncio.open_connection(host, int(port))
+    raise ValueError(f"Invalid fan-out address: {address}")
+
+
+async def subscribe(
+    address: str,
+    on_frame: Callable[[str, bytes], Awaitable[None]],
+    retry_delay: float = 0.5,
+    max_retry_delay: float = 5.0,
+) -> None:
+    """Receive frames from the leader forever, reconnecting when it goes away.
+
+    Args:
+        address: Address returned by :meth:`FanoutPublisher.start`
+        on_frame: Coroutine called with each frame's key and payload
+        retry_delay: Initial delay before reconnecting
+        max_retry_delay: Longest delay between reconnection attempts
+    """
+    delay = retry_delay
+    while True:
+        try:
+            reader, writer = await open_channel(address)
+        except OSError:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_retry_delay)
+            continue
+
+        delay = retry_delay
+        try:
+            while True:
+                key, payload = await read_frame(reader)
+                await on_frame(key, payload)
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+        await asyncio.sleep(delay)
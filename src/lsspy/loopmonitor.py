@@ -0,0 +1,144 @@
+"""Event loop lag and slow callback monitor.
+
+A task on the loop wakes up at a fixed interval and records how late each
+wakeup ran (the loop's lag). A watchdog thread checks that those wakeups
+keep coming; when the loop has been stuck for longer than the threshold, it
+captures the loop thread's stack, so a blocking call (a synchronous read,
+``json.dumps`` of a large payload) is reported together with the code
+running it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any
+
+from lsspy.metrics import LOOP_LAG_SECONDS, LOOP_STALL_SECONDS, LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Callbacks blocking the loop longer than this are reported
+SLOW_CALLBACK_SECONDS = 0.1
+
+# Time between the monitor's wakeups on the loop
+LAG_INTERVAL_SECONDS = 0.05
+
+# Stalls kept for /api/debug/stats
+RECENT_STALLS = 20
+
+
+class LoopMonitor:
+    """Measure event loop lag and report callbacks that block the loop."""
+
+    def __init__(
+        self,
+        threshold: float = SLOW_CALLBACK_SECONDS,
+        interval: float = LAG_INTERVAL_SECONDS,
+        keep: int = RECENT_STALLS,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            threshold: Blocking time in seconds reported as a stall
+            interval: Time between wakeups on the loop in seconds
+            keep: Number of recent stalls to keep
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self._recent: deque[dict[str, Any]] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._loop_thread: int | None = None
+        # Stack captured by the watchdog during the current stall, if any
+        self._stall_stack: list[str] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from the loop's thread)."""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="lsspy-loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the wakeups and the watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+
+    def recent_stalls(self) -> list[dict[str, Any]]:
+        """Get the most recent stalls, oldest first.
+
+        Returns:
+            Dictionaries with ``at`` (Unix time the stall ended),
+            ``seconds`` (how long the loop was blocked) and ``stack`` (the
+            loop thread's stack while blocked, outermost call first; empty if
+            the stall ended before the watchdog sampled it)
+        """
+        with self._lock:
+            return list(self._recent)
+
+    async def _tick(self) -> None:
+        """Wake up at the interval, recording lag and closing stalls."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.threshold:
+                self._stalled(lag)
+
+    def _stalled(self, seconds: float) -> None:
+        """Record a stall that just ended."""
+        with self._lock:
+            stack, self._stall_stack = self._stall_stack or [], None
+            self._recent.append({"at": time.time(), "seconds": seconds, "stack": stack})
+        LOOP_STALLS.inc()
+        LOOP_STALL_SECONDS.observe(seconds)
+        if stack:
+            logger.warning(
+                "Event loop blocked for %.0fms in:\n%s", seconds * 1000, "\n".join(stack)
+            )
+        else:
+            logger.warning("Event loop blocked for %.0fms", seconds * 1000)
+
+    def _watch(self) -> None:
+        """Capture the loop thread's stack while the loop is stuck (watchdog thread)."""
+        poll = max(0.005, self.threshold / 4)
+        while not self._stopped.wait(poll):
+            stuck = time.monotonic() - self._beat - self.interval
+            if stuck < self.threshold or self._loop_thread is None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack = [
+                f"{entry.filename}:{entry.lineno} in {entry.name}"
+                for entry in traceback.extract_stack(frame)
+            ]
+            with self._lock:
+                # The first capture is closest to where the stall started
+                if self._stall_stack is None:
+                    self._stall_stack = stack
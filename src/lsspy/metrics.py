@@ -0,0 +1,334 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A deliberately small subset of the Prometheus client: counters, gauges and
+histograms with labels, kept in a registry that renders them for the
+``/metrics`` endpoint. No external service or client library is needed;
+any Prometheus-compatible scraper can read the output.
+"""
+
+import abc
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# Histogram buckets in seconds, from sub-millisecond reads to slow gathers
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Histogram buckets for payload sizes in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a decimal point)."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues) -> str:
+    """Format a label set as ``{name="value",...}`` (empty without labels)."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(abc.ABC):
+    """Base class for a metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """Order label values like the label names.
+
+        Raises:
+            ValueError: If the labels do not match the label names
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Yield the sample lines of the metric."""
+
+    def render(self) -> str:
+        """Render the metric family with its HELP and TYPE lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Initialize the counter (see ``_Metric``)."""
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the current count of a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        """Yield one sample per label set."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a queue depth."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        """Initialize the gauge (see ``_Metric``)."""
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge.
+
+        Args:
+            value: New value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> Iterator[str]:
+        """Yield one sample per label set."""
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, ascending (``+Inf`` is implied)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Per label set: per-bucket counts (non-cumulative, last is +Inf), sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation.
+
+        Args:
+            value: Observed value (seconds for timings)
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Get the number of observations of a label set."""
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[str]:
+        """Yield bucket, sum and count samples per label set."""
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._counts.items())
+            sums = dict(self._sums)
+        names = (*self.labelnames, "le")
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(sums[key])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        """Add a metric.
+
+        Raises:
+            ValueError: If a metric with the same name is registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Create and register a gauge."""
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def on_collect(self, callback: Callable[[], None]) -> None:
+        """Run a callback before every render, e.g. to refresh gauges."""
+        self._collectors.append(callback)
+
+    def render(self) -> str:
+        """Render every metric in the text exposition format."""
+        for callback in self._collectors:
+            callback()
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+SPEC_READ_SECONDS = REGISTRY.histogram(
+    "lsspy_spec_read_seconds", "Time to read and parse spec.yaml"
+)
+QUERY_SECONDS = REGISTRY.histogram(
+    "lsspy_sqlite_query_seconds",
+    "Time of runtime database reads, lock waits included",
+    ("query",),
+)
+QUERY_ERRORS = REGISTRY.counter(
+    "lsspy_sqlite_query_errors_total",
+    "Failed runtime database reads by kind (locked or error)",
+    ("query", "kind"),
+)
+READ_RETRIES = REGISTRY.counter(
+    "lsspy_reader_retries_total", "Reader pool calls retried after a lock error"
+)
+GATHER_SECONDS = REGISTRY.histogram(
+    "lsspy_gather_seconds", "Time to gather one data scope for a broadcast", ("scope",)
+)
+BROADCAST_CLIENTS = REGISTRY.counter(
+    "lsspy_broadcast_clients_total", "Clients an update was sent to", ("scope",)
+)
+BROADCAST_BYTES = REGISTRY.histogram(
+    "lsspy_broadcast_message_bytes", "Size of encoded update messages", ("scope",), SIZE_BUCKETS
+)
+BROADCAST_SEND_SECONDS = REGISTRY.histogram(
+    "lsspy_broadcast_send_seconds", "Time to send one update to every subscriber", ("scope",)
+)
+TRIGGER_TO_BROADCAST_SECONDS = REGISTRY.histogram(
+    "lsspy_trigger_to_broadcast_seconds",
+    "Time from a file change notification to its broadcast being sent",
+)
+READER_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "lsspy_reader_queue_wait_seconds", "Time reader pool calls waited for a thread"
+)
+READER_QUEUED = REGISTRY.gauge("lsspy_reader_queued", "Reader pool calls waiting for a thread")
+READER_RUNNING = REGISTRY.gauge("lsspy_reader_running", "Reader pool calls in progress")
+READER_COALESCED = REGISTRY.counter(
+    "lsspy_reader_coalesced_total", "Reader pool calls served by an identical call's read"
+)
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "lsspy_event_loop_lag_seconds", "How late the loop monitor's periodic wakeups ran"
+)
+LOOP_STALLS = REGISTRY.counter(
+    "lsspy_event_loop_stalls_total", "Callbacks that blocked the event loop past the threshold"
+)
+LOOP_STALL_SECONDS = REGISTRY.histogram(
+    "lsspy_event_loop_stall_seconds", "How long slow callbacks blocked the event loop"
+)
@@ -106,25 +106,122 @@ class DashboardData(BaseModel):
     leases: list[Lease] = Field(default_factory=list, description="Active leases")
     messages: list[Message] = Field(default_factory=list, description="Recent messages")
     events: list[Event] = Field(default_factory=list, description="Recent events")
+    versions: dict[str, int] = Field(
+        default_factory=dict, description="Scope versions the data is at least as new as"
+    )
+    data_version: str | None = Field(None, description="Stamp of the runtime database read")
     timestamp: datetime = Field(default_factory=datetime.now, description="Data timestamp")
 
 
+class TimeseriesPoint(CamelCaseModel):
+    """Event count for one bucket of a timeseries."""
+
+    bucket: datetime = Field(..., description="Bucket start timestamp (UTC)")
+    key: str | None = Field(None, description="Series key (event type, agent or task ID)")
+    count: int = Field(..., description="Number of events in the bucket")
+
+
+class TimeseriesResponse(CamelCaseModel):
+    """Time-bucketed event counts."""
+
+    resolution: str = Field(..., description="Bucket size (minute/hour/day)")
+    group_by: str = Field(..., alias="groupBy", description="Series key dimension")
+    last_event_id: int = Field(
+        0, alias="lastEventId", description="Newest event folded into the rollups"
+    )
+    points: list[TimeseriesPoint] = Field(default_factory=list, description="Data points")
+
+
+class HistorySnapshot(CamelCaseModel):
+    """Recorded runtime state reconstructed at a point in time."""
+
+    at: datetime = Field(..., description="Reconstructed point in time")
+    agents: list[Agent] = Field(default_factory=list, description="Agents known at that time")
+    leases: list[Lease] = Field(default_factory=list, description="Leases at that time")
+    task_statuses: dict[str, str] = Field(
+        default_factory=dict, alias="taskStatuses", description="Task status by task ID"
+    )
+
+
+class RepoInfo(CamelCaseModel):
+    """A monitored Lodestar repository."""
+
+    name: str = Field(..., description="Repository name used in routes and scopes")
+    lodestar_dir: str = Field(..., alias="lodestarDir", description="Monitored .lodestar directory")
+    default: bool = Field(False, description="Whether the plain /api routes serve this repository")
+    loaded: bool = Field(False, description="Whether readers or caches are held in memory")
+    db_exists: bool = Field(False, alias="dbExists", description="Whether runtime.sqlite exists")
+    spec_exists: bool = Field(False, alias="specExists", description="Whether spec.yaml exists")
+
+
+class RepoAgent(Agent):
+    """Agent of one repository in a fleet-wide view."""
+
+    repo: str = Field(..., description="Repository name")
+
+
+class RepoLease(Lease):
+    """Lease of one repository in a fleet-wide view."""
+
+    repo: str = Field(..., description="Repository name")
+
+
+class RepoTask(Task):
+    """Task of one repository in a fleet-wide view."""
+
+    repo: str = Field(..., description="Repository name")
+
+
+class FleetRepoState(CamelCaseModel):
+    """How one repository contributed to a fleet-wide view."""
+
+    repo: str = Field(..., description="Repository name")
+    status: str = Field(
+        "fresh", description="fresh, stale (older cached data after a failed read) or unavailable"
+    )
+    error: str | None = Field(None, description="Why current data could not be read")
+
+
+class FleetView(CamelCaseModel):
+    """Agents, leases and tasks merged across all monitored repositories."""
+
+    agents: list[RepoAgent] = Field(default_factory=list, description="Matching agents")
+    leases: list[RepoLease] = Field(default_factory=list, description="Active leases")
+    tasks: list[RepoTask] = Field(default_factory=list, description="Matching tasks")
+    repos: list[FleetRepoState] = Field(default_factory=list, description="Per-repository state")
+    timestamp: datetime = Field(default_factory=datetime.utcnow, description="View timestamp")
+
+
 class Status(BaseModel):
     """System status information."""
 
     status: str = Field(..., description="Overall status (ok/error)")
     version: str = Field(..., description="Application version")
+    repo: str | None = Field(None, description="Repository name")
     lodestar_dir: str | None = Field(None, description="Monitored .lodestar directory")
     db_exists: bool = Field(False, description="Whether runtime.sqlite exists")
     spec_exists: bool = Field(False, description="Whether spec.yaml exists")
     uptime_seconds: float | None = Field(None, description="Server uptime in seconds")
 
 
+class ReaderPoolStats(BaseModel):
+    """Queue metrics of the reader thread pool."""
+
+    workers: int = Field(..., description="Reader threads")
+    queued: int = Field(..., description="Reads waiting for a thread")
+    running: int = Field(..., description="Reads in progress")
+    completed: int = Field(..., description="Reads finished since startup")
+    coalesced: int = Field(..., description="Requests served by another request's read")
+    wait_seconds_total: float = Field(..., description="Total time reads spent queued")
+    wait_seconds_max: float = Field(..., description="Longest time a read spent queued")
+
+
 class HealthResponse(BaseModel):
     """Health check API response."""
 
     status: str = Field(..., description="Health status")
     version: str = Field(..., description="Application version")
+    readers: ReaderPoolStats | None = Field(None, description="Reader pool metrics")
 
 
 class ErrorResponse(BaseModel):
@@ -154,6 +251,18 @@ class WSUnsubscribeMessage(BaseModel):
     scopes: list[str] = Field(default_factory=list, description="Scopes to unsubscribe from")
 
 
+class WSReplayMessage(BaseModel):
+    """WebSocket request to replay recorded history."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    type: str = Field("replay", description="Message type")
+    start: datetime = Field(..., alias="from", description="Replay start timestamp")
+    end: datetime | None = Field(None, alias="to", description="Replay end (defaults to now)")
+    speed: float = Field(1.0, gt=0, description="Playback speed multiplier")
+    repo: str | None = Field(None, description="Repository to replay (defaults to the default one)")
+
+
 class WSUpdateMessage(BaseModel):
     """WebSocket update message sent to clients."""
 
@@ -161,7 +270,9 @@ class WSUpdateMessage(BaseModel):
 
     type: str = Field("update", description="Message type")
     scope: str = Field(..., description="Data scope (agents, tasks, leases, messages, events)")
+    repo: str | None = Field(None, description="Repository the data belongs to")
     data: Any = Field(..., description="Updated data")
+    version: int | None = Field(None, description="Scope version, sent back to resume")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Update timestamp")
 
 
@@ -183,4 +294,5 @@ class WSConnectedMessage(BaseModel):
     type: str = Field("connected", description="Message type")
     client_id: str = Field(..., description="Assigned client ID")
     subscriptions: list[str] = Field(default_factory=list, description="Current subscriptions")
+    epoch: str | None = Field(None, description="Server run that scope versions belong to")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Connection timestamp")
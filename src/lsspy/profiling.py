@@ -0,0 +1,77 @@
+"""Sampling profiler for a running server.
+
+Samples the Python stack of every thread (the event loop, reader pool,
+debounce and watcher threads) at a fixed interval using
+``sys._current_frames()``. No tracing hooks are installed, so the profiled
+process only pays for the sampling thread while a profile runs. Results
+are in the collapsed-stack format read by flamegraph tools.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+# Longest profile a request may ask for
+MAX_PROFILE_SECONDS = 60.0
+
+# Default time between samples
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Name a frame ``module:function:line`` for a collapsed stack."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    label = f"{module}:{code.co_qualname}:{code.co_firstlineno}"
+    # ";" separates frames and " " the count in the collapsed format
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def _stack(frame: FrameType | None) -> list[str]:
+    """Get the labels of a frame and its callers, outermost first."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def sample_stacks(seconds: float, interval: float = SAMPLE_INTERVAL_SECONDS) -> Counter[str]:
+    """Sample the stacks of all other threads of this process.
+
+    Blocks for ``seconds``; call it from a thread of its own.
+
+    Args:
+        seconds: How long to sample
+        interval: Time between samples in seconds
+
+    Returns:
+        Sample count per collapsed stack (``thread;outer;...;inner``)
+    """
+    me = threading.get_ident()
+    counts: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            thread_name = names.get(ident, str(ident)).replace(";", ":").replace(" ", "_")
+            counts[";".join([thread_name, *_stack(frame)])] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapse(counts: Counter[str]) -> str:
+    """Render sample counts in the collapsed-stack format, most sampled first.
+
+    Args:
+        counts: Sample count per collapsed stack
+
+    Returns:
+        One ``stack count`` line per stack
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
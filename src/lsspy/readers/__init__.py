@@ -1,6 +1,7 @@
 """Data readers for Lodestar files."""
 
+from lsspy.readers.pool import ReaderPool
 from lsspy.readers.runtime import RuntimeReader
 from lsspy.readers.spec import SpecReader
 
-__all__ = ["RuntimeReader", "SpecReader"]
+__all__ = ["ReaderPool", "RuntimeReader", "SpecReader"]
@@ -0,0 +1,293 @@
+"""Async facade running blocking reader calls off the event loop."""
+
+import asyncio
+import contextvars
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from lsspy.metrics import READ_RETRIES, READER_COALESCED, READER_QUEUE_WAIT_SECONDS
+
+T = TypeVar("T")
+
+# Threads reading Lodestar files; more concurrent reads queue up
+READER_MAX_WORKERS = 8
+
+# Longest a single request may wait for its reads, queueing included
+READ_DEADLINE_SECONDS = 10.0
+
+# Backoff after a "database is locked" failure, doubled per retry
+LOCK_RETRY_DELAY_SECONDS = 0.05
+
+
+class ReadDeadlineError(TimeoutError):
+    """A read did not finish before its deadline."""
+
+
+def _is_locked(error: sqlite3.OperationalError) -> bool:
+    """Check whether SQLite failed because a writer held the database."""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _copy_outcome(source: Future[Any], target: Future[Any]) -> None:
+    """Resolve ``target`` with the result or exception of ``source``."""
+    if source.cancelled():
+        target.cancel()
+    elif (error := source.exception()) is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+class _Flight:
+    """The running call for one single-flight key and its queued follow-up."""
+
+    def __init__(self, call: Callable[[], Any], future: Future[Any]) -> None:
+        self.call = call
+        self.future = future
+        self.follow_up: Future[Any] | None = None
+
+
+class ReaderPool:
+    """Bounded thread pool for reader calls with deadlines and async retries.
+
+    Blocking reads (SQLite queries, YAML parsing) run on dedicated threads so
+    a slow or locked database stalls only the requests reading it, never the
+    event loop. A call failing with a lock error is retried after an
+    ``asyncio.sleep`` backoff, which holds neither the loop nor a thread.
+
+    Identical calls are coalesced (single-flight): a call joins an identical
+    one still waiting for a thread, or else queues one follow-up behind the
+    running one, which every identical call arriving meanwhile shares. Each
+    caller thus gets data read after it arrived, yet N concurrent identical
+    calls cost at most two reads.
+
+    A deadline bounds the wait, not the thread: a read still running when its
+    deadline passes keeps its thread until SQLite's busy timeout ends it.
+    Deadlines count from submission, so time queued for a thread is included,
+    unless the caller starts them when the call reaches a thread.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = READER_MAX_WORKERS,
+        deadline: float = READ_DEADLINE_SECONDS,
+        retry_delay: float = LOCK_RETRY_DELAY_SECONDS,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Number of reader threads
+            deadline: Default deadline of a call in seconds
+            retry_delay: First backoff after a lock error in seconds
+        """
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.retry_delay = retry_delay
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lsspy-reader"
+        )
+        # Re-entrant: a done callback runs in place if its future has finished
+        self._lock = threading.RLock()
+        self._flights: dict[Hashable, _Flight] = {}
+        # Resolved when the call behind a returned future reaches a thread
+        self._started: dict[Future[Any], Future[None]] = {}
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._coalesced = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        deadline: float | None = None,
+        single_flight: bool = True,
+        timed_from_start: bool = False,
+        **kwargs: Any,
+    ) -> T:
+        """Run a blocking reader call on the pool.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for ``fn`` (hashable for single-flight)
+            deadline: Seconds the call may take, retries included (defaults to
+                the pool's deadline)
+            single_flight: Coalesce with identical calls (same function and
+                arguments); disable for calls with side effects
+            timed_from_start: Start ``deadline`` when the call reaches a
+                thread; the wait for one stays bounded by the pool's deadline
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            ReadDeadlineError: If the call did not finish in time
+            sqlite3.OperationalError: If the database stayed locked until the
+                deadline, or failed for another reason
+        """
+        loop = asyncio.get_running_loop()
+        limit = self.deadline if deadline is None else deadline
+        expires_at = loop.time() + (self.deadline if timed_from_start else limit)
+        call = partial(fn, *args, **kwargs)
+        key = (fn, args, tuple(sorted(kwargs.items()))) if single_flight else None
+        delay = self.retry_delay
+        while True:
+            future = self._submit(call, key)
+            try:
+                if timed_from_start:
+                    await asyncio.wait_for(self._until_started(future), expires_at - loop.time())
+                    # Retries stay within the deadline of the first attempt
+                    expires_at = loop.time() + limit
+                    timed_from_start = False
+                remaining = expires_at - loop.time()
+                # Shielded: other callers may share the future
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), remaining
+                )
+            except TimeoutError as e:
+                if key is None:
+                    future.cancel()
+                raise ReadDeadlineError(f"Read did not finish within {limit:g}s") from e
+            except sqlite3.OperationalError as e:
+                remaining = expires_at - loop.time()
+                if not _is_locked(e) or remaining <= delay:
+                    raise
+            READ_RETRIES.inc()
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def stats(self) -> dict[str, Any]:
+        """Get queue and wait time counters.
+
+        Returns:
+            Dictionary with ``workers``, ``queued`` (calls waiting for a
+            thread), ``running``, ``completed``, ``coalesced`` (calls that
+            shared another call's read), and ``wait_seconds_total`` and
+            ``wait_seconds_max`` (time completed calls spent queued)
+        """
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "coalesced": self._coalesced,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the threads, dropping queued calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _until_started(self, future: Future[Any]) -> None:
+        """Wait until the call behind a future reaches a thread or ends."""
+        with self._lock:
+            started = self._started.get(future)
+        if started is not None:
+            await asyncio.wait(
+                (asyncio.wrap_future(started), asyncio.wrap_future(future)),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+    def _submit(self, call: Callable[[], Any], key: Hashable | None) -> Future[Any]:
+        """Queue a call, or join an identical one (see the class docstring)."""
+        with self._lock:
+            flight = self._flights.get(key) if key is not None else None
+            if flight is None:
+                future = self._start(call)
+                if key is not None:
+                    self._flights[key] = _Flight(call, future)
+                    future.add_done_callback(partial(self._landed, key))
+                return future
+
+            self._coalesced += 1
+            READER_COALESCED.inc()
+            if not flight.future.running() and not flight.future.done():
+                return flight.future
+            if flight.follow_up is None:
+                flight.follow_up = Future()
+                self._track_start(flight.follow_up, Future())
+            return flight.follow_up
+
+    def _start(self, call: Callable[[], Any], started: Future[None] | None = None) -> Future[Any]:
+        """Submit a call to the executor, counting it as queued.
+
+        The call runs in a copy of the submitter's context, so it sees e.g.
+        the current trace span.
+
+        Args:
+            call: Call to run
+            started: Resolved when the call reaches a thread (a new one if None)
+        """
+        self._queued += 1
+        started = Future() if started is None else started
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._timed, call, time.monotonic(), started)
+        future.add_done_callback(self._dropped)
+        self._track_start(future, started)
+        return future
+
+    def _track_start(self, future: Future[Any], started: Future[None]) -> None:
+        """Remember the start signal of a future until the future is done."""
+        self._started[future] = started
+        future.add_done_callback(self._forget_start)
+
+    def _forget_start(self, future: Future[Any]) -> None:
+        """Drop the start signal of a finished future."""
+        with self._lock:
+            self._started.pop(future, None)
+
+    def _landed(self, key: Hashable, future: Future[Any]) -> None:
+        """Start the follow-up of a finished single-flight call, if any."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None or flight.future is not future:
+                return
+            follow_up = flight.follow_up
+            if follow_up is None:
+                del self._flights[key]
+                return
+            try:
+                flight.future = self._start(flight.call, self._started.get(follow_up))
+            except RuntimeError as e:
+                # Shut down meanwhile
+                del self._flights[key]
+                follow_up.set_exception(e)
+                return
+            flight.follow_up = None
+            flight.future.add_done_callback(partial(_copy_outcome, target=follow_up))
+            flight.future.add_done_callback(partial(self._landed, key))
+
+    def _dropped(self, future: Future[Any]) -> None:
+        """Uncount a call cancelled before it reached a thread."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _timed(self, call: Callable[[], T], submitted_at: float, started: Future[None]) -> T:
+        """Run a call on a pool thread, recording how long it was queued."""
+        if not started.done():
+            started.set_result(None)
+        waited = time.monotonic() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        READER_QUEUE_WAIT_SECONDS.observe(waited)
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
@@ -1,29 +1,64 @@
 """SQLite runtime database reader."""
 
 import sqlite3
+import threading
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+from lsspy.metrics import QUERY_ERRORS, QUERY_SECONDS
+
+# Tables defined by the Lodestar runtime schema
+RUNTIME_TABLES = ("agents", "leases", "messages", "events")
+
+# How long a statement waits for a writer's lock before failing
+BUSY_TIMEOUT_SECONDS = 2.0
+
+# Rows fetched from the cursor at a time when streaming events
+EVENT_BATCH_SIZE = 500
+
+
+@contextmanager
+def _measured(name: str) -> Iterator[None]:
+    """Time a database read and count its failures under a query name."""
+    start = time.perf_counter()
+    try:
+        yield
+    except sqlite3.Error as e:
+        QUERY_ERRORS.inc(query=name, kind="locked" if "locked" in str(e).lower() else "error")
+        raise
+    finally:
+        QUERY_SECONDS.observe(time.perf_counter() - start, query=name)
+
 
 class RuntimeReader:
     """Read data from runtime.sqlite."""
 
-    def __init__(self, db_path: Path, readonly: bool = True, timeout: float = 5.0) -> None:
+    def __init__(
+        self, db_path: Path, readonly: bool = True, timeout: float = BUSY_TIMEOUT_SECONDS
+    ) -> None:
         """Initialize the reader.
 
         Args:
             db_path: Path to runtime.sqlite file
             readonly: Open in read-only mode (compatible with WAL)
-            timeout: Connection timeout in seconds
+            timeout: Busy timeout in seconds: how long SQLite waits for a lock
+                held by a writer before a statement fails with "database is
+                locked" (retries are left to callers, see ``ReaderPool``)
         """
         self.db_path = db_path
         self.readonly = readonly
         self.timeout = timeout
 
-    def _connect(self) -> sqlite3.Connection:
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
         """Create a database connection.
 
+        Args:
+            check_same_thread: Refuse use from threads other than the creating
+                one (disable for connections handed between pool threads)
+
         Returns:
             SQLite connection
 
@@ -35,68 +70,151 @@ class RuntimeReader:
             raise FileNotFoundError(f"Database not found: {self.db_path}")
 
         uri = f"file:{self.db_path}?mode=ro" if self.readonly else str(self.db_path)
-        conn = sqlite3.connect(uri, timeout=self.timeout, uri=self.readonly)
+        conn = sqlite3.connect(
+            uri, timeout=self.timeout, uri=self.readonly, check_same_thread=check_same_thread
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
         conn.row_factory = sqlite3.Row
         return conn
 
     def _query(
-        self,
-        sql: str,
-        params: tuple[Any, ...] = (),
-        max_retries: int = 3,
-        retry_delay: float = 0.1,
+        self, sql: str, params: tuple[Any, ...] = (), name: str = "query"
     ) -> list[dict[str, Any]]:
         """Execute a query and return results as dictionaries.
 
+        Lock waits happen inside SQLite (see the busy timeout); this never
+        sleeps itself.
+
         Args:
             sql: SQL query string
             params: Query parameters
-            max_retries: Maximum retry attempts on database lock
-            retry_delay: Delay between retries in seconds
+            name: Query name its timing and failures are recorded under
 
         Returns:
             List of row dictionaries
 
         Raises:
-            sqlite3.Error: If query fails after retries
+            sqlite3.Error: If the query fails
         """
-        last_error = None
-        for attempt in range(max_retries):
-            conn = None
+        with _measured(name):
+            conn = self._connect()
             try:
-                conn = self._connect()
-                cursor = conn.cursor()
-                cursor.execute(sql, params)
-                rows = [dict(row) for row in cursor.fetchall()]
+                return [dict(row) for row in conn.execute(sql, params)]
+            finally:
                 conn.close()
-                return rows
-            except sqlite3.OperationalError as e:
-                last_error = e
-                if "locked" in str(e).lower() and attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
-                    continue
-                raise
-            except Exception:
-                if conn:
-                    conn.close()
-                raise
-
-        if last_error:
-            raise last_error
-        return []
+
+    def snapshot(
+        self, messages_limit: int = 50, events_limit: int = 100
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Read agents, active leases, recent messages and recent events at once.
+
+        All four queries run on one connection inside one read transaction,
+        so the result is a consistent view even while Lodestar writes (no
+        lease for an agent that is not listed yet).
+
+        Args:
+            messages_limit: Maximum number of messages
+            events_limit: Maximum number of events
+
+        Returns:
+            Table name to rows, ordered like the matching ``get_*`` helpers
+
+        Raises:
+            FileNotFoundError: If database file doesn't exist
+            sqlite3.Error: If a query fails
+        """
+        queries: dict[str, tuple[str, tuple[Any, ...]]] = {
+            "agents": ("SELECT * FROM agents ORDER BY last_seen_at DESC", ()),
+            "leases": (
+                "SELECT * FROM leases WHERE expires_at > datetime('now') ORDER BY expires_at",
+                (),
+            ),
+            "messages": (
+                "SELECT * FROM messages ORDER BY created_at DESC LIMIT ?",
+                (messages_limit,),
+            ),
+            "events": ("SELECT * FROM events ORDER BY event_id DESC LIMIT ?", (events_limit,)),
+        }
+
+        with _measured("snapshot"):
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN")
+                result = {
+                    table: [dict(row) for row in conn.execute(sql, params)]
+                    for table, (sql, params) in queries.items()
+                }
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        return result
+
+    def read_table(self, table: str) -> list[dict[str, Any]]:
+        """Read every row of a runtime table without swallowing errors.
+
+        Unlike the ``get_*`` helpers, failures are raised so callers can tell
+        an empty table apart from an unreadable database.
+
+        Args:
+            table: One of the runtime tables (agents, leases, messages, events)
+
+        Returns:
+            List of row dictionaries
+
+        Raises:
+            ValueError: If the table is not a runtime table
+            FileNotFoundError: If database file doesn't exist
+            sqlite3.Error: If the query fails
+        """
+        if table not in RUNTIME_TABLES:
+            raise ValueError(f"Unknown runtime table: {table}")
+        return self._query(f"SELECT * FROM {table}", name=f"read_{table}")
+
+    def fetch_agents(self) -> list[dict[str, Any]]:
+        """Get all agents, failing if the database cannot be read.
+
+        Returns:
+            List of agent dictionaries (empty if the database does not exist)
+
+        Raises:
+            sqlite3.Error: If the query fails (lock errors can be retried, see
+                ``ReaderPool``)
+        """
+        try:
+            return self._query("SELECT * FROM agents ORDER BY last_seen_at DESC", name="agents")
+        except FileNotFoundError:
+            return []
 
     def get_agents(self) -> list[dict[str, Any]]:
         """Get all agents.
 
         Returns:
-            List of agent dictionaries
+            List of agent dictionaries (empty if the database cannot be read)
         """
         try:
-            return self._query("SELECT * FROM agents ORDER BY last_seen_at DESC")
-        except FileNotFoundError:
+            return self.fetch_agents()
+        except sqlite3.Error:
             return []
-        except sqlite3.Error as e:
-            print(f"Error in get_agents: {e}")
+
+    def fetch_leases(self, include_expired: bool = False) -> list[dict[str, Any]]:
+        """Get leases, failing if the database cannot be read.
+
+        Args:
+            include_expired: Include expired leases
+
+        Returns:
+            List of lease dictionaries (empty if the database does not exist)
+
+        Raises:
+            sqlite3.Error: If the query fails
+        """
+        if include_expired:
+            sql = "SELECT * FROM leases ORDER BY expires_at DESC"
+        else:
+            sql = "SELECT * FROM leases WHERE expires_at > datetime('now') ORDER BY expires_at"
+        try:
+            return self._query(sql, name="leases")
+        except FileNotFoundError:
             return []
 
     def get_leases(self, include_expired: bool = False) -> list[dict[str, Any]]:
@@ -106,23 +224,17 @@ class RuntimeReader:
             include_expired: Include expired leases
 
         Returns:
-            List of lease dictionaries
+            List of lease dictionaries (empty if the database cannot be read)
         """
         try:
-            if include_expired:
-                sql = "SELECT * FROM leases ORDER BY expires_at DESC"
-            else:
-                sql = "SELECT * FROM leases WHERE expires_at > datetime('now') ORDER BY expires_at"
-            return self._query(sql)
-        except FileNotFoundError:
-            return []
+            return self.fetch_leases(include_expired=include_expired)
         except sqlite3.Error:
             return []
 
-    def get_messages(
+    def fetch_messages(
         self, limit: int = 50, unread_only: bool = False, agent_id: str | None = None
     ) -> list[dict[str, Any]]:
-        """Get recent messages.
+        """Get recent messages, failing if the database cannot be read.
 
         Args:
             limit: Maximum number of messages
@@ -130,32 +242,75 @@ class RuntimeReader:
             agent_id: Filter for messages unread by specific agent (requires unread_only=True)
 
         Returns:
-            List of message dictionaries
+            List of message dictionaries (empty if the database does not exist)
+
+        Raises:
+            sqlite3.Error: If the query fails
         """
+        if unread_only and agent_id:
+            # Get messages where agent_id is NOT in the read_by JSON array
+            sql = """SELECT * FROM messages
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM json_each(read_by) WHERE value = ?
+                    )
+                    ORDER BY created_at DESC LIMIT ?"""
+            params: tuple[str, int] | tuple[int] = (agent_id, limit)
+        elif unread_only:
+            # Get messages where read_by array is empty or NULL
+            sql = """SELECT * FROM messages
+                    WHERE read_by IS NULL OR read_by = '[]'
+                    ORDER BY created_at DESC LIMIT ?"""
+            params = (limit,)
+        else:
+            sql = "SELECT * FROM messages ORDER BY created_at DESC LIMIT ?"
+            params = (limit,)
         try:
-            if unread_only and agent_id:
-                # Get messages where agent_id is NOT in the read_by JSON array
-                sql = """SELECT * FROM messages
-                        WHERE NOT EXISTS (
-                            SELECT 1 FROM json_each(read_by) WHERE value = ?
-                        )
-                        ORDER BY created_at DESC LIMIT ?"""
-                params: tuple[str, int] = (agent_id, limit)
-            elif unread_only:
-                # Get messages where read_by array is empty or NULL
-                sql = """SELECT * FROM messages
-                        WHERE read_by IS NULL OR read_by = '[]'
-                        ORDER BY created_at DESC LIMIT ?"""
-                params = (limit,)  # type: ignore[assignment]
-            else:
-                sql = "SELECT * FROM messages ORDER BY created_at DESC LIMIT ?"
-                params = (limit,)  # type: ignore[assignment]
-            return self._query(sql, params)
+            return self._query(sql, params, name="messages")
         except FileNotFoundError:
             return []
+
+    def get_messages(
+        self, limit: int = 50, unread_only: bool = False, agent_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Get recent messages.
+
+        Args:
+            limit: Maximum number of messages
+            unread_only: Only return unread messages
+            agent_id: Filter for messages unread by specific agent (requires unread_only=True)
+
+        Returns:
+            List of message dictionaries (empty if the database cannot be read)
+        """
+        try:
+            return self.fetch_messages(limit=limit, unread_only=unread_only, agent_id=agent_id)
         except sqlite3.Error:
             return []
 
+    def fetch_events(self, limit: int = 100, event_type: str | None = None) -> list[dict[str, Any]]:
+        """Get recent events, failing if the database cannot be read.
+
+        Args:
+            limit: Maximum number of events
+            event_type: Filter by event type
+
+        Returns:
+            List of event dictionaries (empty if the database does not exist)
+
+        Raises:
+            sqlite3.Error: If the query fails
+        """
+        if event_type:
+            sql = "SELECT * FROM events WHERE event_type = ? ORDER BY event_id DESC LIMIT ?"
+            params: tuple[str, int] | tuple[int] = (event_type, limit)
+        else:
+            sql = "SELECT * FROM events ORDER BY event_id DESC LIMIT ?"
+            params = (limit,)
+        try:
+            return self._query(sql, params, name="events")
+        except FileNotFoundError:
+            return []
+
     def get_events(self, limit: int = 100, event_type: str | None = None) -> list[dict[str, Any]]:
         """Get recent events.
 
@@ -164,21 +319,73 @@ class RuntimeReader:
             event_type: Filter by event type
 
         Returns:
-            List of event dictionaries
+            List of event dictionaries (empty if the database cannot be read)
+        """
+        try:
+            return self.fetch_events(limit=limit, event_type=event_type)
+        except sqlite3.Error:
+            return []
+
+    def stream_events(
+        self,
+        limit: int | None = None,
+        event_type: str | None = None,
+        batch_size: int = EVENT_BATCH_SIZE,
+    ) -> "EventStream":
+        """Stream events newest first, a batch at a time.
+
+        Nothing is read until the first batch is fetched.
+
+        Args:
+            limit: Maximum number of events (None for all of them)
+            event_type: Filter by event type
+            batch_size: Rows fetched from the cursor at a time
+
+        Returns:
+            Stream of event dictionaries, to be closed when no longer read
+        """
+        sql = "SELECT * FROM events"
+        params: list[Any] = []
+        if event_type:
+            sql += " WHERE event_type = ?"
+            params.append(event_type)
+        sql += " ORDER BY event_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return EventStream(self, sql, tuple(params), batch_size)
+
+    def get_events_since(self, after_id: int, limit: int = 5000) -> list[dict[str, Any]]:
+        """Get events newer than a given event ID, oldest first.
+
+        Args:
+            after_id: Only return events with an event_id greater than this
+            limit: Maximum number of events
+
+        Returns:
+            List of event dictionaries in ascending event_id order
         """
         try:
-            if event_type:
-                sql = "SELECT * FROM events WHERE event_type = ? ORDER BY event_id DESC LIMIT ?"
-                params: tuple[str, int] | tuple[int] = (event_type, limit)
-            else:
-                sql = "SELECT * FROM events ORDER BY event_id DESC LIMIT ?"
-                params = (limit,)
-            return self._query(sql, params)
+            sql = "SELECT * FROM events WHERE event_id > ? ORDER BY event_id LIMIT ?"
+            return self._query(sql, (after_id, limit), name="events_since")
         except FileNotFoundError:
             return []
         except sqlite3.Error:
             return []
 
+    def get_max_event_id(self) -> int | None:
+        """Get the newest event ID.
+
+        Returns:
+            Highest event_id (0 if there are no events), or None if the
+            database cannot be read
+        """
+        try:
+            rows = self._query("SELECT MAX(event_id) AS max_id FROM events", name="max_event_id")
+        except (FileNotFoundError, sqlite3.Error):
+            return None
+        return int(rows[0]["max_id"] or 0) if rows else 0
+
     def check_database_health(self) -> dict[str, Any]:
         """Check database health and accessibility.
 
@@ -218,3 +425,92 @@ class RuntimeReader:
             health["error"] = str(e)
 
         return health
+
+
+class EventStream:
+    """Rows of an events query, fetched in batches from one open cursor.
+
+    The query's statement stays active between batches, so a stream of any
+    length reads one consistent view of the table while holding a single
+    batch in memory. Batches may be fetched from different threads, one at
+    a time.
+    """
+
+    def __init__(
+        self, reader: RuntimeReader, sql: str, params: tuple[Any, ...], batch_size: int
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            reader: Reader of the database to query
+            sql: Events query
+            params: Query parameters
+            batch_size: Rows fetched at a time
+        """
+        self.reader = reader
+        self.sql = sql
+        self.params = params
+        self.batch_size = batch_size
+        self._conn: sqlite3.Connection | None = None
+        self._cursor: sqlite3.Cursor | None = None
+        self._done = False
+        self._closing = False
+        self._lock = threading.Lock()
+
+    def fetch(self) -> list[dict[str, Any]]:
+        """Fetch the next batch of rows.
+
+        Returns:
+            Up to ``batch_size`` event dictionaries; an empty list once every
+            row has been fetched or the stream was closed
+
+        Raises:
+            FileNotFoundError: If database file doesn't exist
+            sqlite3.Error: If the query fails (a failure of the first batch
+                can be retried, later ones end the stream)
+        """
+        with self._lock:
+            if self._done:
+                return []
+            started = self._cursor is not None
+            try:
+                with _measured("events_stream"):
+                    if self._cursor is None:
+                        self._conn = self.reader._connect(check_same_thread=False)
+                        self._cursor = self._conn.execute(self.sql, self.params)
+                    rows = self._cursor.fetchmany(self.batch_size)
+            except (FileNotFoundError, sqlite3.Error) as e:
+                self._release()
+                if not started and isinstance(e, sqlite3.Error):
+                    self._done = self._closing
+                    raise
+                self._done = True
+                if isinstance(e, FileNotFoundError):
+                    raise
+                # Not an OperationalError: retrying would restart the stream
+                raise sqlite3.DatabaseError(f"Event stream interrupted: {e}") from e
+            if len(rows) < self.batch_size or self._closing:
+                self._done = True
+                self._release()
+            return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the stream's connection.
+
+        Never blocks: a fetch in progress on another thread closes the
+        connection once it returns.
+        """
+        self._closing = True
+        if self._lock.acquire(blocking=False):
+            try:
+                self._done = True
+                self._release()
+            finally:
+                self._lock.release()
+
+    def _release(self) -> None:
+        """Close the connection, if one is open (the lock must be held)."""
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._cursor = None
@@ -1,10 +1,12 @@
 """YAML spec file reader."""
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 import yaml  # type: ignore[import-untyped]
 
+from lsspy.metrics import SPEC_READ_SECONDS
 from lsspy.models import Task
 
 
@@ -32,7 +34,7 @@ class SpecReader:
         if not self.spec_path.exists():
             raise FileNotFoundError(f"Spec file not found: {self.spec_path}")
 
-        with open(self.spec_path) as f:
+        with SPEC_READ_SECONDS.time(), open(self.spec_path) as f:
             data = yaml.safe_load(f)
             return data if data is not None else {}
 
@@ -67,10 +69,23 @@ class SpecReader:
         Returns:
             List of Task model instances
         """
-        tasks_data = self.get_tasks()
-        tasks = []
+        return list(self.iter_tasks_typed())
 
-        for task_dict in tasks_data:
+    def iter_tasks_typed(self) -> Iterator[Task]:
+        """Iterate over the tasks of the spec as typed Task objects.
+
+        The spec is read up front; tasks are converted one at a time, so
+        callers keeping another form of them never hold every model at once.
+
+        Yields:
+            Task model instances (invalid tasks are skipped)
+        """
+        tasks_dict = self.read_safe().get("tasks", {})
+        if not isinstance(tasks_dict, dict):
+            return
+
+        for task_id, task_data in tasks_dict.items():
+            task_dict = {"id": task_id, **task_data}
             try:
                 # Map spec fields to Task model fields (handle both snake_case and camelCase)
                 task = Task(
@@ -90,12 +105,10 @@ class SpecReader:
                     updatedAt=task_dict.get("updated_at", task_dict.get("updatedAt")),
                     prdSource=task_dict.get("prd_source", task_dict.get("prdSource")),
                 )
-                tasks.append(task)
             except Exception:
                 # Skip invalid tasks
                 continue
-
-        return tasks
+            yield task
 
     def get_task_by_id(self, task_id: str) -> dict[str, Any] | None:
         """Get a specific task by ID.
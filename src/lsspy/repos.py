@@ -0,0 +1,279 @@
+"""Registry of the Lodestar repositories monitored by one lsspy process."""
+
+import re
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.readers.spec import SpecReader
+from lsspy.stores.history import HistoryStore
+from lsspy.stores.rollups import EventRollupStore
+from lsspy.stores.sidecar import sidecar_dir
+
+# Repository names appear in URLs and in "repo:scope" WebSocket scopes
+REPO_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def repo_name_for(lodestar_dir: Path) -> str:
+    """Derive a repository name from its .lodestar directory.
+
+    Args:
+        lodestar_dir: Path to .lodestar directory
+
+    Returns:
+        Name of the directory containing .lodestar, reduced to URL-safe characters
+    """
+    base = lodestar_dir.absolute()
+    if base.name == ".lodestar":
+        base = base.parent
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "-", base.name).strip("-.")
+    return name or "repo"
+
+
+class Repo:
+    """One monitored .lodestar directory.
+
+    Readers and sidecar stores are created on first use and dropped again by
+    :meth:`release`, so an idle repository costs little more than its path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lodestar_dir: Path,
+        record_history: bool = False,
+        history_retention_days: float | None = None,
+    ) -> None:
+        """Initialize the repository.
+
+        Args:
+            name: Repository name used in routes and WebSocket scopes
+            lodestar_dir: Path to .lodestar directory
+            record_history: Record agent, lease and task status changes
+            history_retention_days: Compact recorded history older than this
+                many days (None keeps everything)
+
+        Raises:
+            ValueError: If the name is not URL-safe
+        """
+        if not REPO_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid repository name: {name!r}")
+        self.name = name
+        self.lodestar_dir = lodestar_dir
+        self.record_history = record_history
+        self.history_retention_days = history_retention_days
+        self.last_active = time.monotonic()
+
+        #: Scope data from the last broadcast, kept only while clients watch the repo
+        self.snapshot: dict[str, Any] | None = None
+        self.snapshot_at = 0.0
+
+        self._lock = threading.Lock()
+        self._runtime_reader: RuntimeReader | None = None
+        self._spec_reader: SpecReader | None = None
+        self._rollup_store: EventRollupStore | None = None
+        self._history_store: HistoryStore | None = None
+
+    @property
+    def runtime_reader(self) -> RuntimeReader:
+        """Reader for runtime.sqlite (created on first use)."""
+        with self._lock:
+            if self._runtime_reader is None:
+                self._runtime_reader = RuntimeReader(self.lodestar_dir / "runtime.sqlite")
+            return self._runtime_reader
+
+    @property
+    def spec_reader(self) -> SpecReader:
+        """Reader for spec.yaml (created on first use)."""
+        with self._lock:
+            if self._spec_reader is None:
+                self._spec_reader = SpecReader(self.lodestar_dir / "spec.yaml")
+            return self._spec_reader
+
+    @property
+    def rollup_store(self) -> EventRollupStore:
+        """Event rollup sidecar (created on first use)."""
+        with self._lock:
+            if self._rollup_store is None:
+                self._rollup_store = EventRollupStore(
+                    sidecar_dir(self.lodestar_dir) / "rollups.sqlite"
+                )
+            return self._rollup_store
+
+    @property
+    def history_store(self) -> HistoryStore | None:
+        """History sidecar, or None if history recording is disabled."""
+        if not self.record_history:
+            return None
+        with self._lock:
+            if self._history_store is None:
+                self._history_store = HistoryStore(
+                    sidecar_dir(self.lodestar_dir) / "history.sqlite",
+                    retention_days=self.history_retention_days,
+                )
+            return self._history_store
+
+    @property
+    def loaded(self) -> bool:
+        """Whether any reader, store or cached snapshot is held in memory."""
+        return self.snapshot is not None or any(
+            obj is not None
+            for obj in (
+                self._runtime_reader,
+                self._spec_reader,
+                self._rollup_store,
+                self._history_store,
+            )
+        )
+
+    def store_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Cache freshly gathered scope data.
+
+        Args:
+            snapshot: Scope name to JSON-ready data
+        """
+        self.snapshot = snapshot
+        self.snapshot_at = time.monotonic()
+
+    def fresh_snapshot(self, max_age: float) -> dict[str, Any] | None:
+        """Get the cached scope data if it is recent enough.
+
+        Agent status and lease expiry change with time alone, so old
+        snapshots are not served even when nothing was written.
+
+        Args:
+            max_age: Maximum snapshot age in seconds
+
+        Returns:
+            Scope name to data, or None if nothing fresh is cached
+        """
+        snapshot = self.snapshot
+        if snapshot is None or time.monotonic() - self.snapshot_at > max_age:
+            return None
+        return snapshot
+
+    def touch(self) -> None:
+        """Mark the repository as recently used."""
+        self.last_active = time.monotonic()
+
+    def release(self) -> None:
+        """Drop readers, stores and the cached snapshot.
+
+        Everything is recreated lazily on next use; sidecar data stays on disk.
+        """
+        with self._lock:
+            self._runtime_reader = None
+            self._spec_reader = None
+            self._rollup_store = None
+            self._history_store = None
+            self.snapshot = None
+
+
+class RepoRegistry:
+    """Named collection of monitored repositories.
+
+    The first repository added is the default one, served by the
+    un-namespaced ``/api`` routes and bare WebSocket scopes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._repos: dict[str, Repo] = {}
+
+    def add(
+        self,
+        lodestar_dir: Path,
+        name: str | None = None,
+        record_history: bool = False,
+        history_retention_days: float | None = None,
+    ) -> Repo:
+        """Register a repository.
+
+        Args:
+            lodestar_dir: Path to .lodestar directory
+            name: Repository name (derived from the directory if omitted; a
+                numeric suffix is added when a derived name is taken)
+            record_history: Record agent, lease and task status changes
+            history_retention_days: Compact recorded history older than this
+                many days (None keeps everything)
+
+        Returns:
+            The registered repository
+
+        Raises:
+            ValueError: If an explicit name is invalid or already registered
+        """
+        if name is None:
+            base = repo_name_for(lodestar_dir)
+            name = base
+            suffix = 2
+            while name in self._repos:
+                name = f"{base}-{suffix}"
+                suffix += 1
+        elif name in self._repos:
+            raise ValueError(f"Repository already registered: {name}")
+
+        repo = Repo(
+            name,
+            lodestar_dir,
+            record_history=record_history,
+            history_retention_days=history_retention_days,
+        )
+        self._repos[name] = repo
+        return repo
+
+    def get(self, name: str) -> Repo | None:
+        """Get a repository by name.
+
+        Args:
+            name: Repository name
+
+        Returns:
+            The repository, or None if not registered
+        """
+        return self._repos.get(name)
+
+    @property
+    def default(self) -> Repo | None:
+        """The first registered repository, if any."""
+        return next(iter(self._repos.values()), None)
+
+    def names(self) -> list[str]:
+        """Get the registered repository names in registration order."""
+        return list(self._repos)
+
+    def clear(self) -> None:
+        """Forget every repository."""
+        self._repos.clear()
+
+    def evict_idle(self, idle_seconds: float, keep: set[str] | None = None) -> list[str]:
+        """Release repositories that have not been used recently.
+
+        Args:
+            idle_seconds: Release repositories unused for at least this long
+            keep: Names of repositories to keep loaded regardless (e.g. ones
+                with WebSocket subscribers)
+
+        Returns:
+            Names of the repositories that were released
+        """
+        cutoff = time.monotonic() - idle_seconds
+        released = []
+        for repo in self._repos.values():
+            if keep and repo.name in keep:
+                continue
+            if repo.loaded and repo.last_active <= cutoff:
+                repo.release()
+                released.append(repo.name)
+        return released
+
+    def __iter__(self) -> Iterator[Repo]:
+        """Iterate over repositories in registration order."""
+        return iter(list(self._repos.values()))
+
+    def __len__(self) -> int:
+        """Number of registered repositories."""
+        return len(self._repos)
@@ -1,49 +1,735 @@
 """FastAPI server for LSSPY dashboard."""
 
 import asyncio
+import hashlib
+import ipaddress
 import json
+import logging
+import os
+import sqlite3
+import threading
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+import yaml  # type: ignore[import-untyped]
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-
-from lsspy import __version__
+from pydantic import ValidationError
+
+from lsspy import __version__, tracing
+from lsspy.compact import (
+    CompactTable,
+    EventRecord,
+    SharedValues,
+    TaskRecord,
+    as_json,
+    intern_fields,
+)
+from lsspy.fanout import EPOCH_ENV, FANOUT_ADDRESS_ENV, REPOS_ENV, FanoutPublisher, subscribe
+from lsspy.loopmonitor import LoopMonitor
+from lsspy.metrics import (
+    BROADCAST_BYTES,
+    BROADCAST_CLIENTS,
+    BROADCAST_SEND_SECONDS,
+    CONTENT_TYPE,
+    GATHER_SECONDS,
+    READER_QUEUED,
+    READER_RUNNING,
+    REGISTRY,
+    TRIGGER_TO_BROADCAST_SECONDS,
+)
 from lsspy.models import (
     Agent,
+    DashboardData,
     Event,
+    FleetRepoState,
+    FleetView,
     HealthResponse,
+    HistorySnapshot,
     Lease,
     Message,
+    ReaderPoolStats,
+    RepoAgent,
+    RepoInfo,
+    RepoLease,
+    RepoTask,
     Status,
     Task,
+    TimeseriesPoint,
+    TimeseriesResponse,
     WSConnectedMessage,
     WSErrorMessage,
+    WSReplayMessage,
     WSUpdateMessage,
 )
-from lsspy.readers.runtime import RuntimeReader
-from lsspy.readers.spec import SpecReader
-from lsspy.watcher import LodestarWatcher
+from lsspy.profiling import MAX_PROFILE_SECONDS, collapse, sample_stacks
+from lsspy.readers.pool import ReadDeadlineError, ReaderPool
+from lsspy.readers.runtime import RUNTIME_TABLES, EventStream
+from lsspy.repos import Repo, RepoRegistry
+from lsspy.snapshots import SNAPSHOT_DIR_ENV, SnapshotStore, default_snapshot_dir
+from lsspy.stores.history import State, apply_change
+from lsspy.streams import (
+    STREAM_HEARTBEAT_SECONDS,
+    STREAM_RETRY_MS,
+    StreamHub,
+    format_event,
+)
+from lsspy.watcher import WatcherPool
+
+logger = logging.getLogger(__name__)
 
 # Get the package directory
 PACKAGE_DIR = Path(__file__).parent
 STATIC_DIR = PACKAGE_DIR / "static"
 
 # Global state - will be set by CLI
-_lodestar_dir: Path | None = None
-_runtime_reader: RuntimeReader | None = None
-_spec_reader: SpecReader | None = None
-_watcher: LodestarWatcher | None = None
+_registry = RepoRegistry()
+_watcher: WatcherPool | None = None
+_reader_pool: ReaderPool | None = None
 _shutting_down: bool = False
 
+# Identifies this server run (the leader's, in worker mode); scope versions
+# from another run cannot be resumed
+_epoch = uuid.uuid4().hex[:8]
+
+# Multi-worker mode, worker side: the leader's channel, its shared snapshot store
+# and the newest snapshot version forwarded per "repo:scope" key
+_fanout_address: str | None = None
+_snapshot_reader: SnapshotStore | None = None
+_fanout_versions: dict[str, int] = {}
+
+# Multi-worker mode, leader side
+_fanout_publisher: FanoutPublisher | None = None
+_leader_store: SnapshotStore | None = None
+_leader_watcher: WatcherPool | None = None
+_leader_lock = threading.Lock()
+_leader_values: dict[str, dict[str, Any]] = {}
+
+# Values parsed from JSON columns, shared by the gathered rows repeating them
+_shared_values = SharedValues()
+
+# Data scopes a WebSocket client can subscribe to, per repository
+DATA_SCOPES = ("agents", "tasks", "leases", "messages", "events")
+
 # Valid WebSocket subscription scopes
-VALID_SCOPES = {"agents", "tasks", "leases", "messages", "events", "all"}
+VALID_SCOPES = {*DATA_SCOPES, "all"}
+
+# Scopes streamed by a history replay, in the order they are sent
+REPLAY_SCOPES = ("agents", "leases", "tasks", "events")
+
+# Longest pause between replay frames; quiet periods are compressed to this
+MAX_REPLAY_GAP_SECONDS = 2.0
+
+# Number of recent events kept in the replayed events scope (matches live updates)
+REPLAY_EVENT_WINDOW = 100
+
+# Repositories unused for this long have their readers and caches released
+REPO_IDLE_SECONDS = 300.0
+REPO_EVICT_INTERVAL_SECONDS = 60.0
+
+# Cached broadcast data younger than this is reused for new subscribers
+SNAPSHOT_MAX_AGE_SECONDS = 5.0
+
+# Longest a REST request may wait for a scope change (?wait_for_change_since=)
+LONG_POLL_MAX_SECONDS = 60.0
+
+# Repositories long-polled this recently count as watched between two polls
+LONG_POLL_GRACE_SECONDS = 5.0
+
+# Response header carrying the version of the scope a REST response reflects
+VERSION_HEADER = "X-Lsspy-Version"
+
+# Largest /api/events page built in memory; larger ones are streamed
+EVENTS_PAGE_LIMIT = 500
+
+# WebSocket scope streaming the fleet-wide view, and its subscription key
+ALL_REPOS_SCOPE = "all-repos"
+_FLEET_KEY = "*"
+
+# Repository scopes merged into fleet-wide views
+FLEET_SCOPES = ("agents", "leases", "tasks")
+
+# How long reading one repository for a fleet view may take once the read starts
+FLEET_REPO_TIMEOUT_SECONDS = 2.0
+
+# /api/debug endpoints are off unless enabled (--debug-endpoints); workers
+# learn the setting from this environment variable
+DEBUG_ENDPOINTS_ENV = "LSSPY_DEBUG_ENDPOINTS"
+_debug_endpoints = False
+
+# One profile at a time: concurrent samplers would skew each other
+_profile_lock = threading.Lock()
+
+# Event loop monitor (--loop-monitor): slow callback threshold in seconds, or
+# None when off; workers learn it from this environment variable
+LOOP_MONITOR_ENV = "LSSPY_LOOP_MONITOR"
+_loop_monitor_threshold: float | None = None
+_loop_monitor: LoopMonitor | None = None
+
+# Span trace file (--trace), opened while the server or fan-out leader runs
+_trace_file: Path | None = None
+_trace_exporter: tracing.SpanExporter | None = None
+
+
+def _agent_status(last_seen_at: str | None, now: datetime | None = None) -> str:
+    """Derive an agent's status from its last heartbeat.
+
+    Args:
+        last_seen_at: ISO 8601 last seen timestamp
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        online, idle or offline (schema: 15min idle, 60min offline)
+    """
+    status = "offline"
+    if last_seen_at:
+        try:
+            last_seen = datetime.fromisoformat(last_seen_at.replace("Z", "+00:00"))
+            reference = now or datetime.utcnow()
+            elapsed_seconds = (
+                reference.replace(tzinfo=None) - last_seen.replace(tzinfo=None)
+            ).total_seconds()
+            if elapsed_seconds < 900:  # 15 minutes
+                status = "online"
+            elif elapsed_seconds < 3600:  # 60 minutes
+                status = "idle"
+        except Exception:
+            pass
+    return status
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Make a timestamp timezone-aware, treating naive values as UTC."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=UTC)
+    return timestamp.astimezone(UTC)
+
+
+def _agent_from_row(a: dict[str, Any], now: datetime | None = None) -> Agent:
+    """Build an Agent model from an agents table row.
+
+    Args:
+        a: Row dictionary from the agents table
+        now: Reference time for the status calculation
+    """
+    # Parse capabilities and session_meta
+    capabilities = []
+    if a.get("capabilities"):
+        try:
+            capabilities = json.loads(a.get("capabilities") or "[]")
+        except (json.JSONDecodeError, TypeError):
+            capabilities = (a.get("capabilities") or "").split(",")
+
+    session_meta = None
+    if a.get("session_meta"):
+        try:
+            session_meta = json.loads(a.get("session_meta") or "null")
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    return Agent(
+        id=a.get("agent_id", ""),
+        displayName=a.get("display_name"),
+        role=a.get("role"),
+        status=_agent_status(a.get("last_seen_at"), now),
+        lastSeenAt=a.get("last_seen_at"),
+        registeredAt=a.get("created_at"),
+        capabilities=capabilities,
+        sessionMeta=session_meta,
+    )
+
+
+def _lease_from_row(lease: dict[str, Any]) -> Lease:
+    """Build a Lease model from a leases table row."""
+    return Lease(
+        leaseId=lease.get("lease_id", ""),
+        taskId=lease.get("task_id", ""),
+        agentId=lease.get("agent_id", ""),
+        expiresAt=lease.get("expires_at") or datetime.utcnow(),
+        ttlSeconds=900,  # Default, not in DB
+        createdAt=lease.get("created_at") or datetime.utcnow(),
+    )
+
+
+def _message_from_row(m: dict[str, Any]) -> Message:
+    """Build a Message model from a messages table row."""
+    # Parse meta
+    meta = {}
+    if m.get("meta"):
+        try:
+            meta = json.loads(m.get("meta") or "{}")
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    # Parse read_by array
+    read_by = []
+    if m.get("read_by"):
+        try:
+            read_by = json.loads(m.get("read_by") or "[]")
+        except (json.JSONDecodeError, TypeError):
+            read_by = []
+
+    return Message(
+        id=m.get("message_id", ""),
+        createdAt=m.get("created_at") or datetime.utcnow(),
+        **{"from": m.get("from_agent_id", "")},
+        taskId=(m.get("to_id") or "") if m.get("to_type") == "task" else "",
+        body=m.get("text", ""),
+        readBy=read_by,
+        subject=meta.get("subject"),
+        severity=meta.get("severity"),
+    )
+
+
+def _event_from_row(e: dict[str, Any]) -> Event:
+    """Build an Event model from an events table row."""
+    # Parse payload if it's a JSON string
+    payload = e.get("data", {})
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except (json.JSONDecodeError, TypeError):
+            payload = {}
+
+    return Event(
+        id=e.get("event_id", 0),
+        createdAt=e.get("created_at") or datetime.utcnow(),
+        type=e.get("event_type", ""),
+        actorAgentId=e.get("agent_id"),
+        taskId=e.get("task_id"),
+        targetAgentId=e.get("target_agent_id"),
+        correlationId=e.get("correlation_id"),
+        payload=payload,
+    )
+
+
+def _parse_scope(scope: str) -> tuple[str, str] | None:
+    """Split a WebSocket scope into a repository name and a data scope.
+
+    Bare scopes ("agents") refer to the default repository; other repositories
+    are addressed as "repo:agents".
+
+    Args:
+        scope: Scope as sent by the client
+
+    Returns:
+        (repository name, scope), or None if the repository or scope is unknown
+    """
+    if scope == ALL_REPOS_SCOPE:
+        return _FLEET_KEY, scope
+    repo_name, sep, name = scope.rpartition(":")
+    if name not in VALID_SCOPES:
+        return None
+    if not sep:
+        default = _registry.default
+        return (default.name if default else "", name)
+    if _registry.get(repo_name) is None:
+        return None
+    return repo_name, name
+
+
+def _parse_resume(msg: dict[str, Any]) -> dict[tuple[str, str], int]:
+    """Read the scope versions a reconnecting client says it already holds.
+
+    Versions are only trusted if they come from this server run.
+
+    Args:
+        msg: Subscribe message with optional "resume" ({scope: version}) and
+            "epoch" fields
+
+    Returns:
+        Version per (repository name, scope)
+    """
+    resume = msg.get("resume")
+    if not isinstance(resume, dict) or msg.get("epoch") != _epoch:
+        return {}
+    versions: dict[tuple[str, str], int] = {}
+    for scope, version in resume.items():
+        parsed = _parse_scope(scope) if isinstance(scope, str) else None
+        if parsed is None or parsed[1] == "all" or not isinstance(version, int):
+            continue
+        versions[parsed] = version
+    return versions
+
+
+def _format_scope(repo_name: str, scope: str) -> str:
+    """Format a subscription the way clients address it (bare for the default repo)."""
+    default = _registry.default
+    if repo_name in ("", _FLEET_KEY) or (default is not None and repo_name == default.name):
+        return scope
+    return f"{repo_name}:{scope}"
+
+
+def _tasks_table(repo: Repo) -> CompactTable:
+    """Read the tasks of a repository's spec into a compact table."""
+    return CompactTable(
+        TaskRecord.from_json(task.model_dump(mode="json", by_alias=True))
+        for task in repo.spec_reader.iter_tasks_typed()
+    )
+
+
+def _events_table(rows: Iterable[dict[str, Any]]) -> CompactTable:
+    """Convert events table rows into a compact table."""
+    records = []
+    for e in rows:
+        record = EventRecord.from_json(_event_from_row(e).model_dump(mode="json", by_alias=True))
+        record.payload = _shared_values.share("events.data", e.get("data"), record.payload)
+        records.append(record)
+    return CompactTable(records)
+
+
+def _encode_event_batch(events: EventStream) -> list[str]:
+    """Fetch the next batch of streamed events as JSON texts (none once exhausted)."""
+    return [_event_from_row(e).model_dump_json(by_alias=True) for e in events.fetch()]
+
+
+def _agents_json(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Serialize agents table rows, sharing repeated values between rows."""
+    agents = []
+    for a in rows:
+        agent = intern_fields(
+            _agent_from_row(a).model_dump(mode="json", by_alias=True),
+            ("id", "displayName", "role", "status"),
+        )
+        agent["capabilities"] = _shared_values.share(
+            "agents.capabilities", a.get("capabilities"), agent["capabilities"]
+        )
+        agent["sessionMeta"] = _shared_values.share(
+            "agents.session_meta", a.get("session_meta"), agent["sessionMeta"]
+        )
+        agents.append(agent)
+    return agents
+
+
+def _leases_json(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Serialize leases table rows, interning task and agent IDs."""
+    return [
+        intern_fields(
+            _lease_from_row(lease).model_dump(mode="json", by_alias=True), ("taskId", "agentId")
+        )
+        for lease in rows
+    ]
+
+
+def _messages_json(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Serialize messages table rows, sharing repeated values between rows."""
+    messages = []
+    for m in rows:
+        message = intern_fields(
+            _message_from_row(m).model_dump(mode="json", by_alias=True),
+            ("from", "taskId", "severity"),
+        )
+        message["readBy"] = _shared_values.share(
+            "messages.read_by", m.get("read_by"), message["readBy"]
+        )
+        messages.append(message)
+    return messages
+
+
+def _gather_scope(repo: Repo, scope: str) -> Any:
+    """Read one data scope of a repository, serialized for the WebSocket.
+
+    Args:
+        repo: Repository to read
+        scope: One of the data scopes
+
+    Returns:
+        Compact table for tasks and events, list of JSON-ready dictionaries
+        for the other scopes
+    """
+    if scope == "agents":
+        return _agents_json(repo.runtime_reader.get_agents())
+    if scope == "tasks":
+        return _tasks_table(repo)
+    if scope == "leases":
+        return _leases_json(repo.runtime_reader.get_leases(include_expired=False))
+    if scope == "messages":
+        return _messages_json(repo.runtime_reader.get_messages(limit=50, unread_only=False))
+    if scope == "events":
+        return _events_table(repo.runtime_reader.get_events(limit=100, event_type=None))
+    raise ValueError(f"Unknown scope: {scope}")
+
+
+def _gather_repo(repo: Repo, scopes: Iterable[str] = DATA_SCOPES) -> dict[str, Any]:
+    """Gather data scopes of a repository for broadcast synchronously.
+
+    The runtime scopes all come from one read transaction, so a broadcast
+    never shows e.g. a lease of an agent missing from the agents scope.
+    This runs in a thread to avoid blocking the event loop.
+
+    Raises:
+        sqlite3.Error: If the runtime database cannot be read
+    """
+    scopes = list(scopes)
+    runtime: dict[str, list[Any]] = {}
+    if any(scope in RUNTIME_TABLES for scope in scopes):
+        # Timed as one: the runtime scopes share their read
+        with GATHER_SECONDS.time(scope="runtime"), tracing.span("gather.scope", scope="runtime"):
+            runtime, _ = _gather_runtime_snapshot(repo)
+    data: dict[str, Any] = {}
+    for scope in scopes:
+        if scope in runtime:
+            data[scope] = runtime[scope]
+        else:
+            with GATHER_SECONDS.time(scope=scope), tracing.span("gather.scope", scope=scope):
+                data[scope] = _gather_scope(repo, scope)
+    return data
+
+
+def _gather_runtime_snapshot(repo: Repo) -> tuple[dict[str, Any], bool]:
+    """Read the runtime scopes of a repository in one read transaction.
+
+    Args:
+        repo: Repository to read
+
+    Returns:
+        Tuple of (scope name to list of JSON-ready dictionaries for agents,
+        leases and messages, and a compact table for events; whether the
+        database exists). The scopes are empty if it does not exist yet.
+
+    Raises:
+        sqlite3.Error: If the database cannot be read
+    """
+    try:
+        rows, found = repo.runtime_reader.snapshot(messages_limit=50, events_limit=100), True
+    except FileNotFoundError:
+        rows, found = {table: [] for table in RUNTIME_TABLES}, False
+    scopes = {
+        "agents": _agents_json(rows["agents"]),
+        "leases": _leases_json(rows["leases"]),
+        "messages": _messages_json(rows["messages"]),
+        "events": _events_table(rows["events"]),
+    }
+    return scopes, found
+
+
+def _data_version(scopes: dict[str, Any]) -> str:
+    """Digest the encoded runtime scopes of a snapshot into a short stamp.
+
+    Args:
+        scopes: JSON-ready data of at least the runtime scopes
+
+    Returns:
+        Hex digest, equal for two snapshots exactly when their runtime
+        scopes hold the same data
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for scope in RUNTIME_TABLES:
+        digest.update(json.dumps(scopes[scope], separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+def _encode_update(repo_name: str, scope: str, data: Any, version: int | None = None) -> str:
+    """Encode an update message for one scope of a repository (or the fleet view)."""
+    msg = WSUpdateMessage(
+        type="update",
+        scope=scope,
+        repo=None if repo_name in ("", _FLEET_KEY) else repo_name,
+        data=as_json(data),
+        version=version,
+        timestamp=datetime.utcnow(),
+    )
+    return msg.model_dump_json()
+
+
+def _scope_keys(scopes: Iterable[str]) -> list[tuple[str, str]]:
+    """Resolve client scopes to (repository name, scope) pairs, expanding "all".
+
+    Args:
+        scopes: Scopes as sent by the client (unknown ones are skipped)
+
+    Returns:
+        Unique pairs in request order
+    """
+    keys: list[tuple[str, str]] = []
+    for scope in scopes:
+        parsed = _parse_scope(scope)
+        if parsed is None:
+            continue
+        repo_name, name = parsed
+        for data_scope in DATA_SCOPES if name == "all" else (name,):
+            if (repo_name, data_scope) not in keys:
+                keys.append((repo_name, data_scope))
+    return keys
+
+
+async def _initial_updates(keys: Iterable[tuple[str, str]]) -> AsyncIterator[tuple[str, str]]:
+    """Encode the current data of scopes a client just subscribed to.
+
+    In worker mode the leader's shared snapshots are used; one this worker
+    has not forwarded yet is broadcast to every subscriber of the scope
+    instead of yielded, so no client gets it twice. Otherwise a repository's
+    cached broadcast snapshot is reused while it is fresh, so clients joining
+    a busy repository do not trigger extra reads.
+
+    Args:
+        keys: (repository name, scope) pairs
+
+    Yields:
+        Tuples of (scope, encoded update message)
+    """
+    for repo_name, scope in keys:
+        shared = None
+        if _snapshot_reader is not None:
+            shared = await _get_reader_pool().run(_shared_snapshot, repo_name, scope)
+        if shared is not None:
+            version, msg_json = shared
+            key = f"{repo_name}:{scope}"
+            if version > _fanout_versions.get(key, 0):
+                # Not forwarded here yet: send it to every subscriber (the new
+                # client included) and drop the leader's frame when it arrives
+                _fanout_versions[key] = version
+                await connection_manager.broadcast_encoded(scope, msg_json, repo_name=repo_name)
+            else:
+                yield scope, msg_json
+            continue
+        if scope == ALL_REPOS_SCOPE:
+            # Version first: the data read afterwards is at least this new
+            version = connection_manager.current_version(_FLEET_KEY, scope)
+            view = _fleet_view(await _gather_fleet())
+            view_data = view.model_dump(mode="json", by_alias=True)
+            yield scope, _encode_update(_FLEET_KEY, scope, view_data, version)
+            continue
+
+        repo = _registry.get(repo_name)
+        if repo is None:
+            continue
+        repo.touch()
+        version = connection_manager.current_version(repo.name, scope)
+        snapshot = repo.fresh_snapshot(SNAPSHOT_MAX_AGE_SECONDS)
+        if snapshot is not None and scope in snapshot:
+            data = snapshot[scope]
+        else:
+            data = await _get_reader_pool().run(_gather_scope, repo, scope)
+        yield scope, _encode_update(repo.name, scope, data, version)
+
+
+def _collect_reader_metrics() -> None:
+    """Refresh the reader pool gauges before metrics are rendered."""
+    stats = _reader_pool.stats() if _reader_pool is not None else {"queued": 0, "running": 0}
+    READER_QUEUED.set(stats["queued"])
+    READER_RUNNING.set(stats["running"])
+
+
+REGISTRY.on_collect(_collect_reader_metrics)
+
+
+def _get_reader_pool() -> ReaderPool:
+    """Get the thread pool running blocking reads for requests."""
+    global _reader_pool
+    if _reader_pool is None:
+        _reader_pool = ReaderPool()
+    return _reader_pool
+
+
+async def _gather_fleet(
+    max_age: float | None = SNAPSHOT_MAX_AGE_SECONDS,
+) -> list[tuple[Repo, dict[str, Any] | None, FleetRepoState]]:
+    """Collect the fleet scopes of every repository.
+
+    Cached snapshots are reused when recent enough; other repositories are
+    read on the reader pool, each with its own deadline counted from when
+    its read starts, so one locked or slow database cannot stall the whole
+    view and repositories queued behind it are not timed out. A repository whose read
+    fails falls back to its last snapshot (marked stale) or is left out.
+
+    Args:
+        max_age: Reuse cached snapshots up to this many seconds old (None
+            reuses any cached snapshot)
+
+    Returns:
+        (repository, scope data or None, state) for each repository
+    """
+    pool = _get_reader_pool()
+
+    async def collect(repo: Repo) -> tuple[Repo, dict[str, Any] | None, FleetRepoState]:
+        cached = repo.snapshot
+        if cached is None or not all(scope in cached for scope in FLEET_SCOPES):
+            cached = None
+        elif max_age is None or repo.fresh_snapshot(max_age) is not None:
+            return repo, cached, FleetRepoState(repo=repo.name, status="fresh", error=None)
+
+        try:
+            data = await pool.run(
+                _gather_repo,
+                repo,
+                FLEET_SCOPES,
+                deadline=FLEET_REPO_TIMEOUT_SECONDS,
+                timed_from_start=True,
+            )
+        except TimeoutError:
+            error = f"Timed out after {FLEET_REPO_TIMEOUT_SECONDS:g}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        else:
+            repo.store_snapshot(data)
+            return repo, data, FleetRepoState(repo=repo.name, status="fresh", error=None)
+
+        if cached is not None:
+            return repo, cached, FleetRepoState(repo=repo.name, status="stale", error=error)
+        return repo, None, FleetRepoState(repo=repo.name, status="unavailable", error=error)
+
+    return await asyncio.gather(*(collect(repo) for repo in _registry))
+
+
+def _fleet_view(
+    collected: list[tuple[Repo, dict[str, Any] | None, FleetRepoState]],
+    scopes: Iterable[str] = FLEET_SCOPES,
+    agent_status: str = "online",
+    task_status: str = "blocked",
+) -> FleetView:
+    """Merge per-repository data into a fleet-wide view.
+
+    Args:
+        collected: Result of :func:`_gather_fleet`
+        scopes: Fleet scopes to include
+        agent_status: Only include agents with this status ("all" for every agent)
+        task_status: Only include tasks with this status ("all" for every task)
+
+    Returns:
+        Fleet view with items tagged by repository
+    """
+    view = FleetView(repos=[state for _, _, state in collected])
+    for repo, data, _ in collected:
+        if data is None:
+            continue
+        if "agents" in scopes:
+            view.agents.extend(
+                RepoAgent.model_validate({**agent, "repo": repo.name})
+                for agent in data["agents"]
+                if agent_status in ("all", agent["status"])
+            )
+        if "leases" in scopes:
+            view.leases.extend(
+                RepoLease.model_validate({**lease, "repo": repo.name}) for lease in data["leases"]
+            )
+        if "tasks" in scopes:
+            view.tasks.extend(
+                RepoTask.model_validate({**task.to_json(), "repo": repo.name})
+                for task in data["tasks"]
+                if task_status in ("all", task.status)
+            )
+    return view
 
 
 class ConnectionManager:
@@ -52,8 +738,30 @@ class ConnectionManager:
     def __init__(self) -> None:
         """Initialize the connection manager."""
         self._connections: dict[str, WebSocket] = {}
-        self._subscriptions: dict[str, set[str]] = {}
+        self._subscriptions: dict[str, set[tuple[str, str]]] = {}
+        self._replaying: set[str] = set()
         self._lock = asyncio.Lock()
+        #: Server-Sent Events subscribers, fed by the same broadcasts
+        self.streams = StreamHub()
+        #: Newest version of every (repo, scope) and its encoded update, kept so
+        #: reconnecting clients are only sent what they missed
+        self._versions: dict[tuple[str, str], int] = {}
+        self._updates: dict[tuple[str, str], str] = {}
+        #: Data of the newest update of every (repo, scope), so unchanged data
+        #: is not published again
+        self._published: dict[tuple[str, str], Any] = {}
+        #: Newest version handed out to a gather (published or not yet)
+        self._reserved: dict[tuple[str, str], int] = {}
+        #: Repositories with a broadcast_all run in flight, and those that
+        #: changed again meanwhile and need one more run
+        self._gathering: set[str] = set()
+        self._regather: set[str] = set()
+        #: Earliest unhandled file change notification per repository
+        self._triggered: dict[str, float] = {}
+        #: REST requests parked until a scope's version advances, and when each
+        #: repository was last long-polled
+        self._waiters: dict[tuple[str, str], set[asyncio.Future[None]]] = {}
+        self._long_polled: dict[str, float] = {}
 
     async def connect(self, websocket: WebSocket) -> str:
         """Accept a new WebSocket connection.
@@ -73,7 +781,11 @@ class ConnectionManager:
 
         # Send connection acknowledgment
         msg = WSConnectedMessage(
-            type="connected", client_id=client_id, subscriptions=[], timestamp=datetime.utcnow()
+            type="connected",
+            client_id=client_id,
+            subscriptions=[],
+            epoch=_epoch,
+            timestamp=datetime.utcnow(),
         )
         await websocket.send_text(msg.model_dump_json())
 
@@ -88,13 +800,15 @@ class ConnectionManager:
         async with self._lock:
             self._connections.pop(client_id, None)
             self._subscriptions.pop(client_id, None)
+            self._replaying.discard(client_id)
 
     async def subscribe(self, client_id: str, scopes: list[str]) -> list[str]:
         """Subscribe a client to scopes.
 
         Args:
             client_id: Client ID
-            scopes: List of scopes to subscribe to
+            scopes: List of scopes to subscribe to ("scope" for the default
+                repository, "repo:scope" for any other)
 
         Returns:
             List of current subscriptions after update
@@ -104,20 +818,17 @@ class ConnectionManager:
                 return []
 
             for scope in scopes:
-                if scope in VALID_SCOPES:
-                    if scope == "all":
-                        # Subscribe to all data scopes
-                        self._subscriptions[client_id] = {
-                            "agents",
-                            "tasks",
-                            "leases",
-                            "messages",
-                            "events",
-                        }
-                    else:
-                        self._subscriptions[client_id].add(scope)
+                parsed = _parse_scope(scope)
+                if parsed is None:
+                    continue
+                repo_name, name = parsed
+                if name == "all":
+                    # Subscribe to all data scopes of the repository
+                    self._subscriptions[client_id].update((repo_name, s) for s in DATA_SCOPES)
+                else:
+                    self._subscriptions[client_id].add(parsed)
 
-            return list(self._subscriptions[client_id])
+            return self._format_subscriptions(client_id)
 
     async def unsubscribe(self, client_id: str, scopes: list[str]) -> list[str]:
         """Unsubscribe a client from scopes.
@@ -134,12 +845,18 @@ class ConnectionManager:
                 return []
 
             for scope in scopes:
-                if scope == "all":
-                    self._subscriptions[client_id].clear()
+                parsed = _parse_scope(scope)
+                if parsed is None:
+                    continue
+                repo_name, name = parsed
+                if name == "all":
+                    self._subscriptions[client_id] = {
+                        sub for sub in self._subscriptions[client_id] if sub[0] != repo_name
+                    }
                 else:
-                    self._subscriptions[client_id].discard(scope)
+                    self._subscriptions[client_id].discard(parsed)
 
-            return list(self._subscriptions[client_id])
+            return self._format_subscriptions(client_id)
 
     async def get_subscriptions(self, client_id: str) -> list[str]:
         """Get current subscriptions for a client.
@@ -151,27 +868,130 @@ class ConnectionManager:
             List of subscribed scopes
         """
         async with self._lock:
-            return list(self._subscriptions.get(client_id, set()))
+            return self._format_subscriptions(client_id)
+
+    def _format_subscriptions(self, client_id: str) -> list[str]:
+        """Format a client's subscriptions as scope strings (lock held)."""
+        return [
+            _format_scope(repo_name, scope)
+            for repo_name, scope in self._subscriptions.get(client_id, set())
+        ]
+
+    def subscribed_repos(self) -> set[str]:
+        """Get the names of repositories with at least one subscriber or long poll.
+
+        Every repository counts as subscribed while a client follows the
+        fleet-wide view.
+        """
+        names = {
+            repo_name
+            for subscriptions in list(self._subscriptions.values())
+            for repo_name, _ in subscriptions
+        }
+        names.update(repo_name for repo_name, _ in self.streams.keys())
+        # Long polls too: their scopes must only move on when their data changes
+        names.update(repo_name for repo_name, _ in list(self._waiters))
+        cutoff = time.monotonic() - LONG_POLL_GRACE_SECONDS
+        for repo_name, ended in list(self._long_polled.items()):
+            if ended < cutoff:
+                del self._long_polled[repo_name]
+            else:
+                names.add(repo_name)
+        if _FLEET_KEY in names:
+            return set(_registry.names())
+        return names
+
+    def is_subscribed(self, scope: str, repo_name: str) -> bool:
+        """Check whether any client is subscribed to a repository's scope.
+
+        Args:
+            scope: Data scope
+            repo_name: Repository name (``*`` for the fleet view)
+        """
+        key = (repo_name, scope)
+        return self.streams.has_subscribers(repo_name, scope) or any(
+            key in subscriptions for subscriptions in list(self._subscriptions.values())
+        )
+
+    def has_fleet_subscribers(self) -> bool:
+        """Check whether any client follows the fleet-wide view."""
+        return self.is_subscribed(ALL_REPOS_SCOPE, _FLEET_KEY)
 
-    async def broadcast(self, scope: str, data: Any) -> int:
+    async def set_replaying(self, client_id: str, replaying: bool) -> None:
+        """Pause or resume live updates for a client replaying history.
+
+        Args:
+            client_id: Client ID
+            replaying: True while the client is receiving a replay
+        """
+        async with self._lock:
+            if replaying:
+                self._replaying.add(client_id)
+            else:
+                self._replaying.discard(client_id)
+
+    async def broadcast(
+        self, scope: str, data: Any, repo_name: str | None = None, version: int | None = None
+    ) -> int:
         """Broadcast data to all clients subscribed to a scope.
 
         Args:
             scope: Data scope
             data: Data to broadcast
+            repo_name: Repository the data belongs to (defaults to the default one)
+            version: Version reserved when the data was gathered (see
+                ``reserve_version``); data older than what was already
+                broadcast is dropped. Reserved now if None.
 
         Returns:
-            Number of clients that received the message
+            Number of clients that received the message (0 if the data equals
+            the last broadcast's: the scope keeps its version, and clients and
+            long polls waiting on it are not woken)
         """
-        msg = WSUpdateMessage(type="update", scope=scope, data=data, timestamp=datetime.utcnow())
-        msg_json = msg.model_dump_json()
+        if repo_name is None:
+            default = _registry.default
+            repo_name = default.name if default else ""
+        key = (repo_name, scope)
+        with tracing.span("broadcast", repo=repo_name, scope=scope) as span:
+            if version is not None and version <= self._versions.get(key, 0):
+                span.set(version=version, dropped=True)
+                return 0
+            if key in self._published and self._published[key] == data:
+                span.set(unchanged=True)
+                return 0
+            if version is None:
+                version = self.reserve_version(repo_name, scope)
+            span.set(version=version)
+            self._versions[key] = version
+            self._published[key] = data
+            with tracing.span("broadcast.serialize") as serialize_span:
+                msg_json = _encode_update(repo_name, scope, data, version)
+                serialize_span.set(bytes=len(msg_json))
+            self._updates[key] = msg_json
+            self.notify_change(repo_name, scope)
+            return await self.broadcast_encoded(scope, msg_json, repo_name=repo_name)
+
+    async def broadcast_encoded(self, scope: str, msg_json: str, repo_name: str) -> int:
+        """Send an already encoded message to all clients subscribed to a scope.
 
-        sent_count = 0
+        Args:
+            scope: Data scope
+            msg_json: Encoded message, sent as is
+            repo_name: Repository the message belongs to
+
+        Returns:
+            Number of clients that received the message (event stream
+            subscribers count once the message is queued for them)
+        """
+        key = (repo_name, scope)
+        span = tracing.span("broadcast.deliver", repo=repo_name, scope=scope)
+        started = time.perf_counter()
+        sent_count = self.streams.publish(repo_name, scope, msg_json)
         disconnected = []
 
         async with self._lock:
             for client_id, subscriptions in self._subscriptions.items():
-                if scope in subscriptions:
+                if key in subscriptions and client_id not in self._replaying:
                     websocket = self._connections.get(client_id)
                     if websocket:
                         try:
@@ -180,228 +1000,1144 @@ class ConnectionManager:
                         except Exception:
                             disconnected.append(client_id)
 
+        BROADCAST_SEND_SECONDS.observe(time.perf_counter() - started, scope=scope)
+        BROADCAST_BYTES.observe(len(msg_json), scope=scope)
+        BROADCAST_CLIENTS.inc(sent_count, scope=scope)
+        span.set(clients=sent_count)
+        span.end()
+
         # Clean up disconnected clients
         for client_id in disconnected:
             await self.disconnect(client_id)
 
-        return sent_count
+        return sent_count
+
+    async def broadcast_all(
+        self, repo_name: str | None = None, triggered_at: float | None = None
+    ) -> None:
+        """Broadcast all current data of a repository to subscribed clients.
+
+        At most one run per repository is in flight. Calls arriving meanwhile
+        are folded into a single follow-up run, started once the current one
+        is done, so bursts of changes cost at most two gathers and every
+        change is still seen.
+
+        Args:
+            repo_name: Repository that changed (defaults to the default one)
+            triggered_at: ``time.monotonic()`` of the file change notification,
+                to record the delay until its broadcast
+        """
+        repo = _registry.get(repo_name) if repo_name else _registry.default
+        if repo is None or _shutting_down:
+            return
+        if triggered_at is not None:
+            self._triggered.setdefault(repo.name, triggered_at)
+        if repo.name in self._gathering:
+            self._regather.add(repo.name)
+            tracing.span("broadcast_all", repo=repo.name, coalesced=True).end()
+            return
+
+        self._gathering.add(repo.name)
+        try:
+            while True:
+                self._regather.discard(repo.name)
+                triggered = self._triggered.pop(repo.name, None)
+                with tracing.span("broadcast_all", repo=repo.name):
+                    await self._broadcast_repo(repo)
+                if triggered is not None:
+                    TRIGGER_TO_BROADCAST_SECONDS.observe(time.monotonic() - triggered)
+                if repo.name not in self._regather or _shutting_down:
+                    break
+        finally:
+            self._gathering.discard(repo.name)
+            self._regather.discard(repo.name)
+
+    async def _broadcast_repo(self, repo: Repo) -> None:
+        """Gather and broadcast every scope of a repository once."""
+        # Fold the change into the rollup and history sidecars
+        try:
+            await _get_reader_pool().run(_update_sidecars, repo, single_flight=False)
+        except ReadDeadlineError:
+            pass  # Still catching up in its thread; the next broadcast continues from there
+
+        # Nobody is watching this repository: drop its now stale cache instead
+        if repo.name not in self.subscribed_repos():
+            repo.snapshot = None
+            self.skip_changes(repo.name)
+            return
+
+        # Run blocking data gathering on the reader pool
+        versions = {scope: self.reserve_version(repo.name, scope) for scope in DATA_SCOPES}
+        try:
+            with tracing.span("gather", repo=repo.name):
+                scopes_data = await _get_reader_pool().run(_gather_repo, repo)
+        except Exception:
+            # If data gathering fails (e.g. DB locked or shutdown), just return
+            repo.snapshot = None
+            return
+        repo.store_snapshot(scopes_data)
+
+        # Broadcast each scope
+        for scope, data in scopes_data.items():
+            await self.broadcast(scope, data, repo_name=repo.name, version=versions[scope])
+
+        if self.has_fleet_subscribers():
+            await self.broadcast_fleet()
+
+    async def broadcast_fleet(self) -> None:
+        """Broadcast the fleet-wide view to clients subscribed to all-repos.
+
+        Other repositories contribute their cached snapshots, which are kept
+        current by their own broadcasts while the fleet view has subscribers.
+        """
+        # Broadcasts of several repositories can gather the fleet view at once
+        version = self.reserve_version(_FLEET_KEY, ALL_REPOS_SCOPE)
+        view = _fleet_view(await _gather_fleet(max_age=None))
+        await self.broadcast(
+            ALL_REPOS_SCOPE,
+            view.model_dump(mode="json", by_alias=True),
+            repo_name=_FLEET_KEY,
+            version=version,
+        )
+
+    def reserve_version(self, repo_name: str, scope: str) -> int:
+        """Hand out the version for data about to be gathered.
+
+        Versions follow the order gathers start in, so when gathers overlap,
+        data that was read earlier can never be published as newer.
+
+        Args:
+            repo_name: Repository name (``*`` for the fleet view)
+            scope: Data scope
+
+        Returns:
+            New version, above any reserved or published one
+        """
+        key = (repo_name, scope)
+        version = max(self._reserved.get(key, 0), self._versions.get(key, 0)) + 1
+        self._reserved[key] = version
+        return version
+
+    def current_version(self, repo_name: str, scope: str) -> int:
+        """Get the newest version of a scope (the leader's, in worker mode).
+
+        Args:
+            repo_name: Repository name (``*`` for the fleet view)
+            scope: Data scope
+
+        Returns:
+            Version number (0 before the first update)
+        """
+        if _snapshot_reader is not None:
+            return _snapshot_reader.version(f"{repo_name}:{scope}")
+        return self._versions.get((repo_name, scope), 0)
+
+    def missed_update(self, repo_name: str, scope: str, version: int) -> tuple[bool, str | None]:
+        """Check what a client holding one version of a scope has missed.
+
+        Every update carries the full state of its scope, so the newest update
+        stands in for all the ones missed.
+
+        Args:
+            repo_name: Repository name (``*`` for the fleet view)
+            scope: Data scope
+            version: Version the client holds
+
+        Returns:
+            Tuple of (whether the client is behind, newest encoded update or
+            None if it is not cached and a fresh snapshot must be sent)
+        """
+        if version == self.current_version(repo_name, scope):
+            return False, None
+        if _snapshot_reader is not None:
+            # Sent by _initial_updates, which tracks what this worker forwarded
+            return True, None
+        return True, self._updates.get((repo_name, scope))
+
+    def skip_changes(self, repo_name: str) -> None:
+        """Record that a repository changed without its updates being published.
+
+        Its scope versions (and the fleet view's) move on and cached updates
+        are dropped, so resuming clients get fresh snapshots instead of
+        missing the change.
+
+        Args:
+            repo_name: Repository name
+        """
+        keys = [(repo_name, scope) for scope in DATA_SCOPES] + [(_FLEET_KEY, ALL_REPOS_SCOPE)]
+        for key in keys:
+            self._versions[key] = self.reserve_version(*key)
+            self._updates.pop(key, None)
+            self._published.pop(key, None)
+            self.notify_change(*key)
+        self.streams.forget(repo_name)
+        self.streams.forget(_FLEET_KEY)
+
+    def notify_change(self, repo_name: str, scope: str) -> None:
+        """Wake the requests waiting for a scope's version to advance.
+
+        Args:
+            repo_name: Repository name (``*`` for the fleet view)
+            scope: Data scope
+        """
+        for waiter in self._waiters.pop((repo_name, scope), ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_for_change(self, repo_name: str, scope: str, since: int, timeout: float) -> int:
+        """Wait until a scope's version differs from the one a client holds.
+
+        Args:
+            repo_name: Repository name (``*`` for the fleet view)
+            scope: Data scope
+            since: Version the client holds
+            timeout: Longest time to wait, in seconds
+
+        Returns:
+            Current version (still ``since`` if the wait timed out)
+        """
+        self._long_polled[repo_name] = time.monotonic()
+        version = self.current_version(repo_name, scope)
+        if version != since:
+            return version
+
+        key = (repo_name, scope)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[key]
+            self._long_polled[repo_name] = time.monotonic()
+        return self.current_version(repo_name, scope)
+
+    @property
+    def connection_count(self) -> int:
+        """Get number of active connections."""
+        return len(self._connections)
+
+    def debug_stats(self) -> dict[str, Any]:
+        """Get connection, broadcast and cache state, for diagnostics.
+
+        Returns:
+            Dictionary of counts and, per ``repo:scope``, the size of the
+            cached update message in bytes
+        """
+        cached = {_format_scope(*key): len(msg) for key, msg in list(self._updates.items())}
+        return {
+            "connections": len(self._connections),
+            "replaying": len(self._replaying),
+            "streams": self.streams.subscriber_count,
+            "long_poll_waiters": sum(len(w) for w in list(self._waiters.values())),
+            "gathering": sorted(self._gathering),
+            "regather": sorted(self._regather),
+            "cached_updates": len(cached),
+            "cached_update_bytes": sum(cached.values()),
+            "update_sizes": cached,
+        }
+
+
+class _ClientError(Exception):
+    """Invalid WebSocket request, reported back to the client as an error message."""
+
+
+# Global connection manager instance
+connection_manager = ConnectionManager()
+
+
+def set_lodestar_dir(
+    lodestar_dir: Path,
+    record_history: bool = False,
+    history_retention_days: float | None = None,
+    name: str | None = None,
+) -> Repo:
+    """Set the Lodestar directory to monitor, replacing any configured ones.
+
+    Args:
+        lodestar_dir: Path to .lodestar directory
+        record_history: Record agent, lease and task status changes to the
+            history sidecar so past states can be queried
+        history_retention_days: Compact recorded history older than this
+            many days (None keeps everything)
+        name: Repository name (derived from the directory if omitted)
+
+    Returns:
+        The repository, which becomes the default one
+    """
+    for repo in _registry:
+        if _watcher is not None:
+            _watcher.unwatch(repo.lodestar_dir)
+        # Updates cached for the old repository must not stand in for the new one
+        connection_manager.skip_changes(repo.name)
+    _registry.clear()
+    return add_lodestar_dir(
+        lodestar_dir,
+        name=name,
+        record_history=record_history,
+        history_retention_days=history_retention_days,
+    )
+
+
+def add_lodestar_dir(
+    lodestar_dir: Path,
+    name: str | None = None,
+    record_history: bool = False,
+    history_retention_days: float | None = None,
+) -> Repo:
+    """Add a Lodestar directory to the set of monitored repositories.
+
+    The first directory added is the default repository served by the plain
+    ``/api`` routes; every repository is also served under
+    ``/api/repos/{name}``.
+
+    Args:
+        lodestar_dir: Path to .lodestar directory
+        name: Repository name (derived from the directory if omitted)
+        record_history: Record agent, lease and task status changes to the
+            history sidecar so past states can be queried
+        history_retention_days: Compact recorded history older than this
+            many days (None keeps everything)
+
+    Returns:
+        The registered repository
+
+    Raises:
+        ValueError: If the name is invalid or already registered
+    """
+    repo = _registry.add(
+        lodestar_dir,
+        name=name,
+        record_history=record_history,
+        history_retention_days=history_retention_days,
+    )
+    if _watcher is not None:
+        _watcher.watch(repo.lodestar_dir, partial(trigger_broadcast, repo.name))
+    return repo
+
+
+def _capture_history_state(repo: Repo) -> dict[str, dict[str, Any]]:
+    """Capture the scopes tracked by the history recorder.
+
+    Scopes whose source cannot be read are left out, so a transient error is
+    not recorded as every entity disappearing.
+    """
+    state: dict[str, dict[str, Any]] = {}
+    try:
+        state["agents"] = {
+            row["agent_id"]: {k: v for k, v in row.items() if k != "agent_id"}
+            for row in repo.runtime_reader.read_table("agents")
+        }
+        state["leases"] = {
+            row["lease_id"]: {k: v for k, v in row.items() if k != "lease_id"}
+            for row in repo.runtime_reader.read_table("leases")
+        }
+    except (FileNotFoundError, sqlite3.Error):
+        pass
+
+    try:
+        tasks = repo.spec_reader.read().get("tasks", {})
+        if isinstance(tasks, dict):
+            state["tasks"] = {
+                task_id: (task or {}).get("status", "ready") for task_id, task in tasks.items()
+            }
+    except (OSError, yaml.YAMLError):
+        pass
+
+    return state
+
+
+def _update_sidecars(repo: Repo) -> None:
+    """Bring a repository's rollup and history sidecars up to date.
+
+    This runs on the reader pool to avoid blocking the event loop.
+    """
+    try:
+        repo.rollup_store.update(repo.runtime_reader)
+    except (OSError, sqlite3.Error):
+        pass
+
+    history_store = repo.history_store
+    if history_store is not None:
+        try:
+            history_store.record(_capture_history_state(repo))
+            history_store.record_events(repo.runtime_reader)
+        except (OSError, sqlite3.Error):
+            pass
+
+
+def _history_agents(state: State, at: datetime) -> list[Agent]:
+    """Build agents from a recorded state, with status as of ``at``."""
+    now = _as_utc(at).replace(tzinfo=None)
+    return [
+        _agent_from_row({"agent_id": agent_id, **row}, now=now)
+        for agent_id, row in state["agents"].items()
+    ]
+
+
+def _history_leases(state: State, at: datetime, include_expired: bool = False) -> list[Lease]:
+    """Build leases from a recorded state, ordered by expiry."""
+    at_utc = _as_utc(at)
+    leases = [
+        _lease_from_row({"lease_id": lease_id, **row}) for lease_id, row in state["leases"].items()
+    ]
+    leases.sort(key=lambda lease: _as_utc(lease.expires_at))
+    if not include_expired:
+        leases = [lease for lease in leases if _as_utc(lease.expires_at) > at_utc]
+    return leases
+
+
+def _resolve_repo(request: Request) -> Repo:
+    """Resolve the repository addressed by an API request.
+
+    Routes under ``/api/repos/{repo_name}`` name the repository; the plain
+    ``/api`` routes use the default one.
+
+    Raises:
+        HTTPException: 404 for an unknown repository, 503 if none is configured
+    """
+    name = request.path_params.get("repo_name")
+    if name is None:
+        repo = _registry.default
+        if repo is None:
+            raise HTTPException(status_code=503, detail="Lodestar directory not configured")
+    else:
+        repo = _registry.get(name)
+        if repo is None:
+            raise HTTPException(status_code=404, detail=f"Repository {name} not found")
+    repo.touch()
+    return repo
+
+
+def _watch_scope(scope: str) -> Callable[..., Awaitable[Repo]]:
+    """Create a dependency resolving the repository of a scope's REST route.
+
+    With ``?wait_for_change_since=<version>`` the request is parked until the
+    scope's version differs from the given one (or ``timeout`` expires), so
+    pollers are answered as soon as something changes instead of polling in a
+    loop. The version the response reflects is sent in the X-Lsspy-Version
+    header, to be passed back on the next request.
+
+    Args:
+        scope: Data scope served by the route
+
+    Returns:
+        FastAPI dependency
+    """
+
+    async def dependency(
+        response: Response,
+        wait_for_change_since: int | None = Query(
+            None, ge=0, description="Wait until the scope version differs from this one"
+        ),
+        timeout: float = Query(
+            30.0, gt=0, le=LONG_POLL_MAX_SECONDS, description="Longest wait, in seconds"
+        ),
+        repo: Repo = Depends(_resolve_repo),
+    ) -> Repo:
+        if wait_for_change_since is None:
+            version = connection_manager.current_version(repo.name, scope)
+        else:
+            version = await connection_manager.wait_for_change(
+                repo.name, scope, wait_for_change_since, timeout
+            )
+            repo.touch()
+        response.headers[VERSION_HEADER] = str(version)
+        return repo
+
+    return dependency
+
+
+async def _evict_idle_repos() -> None:
+    """Periodically release readers and caches of repositories nobody uses."""
+    while True:
+        await asyncio.sleep(REPO_EVICT_INTERVAL_SECONDS)
+        _registry.evict_idle(REPO_IDLE_SECONDS, keep=connection_manager.subscribed_repos())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    """Lifespan context manager for startup/shutdown events."""
+    global _watcher, _reader_pool, _fanout_address, _snapshot_reader
+    global _event_loop, _shutting_down, _loop_monitor
+
+    # Store event loop for cross-thread broadcasting
+    _event_loop = asyncio.get_event_loop()
+    _shutting_down = False
+
+    if FANOUT_ADDRESS_ENV in os.environ:
+        # Worker process: the leader watches and gathers, this process only fans out
+        _configure_worker()
+        assert _fanout_address is not None
+        receiver = asyncio.create_task(subscribe(_fanout_address, _on_fanout_frame))
+        _background_tasks.add(receiver)
+        receiver.add_done_callback(_background_tasks.discard)
+    else:
+        # One observer and debounce pool watches every configured repository
+        _watcher = WatcherPool(debounce_ms=100, use_polling=False)
+        for repo in _registry:
+            _watcher.watch(repo.lodestar_dir, partial(trigger_broadcast, repo.name))
+        _watcher.start()
+
+        # Record the starting state so history covers the whole session
+        for repo in _registry:
+            if repo.record_history:
+                try:
+                    await _get_reader_pool().run(_update_sidecars, repo, single_flight=False)
+                except ReadDeadlineError:
+                    pass
+
+    evictor = asyncio.create_task(_evict_idle_repos())
+    _background_tasks.add(evictor)
+    evictor.add_done_callback(_background_tasks.discard)
+
+    if _loop_monitor_threshold is not None:
+        _loop_monitor = LoopMonitor(threshold=_loop_monitor_threshold)
+        _loop_monitor.start()
+
+    if _fanout_address is None:
+        # Workers receive finished updates, so only the gathering process traces
+        _start_tracing()
+
+    yield
+
+    # Signal shutdown to prevent new operations
+    _shutting_down = True
+    connection_manager.streams.close()
+
+    if _loop_monitor is not None:
+        await _loop_monitor.stop()
+        _loop_monitor = None
+
+    _stop_tracing()
+
+    # Shutdown: stop watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+
+    if _reader_pool is not None:
+        _reader_pool.shutdown()
+        _reader_pool = None
+
+    _fanout_address = None
+    _fanout_versions.clear()
+    if _snapshot_reader is not None:
+        _snapshot_reader.close()
+        _snapshot_reader = None
+
+    # Cancel and wait for background tasks
+    if _background_tasks:
+        for task in _background_tasks:
+            task.cancel()
+
+        # Wait for tasks to complete/cancel
+        try:
+            await asyncio.gather(*_background_tasks, return_exceptions=True)
+        except Exception:
+            pass
+
+
+def worker_environment(address: str) -> dict[str, str]:
+    """Environment handing the leader's configuration to worker processes.
+
+    Args:
+        address: Fan-out channel address of the leader
+
+    Returns:
+        Environment variables to set before starting the workers
+
+    Raises:
+        RuntimeError: If the fan-out leader is not running
+    """
+    if _leader_store is None:
+        raise RuntimeError("Fan-out leader is not running")
+    repos = [
+        {
+            "name": repo.name,
+            "path": str(repo.lodestar_dir.absolute()),
+            "record_history": repo.record_history,
+            "history_retention_days": repo.history_retention_days,
+        }
+        for repo in _registry
+    ]
+    return {
+        FANOUT_ADDRESS_ENV: address,
+        SNAPSHOT_DIR_ENV: str(_leader_store.directory),
+        EPOCH_ENV: _epoch,
+        REPOS_ENV: json.dumps(repos),
+        DEBUG_ENDPOINTS_ENV: "1" if _debug_endpoints else "0",
+        LOOP_MONITOR_ENV: "" if _loop_monitor_threshold is None else str(_loop_monitor_threshold),
+    }
+
+
+def _configure_worker() -> None:
+    """Configure this process as a fan-out worker from its environment."""
+    global _fanout_address, _snapshot_reader, _epoch, _debug_endpoints, _loop_monitor_threshold
+    _fanout_address = os.environ[FANOUT_ADDRESS_ENV]
+    _debug_endpoints = os.environ.get(DEBUG_ENDPOINTS_ENV) == "1"
+    threshold = os.environ.get(LOOP_MONITOR_ENV)
+    _loop_monitor_threshold = float(threshold) if threshold else None
+    _epoch = os.environ.get(EPOCH_ENV, _epoch)
+    _snapshot_reader = SnapshotStore(Path(os.environ[SNAPSHOT_DIR_ENV]), readonly=True)
+    _fanout_versions.clear()
+    repos = json.loads(os.environ.get(REPOS_ENV, "[]"))
+    _registry.clear()
+    for repo in repos:
+        _registry.add(
+            Path(repo["path"]),
+            name=repo["name"],
+            record_history=repo["record_history"],
+            history_retention_days=repo["history_retention_days"],
+        )
+
+
+def _shared_snapshot(repo_name: str, scope: str) -> tuple[int, str] | None:
+    """Get the leader's encoded message for a scope from the shared store.
+
+    Blocking: the read waits while the leader writes the snapshot, so run it
+    on the reader pool, never on the event loop.
+
+    Args:
+        repo_name: Repository name (``*`` for the fleet view)
+        scope: Data scope
+
+    Returns:
+        Tuple of (version, encoded update message), or None outside worker
+        mode or if the leader has not published the scope yet
+    """
+    store = _snapshot_reader
+    if store is None:
+        return None
+    snapshot = store.read(f"{repo_name}:{scope}")
+    return (snapshot[0], snapshot[1].decode()) if snapshot is not None else None
+
+
+async def _on_fanout_frame(key: str, payload: bytes) -> None:
+    """Forward a snapshot announced by the leader to subscribed clients.
+
+    Frames only carry the new version; the message itself is read from the
+    shared store on the reader pool, once per version, and only if a client
+    here wants it.
+    """
+    store = _snapshot_reader
+    repo_name, _, scope = key.rpartition(":")
+    connection_manager.notify_change(repo_name, scope)
+    if store is None or int(payload) <= _fanout_versions.get(key, 0):
+        return
+    if not connection_manager.is_subscribed(scope, repo_name):
+        connection_manager.streams.forget(repo_name, scope)
+        return
+
+    try:
+        snapshot = await _get_reader_pool().run(_shared_snapshot, repo_name, scope)
+    except ReadDeadlineError:
+        return  # The leader's next frame carries a newer version anyway
+    if snapshot is None:
+        return
+    version, msg_json = snapshot
+    if version <= _fanout_versions.get(key, 0):
+        return  # Sent meanwhile as a new client's initial data
+    _fanout_versions[key] = version
+    await connection_manager.broadcast_encoded(scope, msg_json, repo_name=repo_name)
+
+
+def start_fanout_leader() -> str:
+    """Run this process as the leader of a multi-worker deployment.
+
+    The leader watches every configured repository, keeps the sidecars up to
+    date and writes each changed scope, encoded once, to a snapshot store
+    shared with the workers, announcing the new version over the channel.
+
+    Returns:
+        Fan-out channel address to pass to the workers
+    """
+    global _fanout_publisher, _leader_store, _leader_watcher
+    if _fanout_publisher is not None and _fanout_publisher.address is not None:
+        return _fanout_publisher.address
+
+    _leader_store = SnapshotStore(default_snapshot_dir())
+    _fanout_publisher = FanoutPublisher()
+    address = _fanout_publisher.start()
+    _leader_values.clear()
+
+    # Publish the starting state so workers can serve it right away
+    for repo in _registry:
+        _publish_repo(repo.name)
+
+    _leader_watcher = WatcherPool(debounce_ms=100, use_polling=False)
+    for repo in _registry:
+        _leader_watcher.watch(repo.lodestar_dir, partial(_publish_repo, repo.name))
+    _leader_watcher.start()
+    _start_tracing()
+    return address
+
+
+def stop_fanout_leader() -> None:
+    """Stop the leader's watcher, close the channel and remove the snapshot store."""
+    global _fanout_publisher, _leader_store, _leader_watcher
+    if _leader_watcher is not None:
+        _leader_watcher.stop()
+        _leader_watcher = None
+    _stop_tracing()
+    if _fanout_publisher is not None:
+        _fanout_publisher.stop()
+        _fanout_publisher = None
+    if _leader_store is not None:
+        _leader_store.close(remove=True)
+        _leader_store = None
+
+
+def _publish_repo(repo_name: str) -> None:
+    """Gather a repository and publish its changed scopes to the workers.
+
+    Scopes whose data did not change since the last publish are skipped. Runs
+    in watcher threads; publishes are serialized so frames stay in order.
+    """
+    publisher = _fanout_publisher
+    store = _leader_store
+    repo = _registry.get(repo_name)
+    if publisher is None or store is None or repo is None:
+        return
+
+    def publish(repo_name: str, scope: str, data: Any) -> None:
+        key = f"{repo_name}:{scope}"
+        version = store.version(key) + 1
+        store.write(key, _encode_update(repo_name, scope, data, version).encode())
+        publisher.publish(key, str(version).encode())
+
+    with _leader_lock:
+        _update_sidecars(repo)
+        try:
+            scopes_data = _gather_repo(repo)
+        except Exception:
+            return
+
+        previous = _leader_values.get(repo.name, {})
+        _leader_values[repo.name] = scopes_data
+        changed = False
+        for scope, data in scopes_data.items():
+            if previous.get(scope) == data:
+                continue
+            changed = True
+            publish(repo.name, scope, data)
+
+        if changed:
+            collected = [
+                (
+                    r,
+                    _leader_values.get(r.name),
+                    FleetRepoState(
+                        repo=r.name,
+                        status="fresh" if r.name in _leader_values else "unavailable",
+                        error=None,
+                    ),
+                )
+                for r in _registry
+            ]
+            view = _fleet_view(collected).model_dump(mode="json", by_alias=True)
+            publish(_FLEET_KEY, ALL_REPOS_SCOPE, view)
+
+
+def _create_repo_router() -> APIRouter:
+    """Create the per-repository API routes.
+
+    The router is mounted twice: at ``/api`` for the default repository and
+    at ``/api/repos/{repo_name}`` for any configured repository.
+    """
+    router = APIRouter()
+
+    @router.get("/status", response_model=Status)
+    async def status(repo: Repo = Depends(_resolve_repo)) -> Status:
+        """Get system status."""
+        runtime_db = repo.lodestar_dir / "runtime.sqlite"
+        spec_file = repo.lodestar_dir / "spec.yaml"
+
+        return Status(
+            status="ok",
+            version=__version__,
+            repo=repo.name,
+            lodestar_dir=str(repo.lodestar_dir.absolute()),
+            db_exists=runtime_db.exists(),
+            spec_exists=spec_file.exists(),
+            uptime_seconds=None,  # TODO: Track uptime
+        )
+
+    @router.get("/agents", response_model=list[Agent])
+    async def get_agents(repo: Repo = Depends(_watch_scope("agents"))) -> list[Agent]:
+        """Get all agents."""
+        agents = await _get_reader_pool().run(repo.runtime_reader.fetch_agents)
+        return [_agent_from_row(a) for a in agents]
+
+    @router.get("/agents/{agent_id}", response_model=Agent)
+    async def get_agent(agent_id: str, repo: Repo = Depends(_resolve_repo)) -> Agent:
+        """Get a specific agent by ID."""
+        agents = await _get_reader_pool().run(repo.runtime_reader.fetch_agents)
+        for agent_dict in agents:
+            if agent_dict.get("agent_id") == agent_id:
+                return _agent_from_row(agent_dict)
+
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+
+    @router.get("/tasks", response_model=list[Task])
+    async def get_tasks(
+        response: Response, repo: Repo = Depends(_watch_scope("tasks"))
+    ) -> JSONResponse:
+        """Get all tasks.
+
+        Served from the cached broadcast data while it is fresh, so large
+        specs are not parsed again for every poll.
+        """
+        snapshot = repo.fresh_snapshot(SNAPSHOT_MAX_AGE_SECONDS)
+        if snapshot is not None and "tasks" in snapshot:
+            tasks = snapshot["tasks"]
+        else:
+            tasks = await _get_reader_pool().run(_tasks_table, repo)
+        # Returned responses skip the headers the dependency set on ``response``
+        return JSONResponse(
+            tasks.to_json(), headers={VERSION_HEADER: response.headers[VERSION_HEADER]}
+        )
+
+    @router.get("/tasks/{task_id}", response_model=Task)
+    async def get_task(task_id: str, repo: Repo = Depends(_resolve_repo)) -> Task:
+        """Get a specific task by ID."""
+        task_dict = await _get_reader_pool().run(repo.spec_reader.get_task_by_id, task_id)
+        if not task_dict:
+            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+
+        return Task(
+            id=task_dict.get("id", ""),
+            title=task_dict.get("title", ""),
+            description=task_dict.get("description", ""),
+            acceptanceCriteria=task_dict.get(
+                "acceptance_criteria", task_dict.get("acceptanceCriteria", [])
+            ),
+            status=task_dict.get("status", "ready"),
+            priority=task_dict.get("priority", 999),
+            labels=task_dict.get("labels", []),
+            locks=task_dict.get("locks", []),
+            dependencies=task_dict.get("depends_on", task_dict.get("dependsOn", [])),
+            dependents=task_dict.get("dependents", []),
+            createdAt=task_dict.get("created_at", task_dict.get("createdAt")),
+            updatedAt=task_dict.get("updated_at", task_dict.get("updatedAt")),
+            prdSource=task_dict.get("prd_source", task_dict.get("prdSource")),
+        )
+
+    @router.get("/leases", response_model=list[Lease])
+    async def get_leases(
+        include_expired: bool = Query(False), repo: Repo = Depends(_watch_scope("leases"))
+    ) -> list[Lease]:
+        """Get leases."""
+        leases_data = await _get_reader_pool().run(
+            repo.runtime_reader.fetch_leases, include_expired=include_expired
+        )
+        return [_lease_from_row(lease) for lease in leases_data]
+
+    @router.get("/messages", response_model=list[Message])
+    async def get_messages(
+        limit: int = Query(50, ge=1, le=200),
+        unread_only: bool = Query(False),
+        repo: Repo = Depends(_watch_scope("messages")),
+    ) -> list[Message]:
+        """Get messages with pagination."""
+        messages_data = await _get_reader_pool().run(
+            repo.runtime_reader.fetch_messages, limit=limit, unread_only=unread_only
+        )
+        return [_message_from_row(m) for m in messages_data]
+
+    @router.get("/events", response_model=list[Event])
+    async def get_events(
+        response: Response,
+        limit: int = Query(100, ge=1),
+        event_type: str | None = Query(None),
+        stream: bool = Query(False),
+        repo: Repo = Depends(_watch_scope("events")),
+    ) -> Any:
+        """Get recent events, newest first.
+
+        Up to ``EVENTS_PAGE_LIMIT`` events are returned as one JSON list.
+        Larger limits, and ``stream=true`` (NDJSON, one event per line), are
+        streamed from a server-side cursor a batch at a time, so memory use
+        does not grow with the number of events.
+        """
+        pool = _get_reader_pool()
+        if not stream and limit <= EVENTS_PAGE_LIMIT:
+            events_data = await pool.run(
+                repo.runtime_reader.fetch_events, limit=limit, event_type=event_type
+            )
+            return [_event_from_row(e) for e in events_data]
+
+        events = repo.runtime_reader.stream_events(limit=limit, event_type=event_type)
+        # First batch before the response starts, so failures get a status code
+        try:
+            batch = await pool.run(_encode_event_batch, events, single_flight=False)
+        except FileNotFoundError:
+            batch = []
+        except (sqlite3.Error, ReadDeadlineError) as e:
+            events.close()
+            raise HTTPException(status_code=503, detail=f"Runtime database unavailable: {e}") from e
+
+        async def body() -> AsyncIterator[str]:
+            nonlocal batch
+            try:
+                if not stream:
+                    yield "["
+                separator = ""
+                while batch:
+                    if stream:
+                        yield "".join(f"{event}\n" for event in batch)
+                    else:
+                        yield separator + ",".join(batch)
+                        separator = ","
+                    batch = await pool.run(_encode_event_batch, events, single_flight=False)
+                if not stream:
+                    yield "]"
+            except (sqlite3.Error, ReadDeadlineError) as e:
+                if not stream:
+                    raise  # Aborts the response: clients never parse a cut-off list
+                error = WSErrorMessage(
+                    type="error",
+                    error=f"Runtime database unavailable: {e}",
+                    timestamp=datetime.utcnow(),
+                )
+                yield error.model_dump_json() + "\n"
+            finally:
+                events.close()
+
+        # Returned responses skip the headers the dependency set on ``response``
+        return StreamingResponse(
+            body(),
+            media_type="application/x-ndjson" if stream else "application/json",
+            headers={VERSION_HEADER: response.headers[VERSION_HEADER]},
+        )
+
+    @router.get("/snapshot", response_model=DashboardData)
+    async def get_snapshot(
+        stream: bool = Query(False),
+        repo: Repo = Depends(_resolve_repo),
+    ) -> Any:
+        """Get every data scope of a repository in one request.
+
+        The runtime scopes come from one read transaction, so they agree with
+        each other; ``data_version`` is a digest of the runtime data read. ``versions`` holds
+        the scope versions the data is at least as new as; clients can pass
+        them to ``/ws`` as ``resume``. With
+        ``stream=true`` the scopes are sent as NDJSON update messages (the
+        ``/ws`` format) as soon as each source has been read.
+        """
+        # Versions first: the data read afterwards is at least this new
+        versions = {
+            scope: connection_manager.current_version(repo.name, scope) for scope in DATA_SCOPES
+        }
+        found = False
+
+        def read_runtime() -> dict[str, Any]:
+            nonlocal found
+            scopes, found = _gather_runtime_snapshot(repo)
+            return scopes
+
+        pool = _get_reader_pool()
+        reads = [
+            pool.run(lambda: {"tasks": _gather_scope(repo, "tasks")}),
+            pool.run(read_runtime),
+        ]
+
+        if stream:
 
-    async def broadcast_all(self) -> None:
-        """Broadcast all current data to subscribed clients."""
-        if not _runtime_reader or not _spec_reader or _shutting_down:
-            return
+            async def lines() -> AsyncIterator[str]:
+                for read in asyncio.as_completed(reads):
+                    try:
+                        scopes = await read
+                    except (sqlite3.Error, ReadDeadlineError) as e:
+                        error = WSErrorMessage(
+                            type="error",
+                            error=f"Runtime database unavailable: {e}",
+                            timestamp=datetime.utcnow(),
+                        )
+                        yield error.model_dump_json() + "\n"
+                        continue
+                    for scope, data in scopes.items():
+                        yield _encode_update(repo.name, scope, data, versions[scope]) + "\n"
 
-        # Run blocking data gathering in a thread
-        try:
-            scopes_data = await asyncio.to_thread(self._gather_data_sync)
-        except Exception:
-            # If data gathering fails (e.g. DB locked or shutdown), just return
-            return
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
 
-        # Broadcast each scope
-        for scope, data in scopes_data.items():
-            await self.broadcast(scope, data)
+        try:
+            tasks, runtime = await asyncio.gather(*reads)
+        except sqlite3.Error as e:
+            raise HTTPException(status_code=503, detail=f"Runtime database unavailable: {e}") from e
+        data = {scope: as_json(scope_data) for scope, scope_data in {**tasks, **runtime}.items()}
+        return {
+            **data,
+            "versions": versions,
+            # Digested here rather than in every gather, which never needs it
+            "data_version": _data_version(data) if found else None,
+            "timestamp": datetime.now(UTC),
+        }
+
+    @router.get("/timeseries", response_model=TimeseriesResponse)
+    async def get_timeseries(
+        resolution: str = Query("hour", pattern="^(minute|hour|day)$"),
+        since: datetime | None = Query(None),
+        until: datetime | None = Query(None),
+        group_by: str = Query("event_type", pattern="^(event_type|agent|task|none)$"),
+        event_type: str | None = Query(None),
+        agent_id: str | None = Query(None),
+        task_id: str | None = Query(None),
+        repo: Repo = Depends(_resolve_repo),
+    ) -> TimeseriesResponse:
+        """Get time-bucketed event counts from the rollup store."""
+
+        def query() -> tuple[list[dict[str, Any]], int]:
+            # Catch up with events written since the last watcher-triggered update
+            # (in a worker process the leader is the only writer)
+            rollup_store = repo.rollup_store
+            if _fanout_address is None:
+                rollup_store.update(repo.runtime_reader)
+            points = rollup_store.query(
+                resolution=resolution,
+                since=since,
+                until=until,
+                group_by=group_by,
+                event_type=event_type,
+                agent_id=agent_id,
+                task_id=task_id,
+            )
+            return points, rollup_store.last_event_id
 
-    def _gather_data_sync(self) -> dict[str, Any]:
-        """Gather all data for broadcast synchronously.
+        try:
+            points, last_event_id = await _get_reader_pool().run(query)
+        except (OSError, sqlite3.Error) as e:
+            raise HTTPException(status_code=503, detail=f"Rollup store unavailable: {e}") from e
+
+        return TimeseriesResponse(
+            resolution=resolution,
+            groupBy=group_by,
+            lastEventId=last_event_id,
+            points=[TimeseriesPoint(**point) for point in points],
+        )
 
-        This runs in a thread to avoid blocking the event loop.
-        """
-        if not _runtime_reader or not _spec_reader:
-            return {}
-
-        scopes_data: dict[str, Any] = {}
-
-        # Get agents
-        agents_data = _runtime_reader.get_agents()
-        agents = []
-        for a in agents_data:
-            # Parse capabilities and session_meta
-            capabilities = []
-            if a.get("capabilities"):
-                try:
-                    capabilities = json.loads(a.get("capabilities") or "[]")
-                except (json.JSONDecodeError, TypeError):
-                    capabilities = (a.get("capabilities") or "").split(",")
+    @router.get("/history", response_model=HistorySnapshot)
+    async def get_history(
+        at: datetime = Query(..., description="Point in time to reconstruct"),
+        include_expired: bool = Query(False),
+        repo: Repo = Depends(_resolve_repo),
+    ) -> HistorySnapshot:
+        """Reconstruct agents, leases and task statuses at a point in time."""
+        history_store = repo.history_store
+        if history_store is None:
+            raise HTTPException(status_code=503, detail="History recording not enabled")
+
+        at_utc = _as_utc(at)
+        try:
+            state = await _get_reader_pool().run(history_store.state_at, at_utc.timestamp())
+        except (OSError, sqlite3.Error) as e:
+            raise HTTPException(status_code=503, detail=f"History store unavailable: {e}") from e
+
+        return HistorySnapshot(
+            at=at_utc,
+            agents=_history_agents(state, at_utc),
+            leases=_history_leases(state, at_utc, include_expired=include_expired),
+            taskStatuses=state["tasks"],
+        )
 
-            session_meta = None
-            if a.get("session_meta"):
-                try:
-                    session_meta = json.loads(a.get("session_meta") or "null")
-                except (json.JSONDecodeError, TypeError):
-                    pass
+    @router.get("/graph")
+    async def get_graph(repo: Repo = Depends(_resolve_repo)) -> dict[str, list[dict[str, Any]]]:
+        """Get dependency graph data."""
+        tasks = await _get_reader_pool().run(repo.spec_reader.get_tasks)
 
-            # Determine status based on last_seen_at (schema: 15min idle, 60min offline)
-            status = "offline"
-            if a.get("last_seen_at"):
-                try:
-                    last_seen_str = a.get("last_seen_at") or ""
-                    last_seen = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                    elapsed_seconds = (
-                        datetime.utcnow().replace(tzinfo=None) - last_seen.replace(tzinfo=None)
-                    ).total_seconds()
-                    if elapsed_seconds < 900:  # 15 minutes
-                        status = "online"
-                    elif elapsed_seconds < 3600:  # 60 minutes
-                        status = "idle"
-                except Exception:
-                    pass
+        # Build nodes and edges
+        nodes = []
+        edges = []
 
-            agents.append(
-                Agent(
-                    id=a.get("agent_id", ""),
-                    displayName=a.get("display_name"),
-                    role=a.get("role"),
-                    status=status,
-                    lastSeenAt=a.get("last_seen_at"),
-                    registeredAt=a.get("created_at"),
-                    capabilities=capabilities,
-                    sessionMeta=session_meta,
-                ).model_dump(mode="json", by_alias=True)
+        for task in tasks:
+            nodes.append(
+                {
+                    "id": task.get("id"),
+                    "label": task.get("title", ""),
+                    "status": task.get("status", "ready"),
+                    "priority": task.get("priority", 999),
+                    "labels": task.get("labels", []),
+                }
             )
-        scopes_data["agents"] = agents
-
-        # Get tasks
-        tasks = [t.model_dump(mode="json", by_alias=True) for t in _spec_reader.get_tasks_typed()]
-        scopes_data["tasks"] = tasks
-
-        # Get leases
-        leases_data = _runtime_reader.get_leases(include_expired=False)
-        leases = [
-            Lease(
-                leaseId=lease.get("lease_id", ""),
-                taskId=lease.get("task_id", ""),
-                agentId=lease.get("agent_id", ""),
-                expiresAt=lease.get("expires_at") or datetime.utcnow(),
-                ttlSeconds=900,  # Default, not in DB
-                createdAt=lease.get("created_at") or datetime.utcnow(),
-            ).model_dump(mode="json", by_alias=True)
-            for lease in leases_data
-        ]
-        scopes_data["leases"] = leases
-
-        # Get messages
-        messages_data = _runtime_reader.get_messages(limit=50, unread_only=False)
-        messages = []
-        for m in messages_data:
-            # Parse meta
-            meta = {}
-            if m.get("meta"):
-                try:
-                    meta = json.loads(m.get("meta") or "{}")
-                except (json.JSONDecodeError, TypeError):
-                    pass
 
-            # Parse read_by array
-            read_by = []
-            if m.get("read_by"):
-                try:
-                    read_by = json.loads(m.get("read_by") or "[]")
-                except (json.JSONDecodeError, TypeError):
-                    read_by = []
-
-            messages.append(
-                Message(
-                    id=m.get("message_id", ""),
-                    createdAt=m.get("created_at") or datetime.utcnow(),
-                    **{"from": m.get("from_agent_id", "")},
-                    taskId=(m.get("to_id") or "") if m.get("to_type") == "task" else "",
-                    body=m.get("text", ""),
-                    readBy=read_by,
-                    subject=meta.get("subject"),
-                    severity=meta.get("severity"),
-                ).model_dump(mode="json", by_alias=True)
-            )
-        scopes_data["messages"] = messages
-
-        # Get events
-        events_data = _runtime_reader.get_events(limit=100, event_type=None)
-        events = []
-        for e in events_data:
-            data = e.get("data", {})
-            if isinstance(data, str):
-                try:
-                    data = json.loads(data)
-                except (json.JSONDecodeError, TypeError):
-                    data = {}
-
-            events.append(
-                Event(
-                    id=e.get("event_id", 0),
-                    createdAt=e.get("created_at") or datetime.utcnow(),
-                    type=e.get("event_type", ""),
-                    actorAgentId=e.get("agent_id"),
-                    taskId=e.get("task_id"),
-                    targetAgentId=e.get("target_agent_id"),
-                    correlationId=e.get("correlation_id"),
-                    payload=data,
-                ).model_dump(mode="json", by_alias=True)
-            )
-        scopes_data["events"] = events
+            # Create edges for dependencies
+            for dep in task.get("depends_on", []):
+                edges.append({"from": dep, "to": task.get("id")})
 
-        return scopes_data
+        return {"nodes": nodes, "edges": edges}
 
-    @property
-    def connection_count(self) -> int:
-        """Get number of active connections."""
-        return len(self._connections)
+    return router
 
 
-# Global connection manager instance
-connection_manager = ConnectionManager()
+def set_debug_endpoints(enabled: bool) -> None:
+    """Enable or disable the /api/debug endpoints.
+
+    Args:
+        enabled: Serve the endpoints to local clients
+    """
+    global _debug_endpoints
+    _debug_endpoints = enabled
 
 
-def set_lodestar_dir(lodestar_dir: Path) -> None:
-    """Set the Lodestar directory to monitor.
+def set_loop_monitor(threshold: float | None) -> None:
+    """Enable the event loop monitor from the next server start, or disable it.
 
     Args:
-        lodestar_dir: Path to .lodestar directory
+        threshold: Seconds a callback may block the loop before it is logged
+            with its stack and counted in /metrics, or None to disable
     """
-    global _lodestar_dir, _runtime_reader, _spec_reader
-    _lodestar_dir = lodestar_dir
-    _runtime_reader = RuntimeReader(lodestar_dir / "runtime.sqlite")
-    _spec_reader = SpecReader(lodestar_dir / "spec.yaml")
+    global _loop_monitor_threshold
+    _loop_monitor_threshold = threshold
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Lifespan context manager for startup/shutdown events."""
-    global _watcher, _event_loop
+def set_trace_file(path: Path | None) -> None:
+    """Trace the pipeline to a file from the next server start, or stop tracing.
 
-    # Store event loop for cross-thread broadcasting
-    _event_loop = asyncio.get_event_loop()
+    Args:
+        path: File spans are appended to as JSON lines, or None to disable
+    """
+    global _trace_file
+    _trace_file = path
 
-    # Start file watcher if lodestar dir is configured
-    if _lodestar_dir is not None:
-        _watcher = LodestarWatcher(
-            _lodestar_dir,
-            on_change=trigger_broadcast,
-            debounce_ms=100,
-            use_polling=False,
-        )
-        _watcher.start()
 
-    yield
+def _start_tracing() -> None:
+    """Open the trace file exporter, if a trace file is configured."""
+    global _trace_exporter
+    if _trace_file is not None and _trace_exporter is None:
+        _trace_exporter = tracing.JsonLinesExporter(_trace_file)
+        tracing.set_exporter(_trace_exporter)
 
-    # Signal shutdown to prevent new operations
-    global _shutting_down
-    _shutting_down = True
 
-    # Shutdown: stop watcher
-    if _watcher is not None:
-        _watcher.stop()
-        _watcher = None
+def _stop_tracing() -> None:
+    """Stop tracing and close the trace file, flushing pending spans."""
+    global _trace_exporter
+    if _trace_exporter is not None:
+        tracing.set_exporter(None)
+        _trace_exporter.close()
+        _trace_exporter = None
 
-    # Cancel and wait for background tasks
-    if _background_tasks:
-        for task in _background_tasks:
-            task.cancel()
 
-        # Wait for tasks to complete/cancel
-        try:
-            await asyncio.gather(*_background_tasks, return_exceptions=True)
-        except Exception:
-            pass
+def _check_debug_access(request: Request) -> None:
+    """Allow a debug endpoint request only if enabled and from this machine.
+
+    Raises:
+        HTTPException: 404 if the debug endpoints are disabled, 403 if the
+            client is not on a loopback address
+    """
+    if not _debug_endpoints:
+        raise HTTPException(status_code=404, detail="Not Found")
+    host = request.client.host if request.client else ""
+    try:
+        local = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        local = host == "localhost"
+    if not local:
+        raise HTTPException(status_code=403, detail="Debug endpoints are local only")
 
 
 def create_app() -> FastAPI:
@@ -422,6 +2158,18 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.exception_handler(ReadDeadlineError)
+    async def read_deadline_error(request: Request, exc: ReadDeadlineError) -> JSONResponse:
+        """Answer a request whose reads timed out (e.g. a locked database) with 503."""
+        return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+    @app.exception_handler(sqlite3.Error)
+    async def database_error(request: Request, exc: sqlite3.Error) -> JSONResponse:
+        """Answer a request whose database read failed (e.g. still locked) with 503."""
+        return JSONResponse(
+            status_code=503, content={"detail": f"Runtime database unavailable: {exc}"}
+        )
+
     # Mount static files if directory exists
     if STATIC_DIR.exists():
         app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
@@ -449,299 +2197,178 @@ def create_app() -> FastAPI:
                 "<p>Frontend not yet built. Run frontend build process first.</p>"
             )
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Serve counters and histograms in the Prometheus text format."""
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/api/debug/stats", include_in_schema=False)
+    async def debug_stats(request: Request) -> dict[str, Any]:
+        """Report internal sizes and queues (opt-in, local clients only)."""
+        _check_debug_access(request)
+        watcher = _watcher or _leader_watcher
+        repos = {}
+        for repo in _registry:
+            snapshot = repo.snapshot
+            repos[repo.name] = {
+                "loaded": repo.loaded,
+                "snapshot_age_seconds": (
+                    None if snapshot is None else time.monotonic() - repo.snapshot_at
+                ),
+                "snapshot_items": (
+                    {}
+                    if snapshot is None
+                    else {scope: len(data) for scope, data in snapshot.items()}
+                ),
+            }
+        return {
+            **connection_manager.debug_stats(),
+            "background_tasks": len(_background_tasks),
+            "repos": repos,
+            "debounce": (
+                {}
+                if watcher is None
+                else {str(path): state for path, state in watcher.debounce_state().items()}
+            ),
+            "readers": _get_reader_pool().stats(),
+            "loop_stalls": [] if _loop_monitor is None else _loop_monitor.recent_stalls(),
+        }
+
+    @app.get("/api/debug/profile", include_in_schema=False)
+    async def debug_profile(
+        request: Request,
+        seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS, description="Sampling time"),
+        interval_ms: float = Query(5.0, ge=1, le=1000, description="Milliseconds between samples"),
+    ) -> Response:
+        """Sample every thread's stack and return collapsed stacks (opt-in, local only)."""
+        _check_debug_access(request)
+        if not _profile_lock.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="A profile is already running")
+        try:
+            # On a thread of its own: the loop keeps running, and gets sampled
+            counts = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+        finally:
+            _profile_lock.release()
+        return Response(collapse(counts), media_type="text/plain; charset=utf-8")
+
     @app.get("/api/health", response_model=HealthResponse)
     async def health() -> HealthResponse:
-        """Health check endpoint."""
-        return HealthResponse(status="ok", version=__version__)
-
-    @app.get("/api/status", response_model=Status)
-    async def status() -> Status:
-        """Get system status."""
-        if not _lodestar_dir:
-            raise HTTPException(status_code=503, detail="Lodestar directory not configured")
-
-        runtime_db = _lodestar_dir / "runtime.sqlite"
-        spec_file = _lodestar_dir / "spec.yaml"
-
-        return Status(
-            status="ok",
-            version=__version__,
-            lodestar_dir=str(_lodestar_dir.absolute()),
-            db_exists=runtime_db.exists(),
-            spec_exists=spec_file.exists(),
-            uptime_seconds=None,  # TODO: Track uptime
-        )
-
-    @app.get("/api/agents", response_model=list[Agent])
-    async def get_agents() -> list[Agent]:
-        """Get all agents."""
-        if not _runtime_reader:
-            raise HTTPException(status_code=503, detail="Runtime reader not initialized")
-
-        agents_data = _runtime_reader.get_agents()
-        agents = []
-
-        for a in agents_data:
-            # Parse capabilities and session_meta
-            capabilities = []
-            if a.get("capabilities"):
-                try:
-                    capabilities = json.loads(a.get("capabilities") or "[]")
-                except (json.JSONDecodeError, TypeError):
-                    capabilities = (a.get("capabilities") or "").split(",")
-
-            session_meta = None
-            if a.get("session_meta"):
-                try:
-                    session_meta = json.loads(a.get("session_meta") or "null")
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            # Determine status based on last_seen_at (schema: 15min idle, 60min offline)
-            status = "offline"
-            if a.get("last_seen_at"):
-                try:
-                    last_seen_str = a.get("last_seen_at") or ""
-                    last_seen = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                    elapsed_seconds = (
-                        datetime.utcnow().replace(tzinfo=None) - last_seen.replace(tzinfo=None)
-                    ).total_seconds()
-                    if elapsed_seconds < 900:  # 15 minutes
-                        status = "online"
-                    elif elapsed_seconds < 3600:  # 60 minutes
-                        status = "idle"
-                except Exception:
-                    pass
-
-            agent = Agent(
-                id=a.get("agent_id", ""),
-                displayName=a.get("display_name"),
-                role=a.get("role"),
-                status=status,
-                lastSeenAt=a.get("last_seen_at"),
-                registeredAt=a.get("created_at"),
-                capabilities=capabilities,
-                sessionMeta=session_meta,
+        """Health check endpoint, with the reader pool's queue metrics."""
+        readers = ReaderPoolStats(**_get_reader_pool().stats())
+        return HealthResponse(status="ok", version=__version__, readers=readers)
+
+    @app.get("/api/repos", response_model=list[RepoInfo])
+    async def list_repos() -> list[RepoInfo]:
+        """List the monitored repositories."""
+        default = _registry.default
+        return [
+            RepoInfo(
+                name=repo.name,
+                lodestarDir=str(repo.lodestar_dir.absolute()),
+                default=repo is default,
+                loaded=repo.loaded,
+                dbExists=(repo.lodestar_dir / "runtime.sqlite").exists(),
+                specExists=(repo.lodestar_dir / "spec.yaml").exists(),
             )
-            agents.append(agent)
-
-        return agents
-
-    @app.get("/api/agents/{agent_id}", response_model=Agent)
-    async def get_agent(agent_id: str) -> Agent:
-        """Get a specific agent by ID."""
-        if not _runtime_reader:
-            raise HTTPException(status_code=503, detail="Runtime reader not initialized")
+            for repo in _registry
+        ]
 
-        agents = _runtime_reader.get_agents()
-        for agent_dict in agents:
-            if agent_dict.get("agent_id") == agent_id:
-                # Parse capabilities and session_meta
-                capabilities = []
-                if agent_dict.get("capabilities"):
-                    try:
-                        capabilities = json.loads(agent_dict.get("capabilities") or "[]")
-                    except (json.JSONDecodeError, TypeError):
-                        capabilities = (agent_dict.get("capabilities") or "").split(",")
+    @app.get("/api/fleet", response_model=FleetView)
+    async def get_fleet(
+        agent_status: str = Query("online", description="Agent status to include, or all"),
+        task_status: str = Query("blocked", description="Task status to include, or all"),
+    ) -> FleetView:
+        """Get agents, active leases and tasks across all repositories."""
+        return _fleet_view(
+            await _gather_fleet(), agent_status=agent_status, task_status=task_status
+        )
 
-                session_meta = None
-                if agent_dict.get("session_meta"):
-                    try:
-                        session_meta = json.loads(agent_dict.get("session_meta") or "null")
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+    @app.get("/api/fleet/agents", response_model=FleetView)
+    async def get_fleet_agents(
+        status: str = Query("online", description="Agent status to include, or all"),
+    ) -> FleetView:
+        """Get agents across all repositories (online ones by default)."""
+        return _fleet_view(await _gather_fleet(), scopes=("agents",), agent_status=status)
+
+    @app.get("/api/fleet/leases", response_model=FleetView)
+    async def get_fleet_leases() -> FleetView:
+        """Get active leases across all repositories."""
+        return _fleet_view(await _gather_fleet(), scopes=("leases",))
+
+    @app.get("/api/fleet/tasks", response_model=FleetView)
+    async def get_fleet_tasks(
+        status: str = Query("blocked", description="Task status to include, or all"),
+    ) -> FleetView:
+        """Get tasks across all repositories (blocked ones by default)."""
+        return _fleet_view(await _gather_fleet(), scopes=("tasks",), task_status=status)
+
+    @app.get("/api/stream")
+    async def stream(
+        scope: list[str] = Query(["all"], description="Scopes to follow (same syntax as /ws)"),
+        repo: str | None = Query(None, description="Repository that bare scopes refer to"),
+        last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    ) -> StreamingResponse:
+        """Stream updates as Server-Sent Events.
+
+        A read-only alternative to /ws for scripts and proxies: each event's
+        data is the same update message a WebSocket client receives. The
+        current state of every scope is sent first; a client reconnecting
+        with ``Last-Event-ID`` is only sent the scopes that changed since.
+        """
+        if repo is not None and _registry.get(repo) is None:
+            raise HTTPException(status_code=404, detail=f"Repository not found: {repo}")
+        if _registry.default is None:
+            raise HTTPException(status_code=503, detail="Lodestar directory not configured")
 
-                # Determine status based on last_seen_at (schema: 15min idle, 60min offline)
-                status = "offline"
-                if agent_dict.get("last_seen_at"):
+        requested = [name for value in scope for name in value.split(",") if name]
+        qualified = [
+            f"{repo}:{name}" if repo and ":" not in name and name != ALL_REPOS_SCOPE else name
+            for name in requested
+        ]
+        for name, full_name in zip(requested, qualified, strict=True):
+            if _parse_scope(full_name) is None:
+                raise HTTPException(status_code=400, detail=f"Invalid scope: {name}")
+        keys = _scope_keys(qualified)
+
+        hub = connection_manager.streams
+        since = hub.parse_event_id(last_event_id)
+        # Register before reading current state so no later change is missed
+        subscriber = hub.add(set(keys))
+        stamp = hub.last_seq
+        if since is not None:
+            stale = hub.stale_keys(subscriber.keys, since)
+            keys = [key for key in keys if key in stale]
+
+        async def events() -> AsyncIterator[str]:
+            try:
+                yield f"retry: {STREAM_RETRY_MS}\n\n"
+                async for _, msg_json in _initial_updates(keys):
+                    yield format_event(hub.event_id(stamp), msg_json)
+                while True:
                     try:
-                        last_seen_str = agent_dict.get("last_seen_at") or ""
-                        last_seen = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                        elapsed_seconds = (
-                            datetime.utcnow().replace(tzinfo=None) - last_seen.replace(tzinfo=None)
-                        ).total_seconds()
-                        if elapsed_seconds < 900:  # 15 minutes
-                            status = "online"
-                        elif elapsed_seconds < 3600:  # 60 minutes
-                            status = "idle"
-                    except Exception:
-                        pass
-
-                return Agent(
-                    id=agent_dict.get("agent_id", ""),
-                    displayName=agent_dict.get("display_name"),
-                    role=agent_dict.get("role"),
-                    status=status,
-                    lastSeenAt=agent_dict.get("last_seen_at"),
-                    registeredAt=agent_dict.get("created_at"),
-                    capabilities=capabilities,
-                    sessionMeta=session_meta,
-                )
-
-        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
-
-    @app.get("/api/tasks", response_model=list[Task])
-    async def get_tasks() -> list[Task]:
-        """Get all tasks."""
-        if not _spec_reader:
-            raise HTTPException(status_code=503, detail="Spec reader not initialized")
-
-        return _spec_reader.get_tasks_typed()
-
-    @app.get("/api/tasks/{task_id}", response_model=Task)
-    async def get_task(task_id: str) -> Task:
-        """Get a specific task by ID."""
-        if not _spec_reader:
-            raise HTTPException(status_code=503, detail="Spec reader not initialized")
-
-        task_dict = _spec_reader.get_task_by_id(task_id)
-        if not task_dict:
-            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
-
-        return Task(
-            id=task_dict.get("id", ""),
-            title=task_dict.get("title", ""),
-            description=task_dict.get("description", ""),
-            acceptanceCriteria=task_dict.get(
-                "acceptance_criteria", task_dict.get("acceptanceCriteria", [])
-            ),
-            status=task_dict.get("status", "ready"),
-            priority=task_dict.get("priority", 999),
-            labels=task_dict.get("labels", []),
-            locks=task_dict.get("locks", []),
-            dependencies=task_dict.get("depends_on", task_dict.get("dependsOn", [])),
-            dependents=task_dict.get("dependents", []),
-            createdAt=task_dict.get("created_at", task_dict.get("createdAt")),
-            updatedAt=task_dict.get("updated_at", task_dict.get("updatedAt")),
-            prdSource=task_dict.get("prd_source", task_dict.get("prdSource")),
+                        item = await asyncio.wait_for(
+                            subscriber.queue.get(), STREAM_HEARTBEAT_SECONDS
+                        )
+                    except TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                    if item is None:
+                        return
+                    seq, _, msg_json = item
+                    yield format_event(hub.event_id(seq), msg_json)
+            finally:
+                hub.remove(subscriber)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
 
-    @app.get("/api/leases", response_model=list[Lease])
-    async def get_leases(include_expired: bool = Query(False)) -> list[Lease]:
-        """Get leases."""
-        if not _runtime_reader:
-            raise HTTPException(status_code=503, detail="Runtime reader not initialized")
-
-        leases_data = _runtime_reader.get_leases(include_expired=include_expired)
-        leases = []
-
-        for lease_data in leases_data:
-            lease = Lease(
-                leaseId=lease_data.get("lease_id", ""),
-                taskId=lease_data.get("task_id", ""),
-                agentId=lease_data.get("agent_id", ""),
-                expiresAt=lease_data.get("expires_at") or datetime.utcnow(),
-                ttlSeconds=900,
-                createdAt=lease_data.get("created_at") or datetime.utcnow(),
-            )
-            leases.append(lease)
-
-        return leases
-
-    @app.get("/api/messages", response_model=list[Message])
-    async def get_messages(
-        limit: int = Query(50, ge=1, le=200), unread_only: bool = Query(False)
-    ) -> list[Message]:
-        """Get messages with pagination."""
-        if not _runtime_reader:
-            raise HTTPException(status_code=503, detail="Runtime reader not initialized")
-
-        messages_data = _runtime_reader.get_messages(limit=limit, unread_only=unread_only)
-        messages = []
-
-        for m in messages_data:
-            # Parse meta
-            meta = {}
-            if m.get("meta"):
-                try:
-                    meta = json.loads(m.get("meta") or "{}")
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            # Parse read_by array
-            read_by = []
-            if m.get("read_by"):
-                try:
-                    read_by = json.loads(m.get("read_by") or "[]")
-                except (json.JSONDecodeError, TypeError):
-                    read_by = []
-
-            message = Message(
-                id=m.get("message_id", ""),
-                createdAt=m.get("created_at") or datetime.utcnow(),
-                **{"from": m.get("from_agent_id", "")},
-                taskId=(m.get("to_id") or "") if m.get("to_type") == "task" else "",
-                body=m.get("text", ""),
-                readBy=read_by,
-                subject=meta.get("subject"),
-                severity=meta.get("severity"),
-            )
-            messages.append(message)
-
-        return messages
-
-    @app.get("/api/events", response_model=list[Event])
-    async def get_events(
-        limit: int = Query(100, ge=1, le=500), event_type: str | None = Query(None)
-    ) -> list[Event]:
-        """Get events with pagination."""
-        if not _runtime_reader:
-            raise HTTPException(status_code=503, detail="Runtime reader not initialized")
-
-        events_data = _runtime_reader.get_events(limit=limit, event_type=event_type)
-        events = []
-
-        for e in events_data:
-            # Parse payload if it's a JSON string
-            payload = e.get("data", {})
-            if isinstance(payload, str):
-                try:
-                    payload = json.loads(payload)
-                except (json.JSONDecodeError, TypeError):
-                    payload = {}
-
-            event = Event(
-                id=e.get("event_id", 0),
-                createdAt=e.get("created_at") or datetime.utcnow(),
-                type=e.get("event_type", ""),
-                actorAgentId=e.get("agent_id"),
-                taskId=e.get("task_id"),
-                targetAgentId=e.get("target_agent_id"),
-                correlationId=e.get("correlation_id"),
-                payload=payload,
-            )
-            events.append(event)
-
-        return events
-
-    @app.get("/api/graph")
-    async def get_graph() -> dict[str, list[dict[str, Any]]]:
-        """Get dependency graph data."""
-        if not _spec_reader:
-            raise HTTPException(status_code=503, detail="Spec reader not initialized")
-
-        tasks = _spec_reader.get_tasks()
-
-        # Build nodes and edges
-        nodes = []
-        edges = []
-
-        for task in tasks:
-            nodes.append(
-                {
-                    "id": task.get("id"),
-                    "label": task.get("title", ""),
-                    "status": task.get("status", "ready"),
-                    "priority": task.get("priority", 999),
-                    "labels": task.get("labels", []),
-                }
-            )
-
-            # Create edges for dependencies
-            for dep in task.get("depends_on", []):
-                edges.append({"from": dep, "to": task.get("id")})
-
-        return {"nodes": nodes, "edges": edges}
+    # Per-repository routes: default repository first, then namespaced ones
+    repo_router = _create_repo_router()
+    app.include_router(repo_router, prefix="/api")
+    app.include_router(repo_router, prefix="/api/repos/{repo_name}")
 
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket) -> None:
@@ -750,13 +2377,30 @@ def create_app() -> FastAPI:
         Clients can send JSON messages to subscribe/unsubscribe:
         - {"type": "subscribe", "scopes": ["agents", "tasks", ...]}
         - {"type": "unsubscribe", "scopes": ["agents"]}
+        - {"type": "replay", "from": "...", "to": "...", "speed": 10, "repo": "..."}
+        - {"type": "replay_stop"}
 
-        Valid scopes: agents, tasks, leases, messages, events, all
+        Valid scopes: agents, tasks, leases, messages, events, all. Bare scopes
+        refer to the default repository; prefix a scope with a repository name
+        ("other-repo:agents") to follow any other monitored repository. The
+        all-repos scope streams online agents, active leases and blocked tasks
+        merged across every repository.
 
         Server sends updates in format:
-        - {"type": "update", "scope": "agents", "data": [...], "timestamp": "..."}
+        - {"type": "update", "scope": "agents", "repo": "...", "data": [...],
+          "version": 3, "timestamp": "..."}
+
+        A reconnecting client adds the versions it holds and the epoch from
+        the "connected" message to its subscribe message ("resume":
+        {"repo:agents": 3}, "epoch": "..."); unchanged scopes are then skipped
+        and changed ones are sent from the newest cached update.
+
+        During a replay, live updates are paused for this client and recorded
+        history is sent as {"type": "replay", ...} messages stamped with the
+        historical time, followed by {"type": "replay_complete"}.
         """
         client_id = await connection_manager.connect(websocket)
+        replay_task: asyncio.Task[None] | None = None
 
         try:
             while True:
@@ -781,8 +2425,9 @@ def create_app() -> FastAPI:
                         }
                         await websocket.send_text(json.dumps(response))
 
-                        # Send initial data for newly subscribed scopes
-                        await _send_initial_data(websocket, scopes)
+                        # Send initial data for newly subscribed scopes (or what a
+                        # reconnecting client missed)
+                        await _send_initial_data(websocket, scopes, _parse_resume(msg))
 
                     elif msg_type == "unsubscribe":
                         scopes = msg.get("scopes", [])
@@ -806,6 +2451,40 @@ def create_app() -> FastAPI:
                         }
                         await websocket.send_text(json.dumps(response))
 
+                    elif msg_type == "replay":
+                        try:
+                            request = WSReplayMessage.model_validate(msg)
+                        except ValidationError as e:
+                            detail = e.errors()[0]["msg"]
+                            raise _ClientError(f"Invalid replay request: {detail}") from e
+                        repo = _registry.get(request.repo) if request.repo else _registry.default
+                        if repo is None:
+                            raise _ClientError(f"Unknown repository: {request.repo}")
+                        if not repo.record_history:
+                            raise _ClientError("History recording not enabled")
+
+                        # Only one replay per client; a new request replaces the old one
+                        if replay_task is not None:
+                            replay_task.cancel()
+                            await asyncio.gather(replay_task, return_exceptions=True)
+                        replay_task = asyncio.create_task(
+                            _replay_history(websocket, client_id, repo, request)
+                        )
+
+                    elif msg_type == "replay_stop":
+                        if replay_task is not None:
+                            replay_task.cancel()
+                            await asyncio.gather(replay_task, return_exceptions=True)
+                            replay_task = None
+                        response = {
+                            "type": "replay_stopped",
+                            "timestamp": datetime.utcnow().isoformat(),
+                        }
+                        await websocket.send_text(json.dumps(response))
+                        # Return the client to live data
+                        subscriptions = await connection_manager.get_subscriptions(client_id)
+                        await _send_initial_data(websocket, subscriptions)
+
                     else:
                         # Unknown message type
                         error_msg = WSErrorMessage(
@@ -822,6 +2501,11 @@ def create_app() -> FastAPI:
                         timestamp=datetime.utcnow(),
                     )
                     await websocket.send_text(error_msg.model_dump_json())
+                except _ClientError as e:
+                    error_msg = WSErrorMessage(
+                        type="error", error=str(e), timestamp=datetime.utcnow()
+                    )
+                    await websocket.send_text(error_msg.model_dump_json())
 
         except WebSocketDisconnect:
             pass  # Normal disconnect, cleanup handled in finally
@@ -830,6 +2514,8 @@ def create_app() -> FastAPI:
         except Exception:
             pass  # Other errors, cleanup handled in finally
         finally:
+            if replay_task is not None:
+                replay_task.cancel()
             # Always try to clean up the connection
             try:
                 await connection_manager.disconnect(client_id)
@@ -838,156 +2524,181 @@ def create_app() -> FastAPI:
                 connection_manager._connections.pop(client_id, None)
                 connection_manager._subscriptions.pop(client_id, None)
 
-    async def _send_initial_data(websocket: WebSocket, scopes: list[str]) -> None:
+    async def _send_initial_data(
+        websocket: WebSocket,
+        scopes: list[str],
+        resume: dict[tuple[str, str], int] | None = None,
+    ) -> None:
         """Send initial data for subscribed scopes.
 
+        Scopes a reconnecting client already holds are skipped when unchanged
+        and otherwise sent from the newest cached update; only scopes without
+        one need a fresh snapshot.
+
         Args:
             websocket: WebSocket connection
             scopes: List of scopes to send data for
+            resume: Version per (repository name, scope) the client holds
         """
-        if not _runtime_reader or not _spec_reader:
-            return
-
-        # Expand "all" to all scopes
-        if "all" in scopes:
-            scopes = ["agents", "tasks", "leases", "messages", "events"]
-
-        for scope in scopes:
-            if scope not in VALID_SCOPES or scope == "all":
-                continue
-
-            data: Any = None
+        pending = []
+        for repo_name, scope in _scope_keys(scopes):
+            if resume and (repo_name, scope) in resume:
+                behind, msg_json = connection_manager.missed_update(
+                    repo_name, scope, resume[(repo_name, scope)]
+                )
+                if not behind:
+                    continue
+                if msg_json is not None:
+                    await websocket.send_text(msg_json)
+                    continue
+            pending.append((repo_name, scope))
 
-            if scope == "agents":
-                agents_data = _runtime_reader.get_agents()
-                data = []
-                for a in agents_data:
-                    # Parse capabilities and session_meta
-                    capabilities = []
-                    if a.get("capabilities"):
-                        try:
-                            capabilities = json.loads(a.get("capabilities") or "[]")
-                        except (json.JSONDecodeError, TypeError):
-                            capabilities = (a.get("capabilities") or "").split(",")
+        async for _, msg_json in _initial_updates(pending):
+            await websocket.send_text(msg_json)
 
-                    session_meta = None
-                    if a.get("session_meta"):
-                        try:
-                            session_meta = json.loads(a.get("session_meta") or "null")
-                        except (json.JSONDecodeError, TypeError):
-                            pass
+    async def _replay_history(
+        websocket: WebSocket, client_id: str, repo: Repo, request: WSReplayMessage
+    ) -> None:
+        """Stream recorded history to one client at an adjustable pace.
 
-                    # Determine status based on last_seen_at (schema: 15min idle, 60min offline)
-                    status = "offline"
-                    if a.get("last_seen_at"):
-                        try:
-                            last_seen_str = a.get("last_seen_at") or ""
-                            last_seen = datetime.fromisoformat(last_seen_str.replace("Z", "+00:00"))
-                            elapsed_seconds = (
-                                datetime.utcnow().replace(tzinfo=None)
-                                - last_seen.replace(tzinfo=None)
-                            ).total_seconds()
-                            if elapsed_seconds < 900:  # 15 minutes
-                                status = "online"
-                            elif elapsed_seconds < 3600:  # 60 minutes
-                                status = "idle"
-                        except Exception:
-                            pass
-
-                    data.append(
-                        Agent(
-                            id=a.get("agent_id", ""),
-                            displayName=a.get("display_name"),
-                            role=a.get("role"),
-                            status=status,
-                            lastSeenAt=a.get("last_seen_at"),
-                            registeredAt=a.get("created_at"),
-                            capabilities=capabilities,
-                            sessionMeta=session_meta,
-                        ).model_dump(mode="json", by_alias=True)
-                    )
+        History is read page by page on the reader pool and pacing sleeps happen
+        in this client's own task, so live broadcasts to other clients are never
+        held up by a replay.
 
-            elif scope == "tasks":
-                data = [
-                    t.model_dump(mode="json", by_alias=True) for t in _spec_reader.get_tasks_typed()
-                ]
-
-            elif scope == "leases":
-                leases_data = _runtime_reader.get_leases(include_expired=False)
-                data = [
-                    Lease(
-                        leaseId=lease.get("lease_id", ""),
-                        taskId=lease.get("task_id", ""),
-                        agentId=lease.get("agent_id", ""),
-                        expiresAt=lease.get("expires_at") or datetime.utcnow(),
-                        ttlSeconds=900,
-                        createdAt=lease.get("created_at") or datetime.utcnow(),
-                    ).model_dump(mode="json", by_alias=True)
-                    for lease in leases_data
-                ]
-
-            elif scope == "messages":
-                messages_data = _runtime_reader.get_messages(limit=50, unread_only=False)
-                data = []
-                for m in messages_data:
-                    # Parse meta
-                    meta = {}
-                    if m.get("meta"):
-                        try:
-                            meta = json.loads(m.get("meta") or "{}")
-                        except (json.JSONDecodeError, TypeError):
-                            pass
+        Args:
+            websocket: WebSocket connection
+            client_id: Client ID (live updates are paused for it meanwhile)
+            repo: Repository whose history is replayed
+            request: Validated replay request
+        """
+        store = repo.history_store
+        if store is None:
+            return
 
-                    # Parse read_by array
-                    read_by = []
-                    if m.get("read_by"):
-                        try:
-                            read_by = json.loads(m.get("read_by") or "[]")
-                        except (json.JSONDecodeError, TypeError):
-                            read_by = []
-
-                    data.append(
-                        Message(
-                            id=m.get("message_id", ""),
-                            createdAt=m.get("created_at") or datetime.utcnow(),
-                            **{"from": m.get("from_agent_id", "")},
-                            taskId=(m.get("to_id") or "") if m.get("to_type") == "task" else "",
-                            body=m.get("text", ""),
-                            readBy=read_by,
-                            subject=meta.get("subject"),
-                            severity=meta.get("severity"),
-                        ).model_dump(mode="json", by_alias=True)
-                    )
+        start = _as_utc(request.start).timestamp()
+        end = _as_utc(request.end or datetime.now(UTC)).timestamp()
+        await connection_manager.set_replaying(client_id, True)
+        try:
+            try:
+                pool = _get_reader_pool()
+                state = await pool.run(store.state_at, start, single_flight=False)
+                newest_first = await pool.run(
+                    store.events_before, start, REPLAY_EVENT_WINDOW, single_flight=False
+                )
+                recent = deque(reversed(newest_first), maxlen=REPLAY_EVENT_WINDOW)
+                spec_tasks = {
+                    t.id: t
+                    for t in await pool.run(repo.spec_reader.get_tasks_typed, single_flight=False)
+                }
 
-            elif scope == "events":
-                events_data = _runtime_reader.get_events(limit=100, event_type=None)
-                data = []
-                for e in events_data:
-                    payload = e.get("data", {})
-                    if isinstance(payload, str):
-                        try:
-                            payload = json.loads(payload)
-                        except (json.JSONDecodeError, TypeError):
-                            payload = {}
-
-                    data.append(
-                        Event(
-                            id=e.get("event_id", 0),
-                            createdAt=e.get("created_at") or datetime.utcnow(),
-                            type=e.get("event_type", ""),
-                            actorAgentId=e.get("agent_id"),
-                            taskId=e.get("task_id"),
-                            targetAgentId=e.get("target_agent_id"),
-                            correlationId=e.get("correlation_id"),
-                            payload=payload,
-                        ).model_dump(mode="json", by_alias=True)
+                started = {
+                    "type": "replay_started",
+                    "repo": repo.name,
+                    "from": datetime.fromtimestamp(start, UTC).isoformat(),
+                    "to": datetime.fromtimestamp(end, UTC).isoformat(),
+                    "speed": request.speed,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+                await websocket.send_text(json.dumps(started))
+                for scope in REPLAY_SCOPES:
+                    await _send_replay_scope(
+                        websocket, repo, scope, state, recent, spec_tasks, start
                     )
 
-            if data is not None:
-                msg = WSUpdateMessage(
-                    type="update", scope=scope, data=data, timestamp=datetime.utcnow()
+                frames = store.timeline(start, end)
+                previous = start
+                while True:
+                    frame = await pool.run(next, frames, None, single_flight=False)
+                    if frame is None:
+                        break
+                    ts, changes, events = frame
+
+                    delay = min((ts - previous) / request.speed, MAX_REPLAY_GAP_SECONDS)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    previous = ts
+
+                    changed = set()
+                    for scope, key, value in changes:
+                        apply_change(state, scope, key, value)
+                        changed.add(scope)
+                    if events:
+                        recent.extend(events)
+                        changed.add("events")
+                    # Leases expire with time even without a recorded change
+                    changed.add("leases")
+
+                    for scope in REPLAY_SCOPES:
+                        if scope in changed:
+                            await _send_replay_scope(
+                                websocket, repo, scope, state, recent, spec_tasks, ts
+                            )
+
+                complete = {"type": "replay_complete", "timestamp": datetime.utcnow().isoformat()}
+                await websocket.send_text(json.dumps(complete))
+            except (OSError, sqlite3.Error, ReadDeadlineError) as e:
+                error_msg = WSErrorMessage(
+                    type="error", error=f"Replay failed: {e}", timestamp=datetime.utcnow()
                 )
-                await websocket.send_text(msg.model_dump_json())
+                await websocket.send_text(error_msg.model_dump_json())
+            finally:
+                await connection_manager.set_replaying(client_id, False)
+
+            # Return the client to live data
+            subscriptions = await connection_manager.get_subscriptions(client_id)
+            await _send_initial_data(websocket, subscriptions)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # Client went away mid-replay
+        except Exception:
+            logger.exception("History replay for client %s failed", client_id)
+
+    async def _send_replay_scope(
+        websocket: WebSocket,
+        repo: Repo,
+        scope: str,
+        state: State,
+        recent_events: deque[dict[str, Any]],
+        spec_tasks: dict[str, Task],
+        ts: float,
+    ) -> None:
+        """Send one scope of a replayed state, stamped with its historical time."""
+        at = datetime.fromtimestamp(ts, UTC)
+        data: list[Any]
+        if scope == "agents":
+            data = [a.model_dump(mode="json", by_alias=True) for a in _history_agents(state, at)]
+        elif scope == "leases":
+            data = [
+                lease.model_dump(mode="json", by_alias=True) for lease in _history_leases(state, at)
+            ]
+        elif scope == "tasks":
+            # Task definitions come from the current spec; only statuses are recorded
+            data = []
+            for task_id, status in state["tasks"].items():
+                task = spec_tasks.get(task_id)
+                if task is not None:
+                    task = task.model_copy(update={"status": status})
+                else:
+                    task = Task(
+                        id=task_id,
+                        title=task_id,
+                        description="",
+                        status=status,
+                        priority=999,
+                        createdAt=None,
+                        updatedAt=None,
+                        prdSource=None,
+                    )
+                data.append(task.model_dump(mode="json", by_alias=True))
+        else:
+            data = [
+                _event_from_row(e).model_dump(mode="json", by_alias=True)
+                for e in reversed(recent_events)
+            ]
+
+        msg = WSUpdateMessage(
+            type="replay", scope=scope, repo=repo.name, data=data, version=None, timestamp=at
+        )
+        await websocket.send_text(msg.model_dump_json())
 
     # SPA catch-all route - must be defined after all API routes
     # This serves index.html for any non-API, non-static path (client-side routing)
@@ -1012,8 +2723,17 @@ def create_app() -> FastAPI:
     return app
 
 
-# Create the app instance
-app = create_app()
+# The app served as ``lsspy.server:app``, created on first access: importing
+# this module (the CLI does, to configure it) should not build an app
+app: FastAPI
+
+
+def __getattr__(name: str) -> Any:
+    """Create the module-level ``app`` the first time it is accessed."""
+    if name == "app":
+        instance = globals()["app"] = create_app()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Async event loop reference for cross-thread broadcasting
@@ -1034,24 +2754,30 @@ def set_event_loop(loop: asyncio.AbstractEventLoop) -> None:
 _background_tasks: set[asyncio.Task[Any]] = set()
 
 
-def trigger_broadcast() -> None:
+def trigger_broadcast(repo_name: str | None = None) -> None:
     """Trigger a broadcast to all WebSocket clients.
 
     This function is safe to call from a synchronous context (like file watcher callbacks).
     It schedules the broadcast on the event loop.
+
+    Args:
+        repo_name: Repository that changed (defaults to the default one)
     """
     if _event_loop is None or _shutting_down:
         return
+    triggered_at = time.monotonic()
 
     def schedule() -> None:
-        task = asyncio.create_task(connection_manager.broadcast_all())
+        task = asyncio.create_task(connection_manager.broadcast_all(repo_name, triggered_at))
         _background_tasks.add(task)
         task.add_done_callback(_background_tasks.discard)
 
-    try:
-        _event_loop.call_soon_threadsafe(schedule)
-    except Exception:
-        pass
+    # The callback, and the task it creates, inherit the current span
+    with tracing.span("trigger_broadcast", repo=repo_name):
+        try:
+            _event_loop.call_soon_threadsafe(schedule)
+        except Exception:
+            pass
 
 
 def get_connection_count() -> int:
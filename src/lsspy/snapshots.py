@@ -0,0 +1,208 @@
+"""Memory-mapped store of pre-encoded scope snapshots shared between processes.
+
+In multi-worker mode the leader writes each encoded scope message once into
+a memory-mapped file; worker processes map the same files and read the bytes
+directly instead of receiving a copy over the fan-out channel or re-reading
+``runtime.sqlite`` and ``spec.yaml`` themselves.
+
+Every key (``repo:scope``) has its own file laid out as::
+
+    seq (u64) | version (u64) | length (u64) | payload
+
+and is guarded by a seqlock: the writer makes ``seq`` odd before touching the
+payload and even again afterwards, and a reader only accepts a copy taken
+while ``seq`` was even and unchanged, so it never sees a torn snapshot. Files
+only ever grow; a reader whose mapping is too short for the current payload
+maps the file again.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+# Environment variable pointing worker processes at the leader's store
+SNAPSHOT_DIR_ENV = "LSSPY_SNAPSHOT_DIR"
+
+_HEADER = struct.Struct("<QQQ")
+_SEQ = struct.Struct("<Q")
+_INITIAL_CAPACITY = 64 * 1024
+
+
+def default_snapshot_dir() -> Path:
+    """Create a private directory for a snapshot store, in RAM where possible.
+
+    Returns:
+        New directory (under /dev/shm when available)
+    """
+    shm = "/dev/shm"
+    parent = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+    return Path(tempfile.mkdtemp(prefix="lsspy-snapshots-", dir=parent))
+
+
+class SnapshotStore:
+    """Versioned snapshots in memory-mapped files, one writer and many readers."""
+
+    def __init__(self, directory: Path, readonly: bool = False) -> None:
+        """Initialize the store.
+
+        Args:
+            directory: Directory holding the snapshot files
+            readonly: Open for reading only (worker processes)
+        """
+        self.directory = directory
+        self.readonly = readonly
+        self._maps: dict[str, mmap.mmap] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        """Get the file backing a key."""
+        return self.directory / f"{quote(key, safe='')}.snap"
+
+    def _map(self, key: str, size: int = 0) -> mmap.mmap | None:
+        """Map a key's file, growing it to at least ``size`` bytes when writing."""
+        current = self._maps.get(key)
+        if current is not None and len(current) >= size:
+            return current
+
+        path = self._path(key)
+        if self.readonly:
+            try:
+                with open(path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                return None  # Not written yet (or still empty)
+        else:
+            capacity = max(_INITIAL_CAPACITY, len(current) if current is not None else 0)
+            while capacity < size:
+                capacity *= 2
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size < capacity:
+                    os.ftruncate(fd, capacity)
+                mapped = mmap.mmap(fd, capacity)
+            finally:
+                os.close(fd)
+
+        if current is not None:
+            current.close()
+        self._maps[key] = mapped
+        return mapped
+
+    def write(self, key: str, payload: bytes) -> int:
+        """Publish a new snapshot for a key.
+
+        Args:
+            key: Snapshot key (``repo:scope``)
+            payload: Encoded snapshot
+
+        Returns:
+            Version of the new snapshot (starting at 1)
+
+        Raises:
+            PermissionError: If the store was opened read-only
+        """
+        if self.readonly:
+            raise PermissionError("Snapshot store is read-only")
+
+        with self._lock:
+            mapped = self._map(key, _HEADER.size)
+            assert mapped is not None
+            seq, version, _ = _HEADER.unpack_from(mapped, 0)
+
+            # Odd sequence: readers retry until the write is complete
+            _SEQ.pack_into(mapped, 0, seq + 1)
+            end = _HEADER.size + len(payload)
+            if end > len(mapped):
+                mapped = self._map(key, end)
+                assert mapped is not None
+            mapped[_HEADER.size : end] = payload
+            _HEADER.pack_into(mapped, 0, seq + 1, version + 1, len(payload))
+            _SEQ.pack_into(mapped, 0, seq + 2)
+            return int(version + 1)
+
+    def read(self, key: str, timeout: float = 1.0) -> tuple[int, bytes] | None:
+        """Read the current snapshot for a key.
+
+        Args:
+            key: Snapshot key (``repo:scope``)
+            timeout: Give up if no consistent copy could be taken for this long
+
+        Returns:
+            Tuple of (version, payload), or None if the key has no snapshot
+            (or the writer held it for longer than the timeout)
+        """
+        deadline = time.monotonic() + timeout
+        attempts = 0
+        while True:
+            # The lock is not held while waiting, so other keys stay readable
+            with self._lock:
+                done, snapshot = self._read_once(key)
+            if done:
+                return snapshot
+
+            attempts += 1
+            if time.monotonic() > deadline:
+                return None
+            # Spin briefly, then yield while the writer finishes
+            time.sleep(0 if attempts < 100 else 0.0005)
+
+    def _read_once(self, key: str) -> tuple[bool, tuple[int, bytes] | None]:
+        """Try to copy a key's snapshot (with the lock held).
+
+        Returns:
+            Tuple of (done, snapshot), where done is False while a write is
+            in progress
+        """
+        while True:
+            mapped = self._map(key)
+            if mapped is None or len(mapped) < _HEADER.size:
+                return True, None
+
+            seq, version, length = _HEADER.unpack_from(mapped, 0)
+            if seq % 2 == 1:
+                return False, None
+            if version == 0:
+                return True, None
+            end = _HEADER.size + length
+            if end > len(mapped):
+                # The writer grew the file: map it again
+                self._maps.pop(key).close()
+                continue
+            payload = mapped[_HEADER.size : end]
+            if _SEQ.unpack_from(mapped, 0)[0] != seq:
+                return False, None
+            return True, (int(version), payload)
+
+    def version(self, key: str) -> int:
+        """Get the current version of a key without copying its payload.
+
+        Args:
+            key: Snapshot key (``repo:scope``)
+
+        Returns:
+            Snapshot version (0 if the key has no snapshot)
+        """
+        with self._lock:
+            mapped = self._map(key)
+            if mapped is None or len(mapped) < _HEADER.size:
+                return 0
+            return int(_HEADER.unpack_from(mapped, 0)[1])
+
+    def close(self, remove: bool = False) -> None:
+        """Unmap every file.
+
+        Args:
+            remove: Also delete the store directory (the writer's job)
+        """
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+        if remove:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,7 @@
+"""lsspy-owned sidecar stores kept next to Lodestar data."""
+
+from lsspy.stores.history import HistoryStore
+from lsspy.stores.rollups import EventRollupStore
+from lsspy.stores.sidecar import SidecarDatabase, sidecar_dir
+
+__all__ = ["EventRollupStore", "HistoryStore", "SidecarDatabase", "sidecar_dir"]
@@ -0,0 +1,420 @@
+"""Append-only history of agents, leases, task statuses and events."""
+
+import json
+import sqlite3
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from datetime import UTC
+from pathlib import Path
+from typing import Any
+
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.stores.sidecar import SidecarDatabase, parse_timestamp
+
+# Scopes captured by the recorder; each maps entity keys to JSON-able values
+HISTORY_SCOPES = ("agents", "leases", "tasks")
+
+State = dict[str, dict[str, Any]]
+
+# One step of a replay: (timestamp, entity changes, new event rows)
+Frame = tuple[float, list[tuple[str, str, Any]], list[dict[str, Any]]]
+
+
+def _empty_state() -> State:
+    """Create an empty history state."""
+    return {scope: {} for scope in HISTORY_SCOPES}
+
+
+def diff_states(old: State, new: State) -> list[tuple[str, str, Any]]:
+    """Compute the entity-level changes between two states.
+
+    Args:
+        old: Previously recorded state
+        new: Current state; scopes missing from it are treated as unchanged
+
+    Returns:
+        List of ``(scope, key, value)`` tuples; value is None for removals
+    """
+    changes: list[tuple[str, str, Any]] = []
+    for scope in HISTORY_SCOPES:
+        if scope not in new:
+            continue
+        before = old.get(scope, {})
+        after = new.get(scope, {})
+        for key, value in after.items():
+            if before.get(key) != value:
+                changes.append((scope, key, value))
+        for key in before.keys() - after.keys():
+            changes.append((scope, key, None))
+    return changes
+
+
+class HistoryStore(SidecarDatabase):
+    """Durable history of runtime state as compact diffs plus checkpoints.
+
+    Every ``record`` call appends only the entities that changed since the
+    previous call. A full checkpoint of the state is written every
+    ``checkpoint_every`` changes so ``state_at`` can start from the nearest
+    checkpoint instead of replaying the log from the beginning. Runtime events
+    are copied alongside, indexed by their creation time, for replays.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_changes_ts ON changes (ts);
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            seq INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_checkpoints_ts ON checkpoints (ts);
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+        CREATE TABLE IF NOT EXISTS history_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        checkpoint_every: int = 500,
+        retention_days: float | None = None,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            db_path: Path to the history database file
+            checkpoint_every: Write a full checkpoint after this many changes
+            retention_days: Compact history older than this many days into a
+                single checkpoint (None keeps everything)
+        """
+        super().__init__(db_path)
+        self.checkpoint_every = checkpoint_every
+        self.retention_days = retention_days
+        self._current: State | None = None
+        self._since_checkpoint = 0
+
+    def record(self, state: State, ts: float | None = None) -> int:
+        """Append the changes between the last recorded state and ``state``.
+
+        Args:
+            state: Current state keyed by scope, then entity key; scopes that
+                could not be captured may be left out
+            ts: Capture time as a Unix timestamp (defaults to now)
+
+        Returns:
+            Number of changes appended
+        """
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            conn = self._connect()
+            try:
+                if self._current is None:
+                    # First record after startup: continue from what is on disk
+                    self._current, self._since_checkpoint = _rebuild(conn)
+
+                changes = diff_states(self._current, state)
+                if not changes:
+                    return 0
+
+                conn.executemany(
+                    "INSERT INTO changes (ts, scope, key, value) VALUES (?, ?, ?, ?)",
+                    [
+                        (ts, scope, key, None if value is None else json.dumps(value))
+                        for scope, key, value in changes
+                    ],
+                )
+                for scope in HISTORY_SCOPES:
+                    if scope in state:
+                        self._current[scope] = dict(state[scope])
+                self._since_checkpoint += len(changes)
+
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self._write_checkpoint(conn, ts, self._current)
+                    self._since_checkpoint = 0
+                    if self.retention_days is not None:
+                        self._compact(conn, ts - self.retention_days * 86400)
+                conn.commit()
+                return len(changes)
+            finally:
+                conn.close()
+
+    def record_events(self, runtime_reader: RuntimeReader, batch_size: int = 5000) -> int:
+        """Copy events added to runtime.sqlite since the last call.
+
+        Args:
+            runtime_reader: Reader for the monitored runtime.sqlite
+            batch_size: Number of events read per batch
+
+        Returns:
+            Number of events copied
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM history_state WHERE key = 'last_event_id'"
+                ).fetchone()
+                cursor = int(row["value"]) if row else 0
+                max_event_id = runtime_reader.get_max_event_id()
+                if max_event_id is None:
+                    return 0
+                # runtime.sqlite was recreated; keep what was copied and start over
+                if max_event_id < cursor:
+                    cursor = 0
+
+                copied = 0
+                while True:
+                    events = runtime_reader.get_events_since(cursor, limit=batch_size)
+                    if not events:
+                        break
+                    rows = []
+                    for event in events:
+                        created = parse_timestamp(event.get("created_at"))
+                        if created is not None:
+                            ts = created.replace(tzinfo=UTC).timestamp()
+                            rows.append((ts, json.dumps(event)))
+                    conn.executemany("INSERT INTO events (ts, data) VALUES (?, ?)", rows)
+                    cursor = int(events[-1]["event_id"])
+                    copied += len(rows)
+                    if len(events) < batch_size:
+                        break
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO history_state (key, value) VALUES ('last_event_id', ?)",
+                    (cursor,),
+                )
+                conn.commit()
+                return copied
+            finally:
+                conn.close()
+
+    def events_before(self, ts: float, limit: int = 100) -> list[dict[str, Any]]:
+        """Get the most recent recorded events at a point in time.
+
+        Args:
+            ts: Unix timestamp
+            limit: Maximum number of events
+
+        Returns:
+            Event rows, newest first (like ``RuntimeReader.get_events``)
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM events WHERE ts <= ? ORDER BY ts DESC, id DESC LIMIT ?",
+                (ts, limit),
+            ).fetchall()
+            return [json.loads(row["data"]) for row in rows]
+        finally:
+            conn.close()
+
+    def timeline(self, start: float, end: float, page_size: int = 500) -> Iterator[Frame]:
+        """Iterate recorded history between two points in time.
+
+        Changes and events are read page by page (each page on its own
+        connection), so the iterator can be advanced from different threads.
+
+        Args:
+            start: Exclusive Unix start timestamp
+            end: Inclusive Unix end timestamp
+            page_size: Rows fetched per query
+
+        Yields:
+            Frames of ``(ts, changes, events)`` in time order
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT MAX(seq) AS seq FROM changes WHERE ts <= ?", (start,)
+            ).fetchone()
+        finally:
+            conn.close()
+        change_cursor = row["seq"] or 0
+        # (ts, id) of the last event read; events at exactly ``start`` belong
+        # to the starting state, so the id bound excludes them initially
+        event_cursor = (start, sys.maxsize)
+        changes: deque[tuple[float, str, str, Any]] = deque()
+        events: deque[tuple[float, dict[str, Any]]] = deque()
+        changes_done = events_done = False
+
+        while True:
+            if not changes and not changes_done:
+                conn = self._connect()
+                try:
+                    page = conn.execute(
+                        "SELECT seq, ts, scope, key, value FROM changes "
+                        "WHERE seq > ? AND ts <= ? ORDER BY seq LIMIT ?",
+                        (change_cursor, end, page_size),
+                    ).fetchall()
+                finally:
+                    conn.close()
+                for change in page:
+                    value = None if change["value"] is None else json.loads(change["value"])
+                    changes.append((change["ts"], change["scope"], change["key"], value))
+                change_cursor = page[-1]["seq"] if page else change_cursor
+                changes_done = len(page) < page_size
+
+            if not events and not events_done:
+                conn = self._connect()
+                try:
+                    page = conn.execute(
+                        "SELECT id, ts, data FROM events WHERE (ts > ? OR (ts = ? AND id > ?)) "
+                        "AND ts <= ? ORDER BY ts, id LIMIT ?",
+                        (event_cursor[0], event_cursor[0], event_cursor[1], end, page_size),
+                    ).fetchall()
+                finally:
+                    conn.close()
+                for event in page:
+                    events.append((event["ts"], json.loads(event["data"])))
+                event_cursor = (page[-1]["ts"], page[-1]["id"]) if page else event_cursor
+                events_done = len(page) < page_size
+
+            if not changes and not events:
+                return
+
+            frame_ts = min(buf[0][0] for buf in (changes, events) if buf)
+            frame_changes = []
+            while changes and changes[0][0] == frame_ts:
+                _, scope, key, value = changes.popleft()
+                frame_changes.append((scope, key, value))
+            frame_events = []
+            while events and events[0][0] == frame_ts:
+                frame_events.append(events.popleft()[1])
+            yield frame_ts, frame_changes, frame_events
+
+    def state_at(self, ts: float) -> State:
+        """Reconstruct the recorded state at a point in time.
+
+        Args:
+            ts: Unix timestamp
+
+        Returns:
+            State keyed by scope, then entity key
+        """
+        conn = self._connect()
+        try:
+            state, _ = _rebuild(conn, "ts", ts)
+            return state
+        finally:
+            conn.close()
+
+    def compact(self, before: float) -> int:
+        """Fold all history before a point in time into one checkpoint.
+
+        History before ``before`` is no longer available afterwards:
+        ``state_at`` returns an empty state for earlier timestamps.
+
+        Args:
+            before: Unix timestamp of the compaction horizon
+
+        Returns:
+            Number of change rows removed
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                removed = self._compact(conn, before)
+                conn.commit()
+                return removed
+            finally:
+                conn.close()
+
+    def _compact(self, conn: sqlite3.Connection, before: float) -> int:
+        """Compact history older than ``before`` using an open connection."""
+        row = conn.execute(
+            "SELECT MAX(seq) AS seq FROM changes WHERE ts <= ?", (before,)
+        ).fetchone()
+        horizon = row["seq"] if row else None
+        if horizon is None:
+            return 0
+
+        # Materialize the state at the horizon before dropping what led to it
+        state, _ = _rebuild(conn, "seq", horizon)
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (seq, ts, state) VALUES (?, ?, ?)",
+            (horizon, before, json.dumps(state)),
+        )
+        conn.execute("DELETE FROM checkpoints WHERE seq < ?", (horizon,))
+        conn.execute("DELETE FROM events WHERE ts < ?", (before,))
+        removed = conn.execute("DELETE FROM changes WHERE seq <= ?", (horizon,)).rowcount
+        return int(removed)
+
+    def _write_checkpoint(self, conn: sqlite3.Connection, ts: float, state: State) -> None:
+        """Write a full checkpoint at the newest change."""
+        row = conn.execute("SELECT MAX(seq) AS seq FROM changes").fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (seq, ts, state) VALUES (?, ?, ?)",
+            (row["seq"] or 0, ts, json.dumps(state)),
+        )
+
+
+def apply_change(state: State, scope: str, key: str, value: Any) -> None:
+    """Apply one decoded change to a state in place.
+
+    Args:
+        state: State to update
+        scope: Scope of the changed entity
+        key: Entity key
+        value: New value, or None if the entity was removed
+    """
+    entities = state.setdefault(scope, {})
+    if value is None:
+        entities.pop(key, None)
+    else:
+        entities[key] = value
+
+
+def _apply_change(state: State, scope: str, key: str, value: str | None) -> None:
+    """Apply one stored (JSON-encoded) change row to a state in place."""
+    apply_change(state, scope, key, None if value is None else json.loads(value))
+
+
+def _rebuild(
+    conn: sqlite3.Connection, column: str | None = None, bound: float | None = None
+) -> tuple[State, int]:
+    """Reconstruct a state from the nearest checkpoint plus later changes.
+
+    Args:
+        conn: Open history database connection
+        column: Bound the reconstruction by ``"ts"`` or ``"seq"`` (None = latest)
+        bound: Inclusive upper bound for ``column``
+
+    Returns:
+        Tuple of (state, number of changes applied on top of the checkpoint)
+    """
+    limit = f"AND {column} <= ?" if column else ""
+    params: tuple[Any, ...] = (bound,) if column else ()
+
+    row = conn.execute(
+        f"SELECT seq, state FROM checkpoints WHERE 1 = 1 {limit} ORDER BY seq DESC LIMIT 1",
+        params,
+    ).fetchone()
+    state = _empty_state()
+    start_seq = 0
+    if row:
+        state.update(json.loads(row["state"]))
+        start_seq = row["seq"]
+
+    applied = 0
+    for change in conn.execute(
+        f"SELECT scope, key, value FROM changes WHERE seq > ? {limit} ORDER BY seq",
+        (start_seq, *params),
+    ):
+        _apply_change(state, change["scope"], change["key"], change["value"])
+        applied += 1
+    return state, applied
@@ -0,0 +1,239 @@
+"""Time-bucketed event rollups for historical charts."""
+
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.stores.sidecar import SidecarDatabase, parse_timestamp, to_naive_utc
+
+# Supported bucket sizes
+RESOLUTIONS = ("minute", "hour", "day")
+
+# Columns a timeseries can be grouped by (None = total per bucket)
+GROUP_BY_COLUMNS: dict[str, str | None] = {
+    "event_type": "event_type",
+    "agent": "agent_id",
+    "task": "task_id",
+    "none": None,
+}
+
+BUCKET_FORMAT = "%Y-%m-%dT%H:%M:00Z"
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Truncate a timestamp to the start of its bucket.
+
+    Args:
+        timestamp: Timestamp (naive values are assumed to be UTC)
+        resolution: One of minute/hour/day
+
+    Returns:
+        Start of the bucket containing the timestamp, as naive UTC
+    """
+    timestamp = to_naive_utc(timestamp).replace(second=0, microsecond=0)
+    if resolution in ("hour", "day"):
+        timestamp = timestamp.replace(minute=0)
+    if resolution == "day":
+        timestamp = timestamp.replace(hour=0)
+    return timestamp
+
+
+def format_bucket(timestamp: datetime) -> str:
+    """Format a timestamp the way bucket keys are stored."""
+    return to_naive_utc(timestamp).strftime(BUCKET_FORMAT)
+
+
+class EventRollupStore(SidecarDatabase):
+    """Per-minute/hour/day event counts by type, agent and task.
+
+    The store lives in lsspy's sidecar directory and is updated incrementally
+    from the newest ``event_id`` it has already folded in, so each update only
+    reads events appended since the previous one.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rollups (
+            resolution TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            agent_id TEXT NOT NULL DEFAULT '',
+            task_id TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (resolution, bucket, event_type, agent_id, task_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = 5000,
+        minute_retention_days: int | None = 14,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            db_path: Path to the rollup database file
+            batch_size: Number of events read from runtime.sqlite per batch
+            minute_retention_days: Drop per-minute buckets older than this many
+                days (None keeps them forever); hour and day buckets are kept
+        """
+        super().__init__(db_path)
+        self.batch_size = batch_size
+        self.minute_retention_days = minute_retention_days
+
+    @property
+    def last_event_id(self) -> int:
+        """Newest event ID folded into the rollups."""
+        conn = self._connect()
+        try:
+            return self._get_cursor(conn)
+        finally:
+            conn.close()
+
+    def update(self, runtime_reader: RuntimeReader) -> int:
+        """Fold events added since the last update into the rollups.
+
+        Args:
+            runtime_reader: Reader for the monitored runtime.sqlite
+
+        Returns:
+            Number of events processed
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                cursor = self._get_cursor(conn)
+                max_event_id = runtime_reader.get_max_event_id()
+                if max_event_id is None:
+                    return 0
+
+                # runtime.sqlite was recreated: the cursor points past its end
+                if max_event_id < cursor:
+                    conn.execute("DELETE FROM rollups")
+                    cursor = 0
+
+                processed = 0
+                newest: datetime | None = None
+                while True:
+                    events = runtime_reader.get_events_since(cursor, limit=self.batch_size)
+                    if not events:
+                        break
+
+                    counts: Counter[tuple[str, str, str, str, str]] = Counter()
+                    for event in events:
+                        created = parse_timestamp(event.get("created_at"))
+                        if created is None:
+                            continue
+                        newest = created if newest is None else max(newest, created)
+                        event_type = event.get("event_type") or ""
+                        agent_id = event.get("agent_id") or ""
+                        task_id = event.get("task_id") or ""
+                        for resolution in RESOLUTIONS:
+                            bucket = format_bucket(bucket_start(created, resolution))
+                            counts[(resolution, bucket, event_type, agent_id, task_id)] += 1
+
+                    conn.executemany(
+                        """INSERT INTO rollups
+                               (resolution, bucket, event_type, agent_id, task_id, count)
+                           VALUES (?, ?, ?, ?, ?, ?)
+                           ON CONFLICT (resolution, bucket, event_type, agent_id, task_id)
+                           DO UPDATE SET count = count + excluded.count""",
+                        [(*key, n) for key, n in counts.items()],
+                    )
+                    cursor = int(events[-1]["event_id"])
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rollup_state (key, value) "
+                        "VALUES ('last_event_id', ?)",
+                        (cursor,),
+                    )
+                    conn.commit()
+                    processed += len(events)
+
+                    if len(events) < self.batch_size:
+                        break
+
+                if newest is not None and self.minute_retention_days is not None:
+                    cutoff = newest - timedelta(days=self.minute_retention_days)
+                    conn.execute(
+                        "DELETE FROM rollups WHERE resolution = 'minute' AND bucket < ?",
+                        (format_bucket(cutoff),),
+                    )
+                conn.commit()
+                return processed
+            finally:
+                conn.close()
+
+    def query(
+        self,
+        resolution: str = "hour",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        group_by: str = "event_type",
+        event_type: str | None = None,
+        agent_id: str | None = None,
+        task_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Read a timeseries from the rollups.
+
+        Args:
+            resolution: Bucket size (minute/hour/day)
+            since: Only buckets starting at or after this time
+            until: Only buckets starting before this time
+            group_by: Series key (event_type/agent/task/none)
+            event_type: Filter by event type
+            agent_id: Filter by acting agent
+            task_id: Filter by task
+
+        Returns:
+            List of ``{"bucket", "key", "count"}`` dictionaries ordered by bucket
+
+        Raises:
+            ValueError: If resolution or group_by is unknown
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        if group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Unknown group_by: {group_by}")
+
+        column = GROUP_BY_COLUMNS[group_by]
+        key_expr = column if column else "NULL"
+        where = ["resolution = ?"]
+        params: list[Any] = [resolution]
+        if since is not None:
+            where.append("bucket >= ?")
+            params.append(format_bucket(bucket_start(since, resolution)))
+        if until is not None:
+            where.append("bucket < ?")
+            params.append(format_bucket(until))
+        filters = (("event_type", event_type), ("agent_id", agent_id), ("task_id", task_id))
+        for col, value in filters:
+            if value is not None:
+                where.append(f"{col} = ?")
+                params.append(value)
+
+        sql = (
+            f"SELECT bucket, {key_expr} AS key, SUM(count) AS count FROM rollups "
+            f"WHERE {' AND '.join(where)} GROUP BY bucket, key ORDER BY bucket, key"
+        )
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {"bucket": row["bucket"], "key": row["key"] or None, "count": row["count"]}
+            for row in rows
+        ]
+
+    def _get_cursor(self, conn: sqlite3.Connection) -> int:
+        """Read the last folded event ID using an open connection."""
+        row = conn.execute("SELECT value FROM rollup_state WHERE key = 'last_event_id'").fetchone()
+        return int(row["value"]) if row else 0
@@ -0,0 +1,93 @@
+"""Shared plumbing for lsspy-owned SQLite sidecar databases."""
+
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Directory (inside .lodestar) holding lsspy's own files. runtime.sqlite is
+# opened read-only, so anything lsspy persists lives here instead.
+SIDECAR_DIRNAME = "lsspy"
+
+
+def sidecar_dir(lodestar_dir: Path) -> Path:
+    """Get the lsspy sidecar directory for a .lodestar directory.
+
+    Args:
+        lodestar_dir: Path to .lodestar directory
+
+    Returns:
+        Path to the sidecar directory (created lazily by the stores)
+    """
+    return lodestar_dir / SIDECAR_DIRNAME
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    """Convert an aware timestamp to naive UTC (naive ones are assumed UTC)."""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(UTC).replace(tzinfo=None)
+    return timestamp
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Parse a Lodestar ISO 8601 timestamp into a naive UTC datetime.
+
+    Args:
+        value: Timestamp string (``Z`` suffix and offsets are accepted)
+
+    Returns:
+        Naive UTC datetime, or None if the value is empty or malformed
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return to_naive_utc(parsed)
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a sidecar directory with a ``.gitignore`` keeping it out of git."""
+    if not path.exists():
+        path.mkdir(parents=True, exist_ok=True)
+        (path / ".gitignore").write_text("*\n")
+
+
+class SidecarDatabase:
+    """Base class for a small read-write SQLite database owned by lsspy."""
+
+    #: DDL executed (idempotently) the first time a connection is opened
+    SCHEMA: str = ""
+
+    def __init__(self, db_path: Path, timeout: float = 5.0) -> None:
+        """Initialize the database wrapper.
+
+        Args:
+            db_path: Path to the sidecar database file
+            timeout: Connection timeout in seconds
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create a database connection, creating the schema if needed.
+
+        Returns:
+            SQLite connection
+
+        Raises:
+            OSError: If the sidecar directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        _ensure_dir(self.db_path.parent)
+        conn = sqlite3.connect(str(self.db_path), timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+            conn.commit()
+            self._schema_ready = True
+        return conn
@@ -0,0 +1,202 @@
+"""Server-Sent Events fan-out for read-only dashboard subscribers.
+
+Subscribers of ``/api/stream`` receive the same pre-encoded update messages
+as WebSocket clients. A subscriber is just a bounded queue: publishing puts
+the already-encoded message on the queues of interested subscribers without
+awaiting any network write, and each response drains its own queue.
+
+Every message is the full current state of its scope, so resuming after a
+reconnect only needs the scopes that changed since the client's last event
+ID, not every message in between.
+"""
+
+import asyncio
+import uuid
+
+# Heartbeat comment interval keeping idle streams (and proxies) alive
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+# Reconnection delay suggested to clients
+STREAM_RETRY_MS = 2000
+
+# Queued messages after which a slow subscriber is disconnected (it resumes
+# from its last event ID when it reconnects)
+STREAM_QUEUE_SIZE = 256
+
+# A queued update: event sequence number, scope and encoded message
+StreamItem = tuple[int, str, str]
+
+
+def format_event(event_id: str, data: str) -> str:
+    """Format one Server-Sent Event.
+
+    Args:
+        event_id: Event ID the client echoes back as ``Last-Event-ID``
+        data: Single-line encoded message
+
+    Returns:
+        Event text including the terminating blank line
+    """
+    return f"id: {event_id}\ndata: {data}\n\n"
+
+
+class StreamSubscriber:
+    """One open event stream and the (repo, scope) keys it follows."""
+
+    def __init__(self, keys: set[tuple[str, str]], queue_size: int = STREAM_QUEUE_SIZE) -> None:
+        """Initialize the subscriber.
+
+        Args:
+            keys: Subscribed (repository name, scope) pairs
+            queue_size: Maximum number of queued messages
+        """
+        self.keys = keys
+        self.queue: asyncio.Queue[StreamItem | None] = asyncio.Queue(queue_size)
+
+
+class StreamHub:
+    """Registry of event stream subscribers with resumable event IDs.
+
+    Event IDs are ``<epoch>-<seq>``: the epoch changes with every process, so
+    an ID from a restarted server (or another worker) triggers a full resync
+    instead of a wrong resume.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the hub."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._changed: dict[tuple[str, str], int] = {}
+        self._subscribers: dict[tuple[str, str], set[StreamSubscriber]] = {}
+        self._count = 0
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest published message."""
+        return self._seq
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open event streams."""
+        return self._count
+
+    def event_id(self, seq: int) -> str:
+        """Format a sequence number as an event ID."""
+        return f"{self.epoch}-{seq}"
+
+    def parse_event_id(self, event_id: str | None) -> int | None:
+        """Get the sequence number of an event ID issued by this hub.
+
+        Args:
+            event_id: ``Last-Event-ID`` sent by a reconnecting client
+
+        Returns:
+            Sequence number, or None if the ID is missing, malformed or from
+            another process
+        """
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def add(self, keys: set[tuple[str, str]]) -> StreamSubscriber:
+        """Register a subscriber.
+
+        Args:
+            keys: (repository name, scope) pairs to follow
+
+        Returns:
+            The subscriber, whose queue receives every later publish
+        """
+        subscriber = StreamSubscriber(keys)
+        for key in keys:
+            self._subscribers.setdefault(key, set()).add(subscriber)
+        self._count += 1
+        return subscriber
+
+    def remove(self, subscriber: StreamSubscriber) -> None:
+        """Unregister a subscriber (no-op if already removed)."""
+        removed = False
+        for key in subscriber.keys:
+            followers = self._subscribers.get(key)
+            if followers is not None and subscriber in followers:
+                removed = True
+                followers.discard(subscriber)
+                if not followers:
+                    del self._subscribers[key]
+        if removed:
+            self._count -= 1
+
+    def keys(self) -> set[tuple[str, str]]:
+        """Get every (repository name, scope) pair followed by some subscriber."""
+        return set(self._subscribers)
+
+    def has_subscribers(self, repo_name: str, scope: str) -> bool:
+        """Check whether any stream follows a repository's scope."""
+        return (repo_name, scope) in self._subscribers
+
+    def stale_keys(self, keys: set[tuple[str, str]], since: int) -> set[tuple[str, str]]:
+        """Get the keys a client resuming after ``since`` has to be sent again.
+
+        Args:
+            keys: Keys the client follows
+            since: Sequence number of the client's last event
+
+        Returns:
+            Keys that changed after ``since`` or whose changes went untracked
+        """
+        return {key for key in keys if self._changed.get(key, since + 1) > since}
+
+    def publish(self, repo_name: str, scope: str, msg_json: str) -> int:
+        """Queue an encoded message for the subscribers following its scope.
+
+        Subscribers whose queue is full are disconnected; they catch up from
+        their last event ID when they reconnect.
+
+        Args:
+            repo_name: Repository the message belongs to
+            scope: Data scope
+            msg_json: Encoded message
+
+        Returns:
+            Number of subscribers the message was queued for
+        """
+        self._seq += 1
+        key = (repo_name, scope)
+        self._changed[key] = self._seq
+        queued = 0
+        for subscriber in list(self._subscribers.get(key, ())):
+            try:
+                subscriber.queue.put_nowait((self._seq, scope, msg_json))
+                queued += 1
+            except asyncio.QueueFull:
+                self._end(subscriber)
+        return queued
+
+    def forget(self, repo_name: str, scope: str | None = None) -> None:
+        """Stop tracking changes of a repository's scopes.
+
+        Called when a change is not published (nobody was following it), so
+        resuming clients resync those scopes instead of missing the change.
+
+        Args:
+            repo_name: Repository name
+            scope: Single scope to forget (every scope of the repository if None)
+        """
+        for key in list(self._changed):
+            if key[0] == repo_name and scope in (None, key[1]):
+                del self._changed[key]
+
+    def _end(self, subscriber: StreamSubscriber) -> None:
+        """Drop a subscriber and wake its stream so it finishes."""
+        self.remove(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def close(self) -> None:
+        """End every open stream (on shutdown)."""
+        for subscriber in {s for followers in self._subscribers.values() for s in followers}:
+            self._end(subscriber)
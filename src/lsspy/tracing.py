@@ -0,0 +1,224 @@
+"""Per-change tracing of the watcher to broadcast pipeline.
+
+A span times one step of handling a file change (event received, debounce
+fired, gather, serialization, delivery) and links to its parent, so all
+steps of one change share a trace ID. The current span lives in a context
+variable: it follows ``call_soon_threadsafe`` and tasks onto the event loop
+and is copied onto reader pool threads.
+
+Tracing is off until an exporter is set. While it is off, ``span()`` returns
+a shared no-op span, so instrumented code costs one global lookup per span.
+"""
+
+import abc
+import json
+import random
+import threading
+import time
+from contextvars import ContextVar, Token
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+_current: ContextVar["Span | None"] = ContextVar("lsspy_current_span", default=None)
+
+
+class SpanExporter(abc.ABC):
+    """Destination of finished spans."""
+
+    @abc.abstractmethod
+    def export(self, span: "Span") -> None:
+        """Record a finished span (called from any thread)."""
+
+    def close(self) -> None:
+        """Release resources held by the exporter."""
+
+
+class JsonLinesExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the exporter.
+
+        Args:
+            path: File to append to (created if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: TextIO | None = path.open("a", encoding="utf-8")
+
+    def export(self, span: "Span") -> None:
+        """Write a span as one line, flushed so the file can be tailed."""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        """Close the file; later spans are dropped."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_exporter: SpanExporter | None = None
+
+
+class Span:
+    """One timed step of a trace; use as a context manager to make it current."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "duration",
+        "attributes",
+        "_started",
+        "_token",
+    )
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict[str, Any]) -> None:
+        """Start a span.
+
+        Args:
+            name: Step name, e.g. ``broadcast.deliver``
+            parent: Enclosing span (a new trace is started if None)
+            attributes: Initial attributes
+        """
+        self.name = name
+        self.trace_id: str = (
+            parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        )
+        self.span_id: str = f"{random.getrandbits(64):016x}"
+        self.parent_id: str | None = parent.span_id if parent is not None else None
+        self.start = time.time()
+        self.duration: float | None = None
+        self.attributes = attributes
+        self._started = time.perf_counter()
+        self._token: Token[Span | None] | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add or replace attributes."""
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter (once)."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the span as a JSON-ready dictionary."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": None if self.duration is None else self.duration * 1000,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        """Make the span current."""
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Restore the previous current span and finish this one."""
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.end()
+
+
+class _NoopSpan(Span):
+    """Span handed out while tracing is off; records nothing."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """Initialize the shared instance."""
+        self.name = ""
+        self.trace_id = ""
+        self.span_id = ""
+        self.parent_id = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.attributes = {}
+
+    def set(self, **attributes: Any) -> None:
+        """Ignore attributes."""
+
+    def end(self) -> None:
+        """Do nothing."""
+
+    def __enter__(self) -> Span:
+        """Do nothing."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Do nothing."""
+
+
+NOOP_SPAN: Span = _NoopSpan()
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Turn tracing on with an exporter, or off with None.
+
+    Args:
+        exporter: Destination of finished spans
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def enabled() -> bool:
+    """Check whether spans are being recorded."""
+    return _exporter is not None
+
+
+def current_span() -> Span | None:
+    """Get the span current in this context, if any."""
+    return _current.get()
+
+
+def span(name: str, parent: Span | None = None, **attributes: Any) -> Span:
+    """Start a span, child of ``parent`` or else of the current span.
+
+    Use it as a context manager to make it current and end it on exit, or
+    call ``end()`` on a span that outlives the block that started it.
+
+    Args:
+        name: Step name
+        parent: Explicit parent, for spans continuing a trace on another thread
+        **attributes: Initial attributes
+
+    Returns:
+        New span, or the shared no-op span while tracing is off
+    """
+    if _exporter is None:
+        return NOOP_SPAN
+    if parent is None or parent is NOOP_SPAN:
+        parent = _current.get()
+    return Span(name, parent, attributes)
@@ -2,6 +2,7 @@
 
 import time
 from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
 from threading import Lock, Thread
 from typing import Any
@@ -10,12 +11,18 @@ from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 from watchdog.observers.polling import PollingObserver
 
+from lsspy import tracing
+
 
 class DebouncedEventHandler(FileSystemEventHandler):
     """File system event handler with debouncing."""
 
     def __init__(
-        self, lodestar_dir: Path, on_change: Callable[[], None], debounce_ms: int = 100
+        self,
+        lodestar_dir: Path,
+        on_change: Callable[[], None],
+        debounce_ms: int = 100,
+        executor: Executor | None = None,
     ) -> None:
         """Initialize the handler.
 
@@ -23,6 +30,7 @@ class DebouncedEventHandler(FileSystemEventHandler):
             lodestar_dir: Path to .lodestar directory
             on_change: Callback to invoke when files change
             debounce_ms: Debounce period in milliseconds
+            executor: Pool running the debounce waits (a thread per wait if None)
         """
         self.lodestar_dir = lodestar_dir
         self.on_change = on_change
@@ -35,7 +43,12 @@ class DebouncedEventHandler(FileSystemEventHandler):
         self._last_trigger = 0.0
         self._pending = False
         self._lock = Lock()
+        self._executor = executor
         self._debounce_thread: Thread | None = None
+        self._debounce_future: Future[None] | None = None
+        # Trace of the change being debounced, from its first file event
+        self._trace: tracing.Span | None = None
+        self._events = 0
 
     def _should_trigger(self, path: Path) -> bool:
         """Check if the path should trigger a callback.
@@ -63,24 +76,64 @@ class DebouncedEventHandler(FileSystemEventHandler):
                 if current_time - self._last_trigger >= self.debounce_seconds:
                     self._last_trigger = current_time
                     self._pending = False
+                    trace = self._trace or tracing.span("watcher.file_event")
+                    trace.set(events=self._events)
+                    trace.end()
+                    self._trace = None
+                    self._events = 0
                     try:
-                        self.on_change()
+                        # Current while on_change runs, so the broadcast joins the trace
+                        with tracing.span("watcher.debounce", parent=trace):
+                            self.on_change()
                     except Exception:
                         pass
 
-    def _schedule_trigger(self) -> None:
-        """Schedule a debounced trigger."""
+    def _schedule_trigger(self, path: Path) -> None:
+        """Schedule a debounced trigger.
+
+        Args:
+            path: File that changed
+        """
         with self._lock:
             self._pending = True
+            self._events += 1
+            if self._trace is None:
+                self._trace = tracing.span(
+                    "watcher.file_event", dir=str(self.lodestar_dir), file=path.name
+                )
 
             # Cancel existing debounce thread if running
             if self._debounce_thread and self._debounce_thread.is_alive():
                 return
+            if self._debounce_future and not self._debounce_future.done():
+                return
+
+            if self._executor is not None:
+                try:
+                    self._debounce_future = self._executor.submit(self._trigger_debounced)
+                except RuntimeError:
+                    pass  # Pool shut down
+                return
 
             # Start new debounce thread
             self._debounce_thread = Thread(target=self._trigger_debounced, daemon=True)
             self._debounce_thread.start()
 
+    def debounce_state(self) -> dict[str, Any]:
+        """Get the debounce state, for diagnostics.
+
+        Returns:
+            Dictionary with ``pending`` (a change waits to be reported),
+            ``waiting`` (a debounce wait is in flight) and ``events`` (file
+            events folded into the pending change)
+        """
+        with self._lock:
+            waiting = bool(
+                (self._debounce_thread and self._debounce_thread.is_alive())
+                or (self._debounce_future and not self._debounce_future.done())
+            )
+            return {"pending": self._pending, "waiting": waiting, "events": self._events}
+
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
         if event.is_directory:
@@ -88,7 +141,7 @@ class DebouncedEventHandler(FileSystemEventHandler):
 
         path = Path(str(event.src_path))
         if self._should_trigger(path):
-            self._schedule_trigger()
+            self._schedule_trigger(path)
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events."""
@@ -97,7 +150,7 @@ class DebouncedEventHandler(FileSystemEventHandler):
 
         path = Path(str(event.src_path))
         if self._should_trigger(path):
-            self._schedule_trigger()
+            self._schedule_trigger(path)
 
 
 class LodestarWatcher:
@@ -165,6 +218,137 @@ class LodestarWatcher:
         return self._observer is not None and self._observer.is_alive()
 
 
+class WatcherPool:
+    """Watch many .lodestar directories with one observer and one thread pool.
+
+    Every directory is scheduled on a single watchdog observer, and debounce
+    waits for all of them share a small thread pool, so the thread count does
+    not grow with the number of monitored repositories.
+    """
+
+    def __init__(
+        self, debounce_ms: int = 100, use_polling: bool = False, max_workers: int = 4
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            debounce_ms: Debounce period in milliseconds
+            use_polling: Force polling observer (fallback mode)
+            max_workers: Threads shared by the debounce waits of all directories
+        """
+        self.debounce_ms = debounce_ms
+        self.use_polling = use_polling
+        self.max_workers = max_workers
+        self._observer: Any = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._watches: dict[Path, Any] = {}
+        self._handlers: dict[Path, DebouncedEventHandler] = {}
+        self._pending: dict[Path, Callable[[], None]] = {}
+        self._lock = Lock()
+
+    def watch(self, lodestar_dir: Path, on_change: Callable[[], None]) -> None:
+        """Start watching a directory (deferred until :meth:`start` if not running).
+
+        Args:
+            lodestar_dir: Path to .lodestar directory
+            on_change: Callback to invoke when files in it change
+        """
+        with self._lock:
+            if lodestar_dir in self._watches or lodestar_dir in self._pending:
+                return
+            if self._observer is None:
+                self._pending[lodestar_dir] = on_change
+                return
+            self._schedule(lodestar_dir, on_change)
+
+    def unwatch(self, lodestar_dir: Path) -> None:
+        """Stop watching a directory.
+
+        Args:
+            lodestar_dir: Path to .lodestar directory
+        """
+        with self._lock:
+            self._pending.pop(lodestar_dir, None)
+            watch = self._watches.pop(lodestar_dir, None)
+            self._handlers.pop(lodestar_dir, None)
+            if watch is not None and self._observer is not None:
+                self._observer.unschedule(watch)
+
+    def _schedule(self, lodestar_dir: Path, on_change: Callable[[], None]) -> None:
+        """Schedule a directory on the running observer (lock held)."""
+        handler = DebouncedEventHandler(
+            lodestar_dir, on_change, self.debounce_ms, executor=self._executor
+        )
+        self._watches[lodestar_dir] = self._observer.schedule(
+            handler, str(lodestar_dir), recursive=False
+        )
+        self._handlers[lodestar_dir] = handler
+
+    def start(self) -> None:
+        """Start the observer and schedule every watched directory."""
+        with self._lock:
+            if self._observer is not None:
+                return  # Already started
+
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="lsspy-debounce"
+            )
+
+            # Try native observer first, fall back to polling
+            try:
+                if self.use_polling:
+                    raise Exception("Polling mode forced")
+                self._observer = Observer()
+                self._observer.start()
+            except Exception:
+                self._observer = PollingObserver()
+                self._observer.start()
+
+            pending, self._pending = self._pending, {}
+            for lodestar_dir, on_change in pending.items():
+                try:
+                    self._schedule(lodestar_dir, on_change)
+                except OSError:
+                    pass  # Directory vanished; other repositories keep working
+
+    def stop(self) -> None:
+        """Stop the observer and the debounce pool."""
+        with self._lock:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join(timeout=5.0)
+                self._observer = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._watches.clear()
+            self._handlers.clear()
+
+    def is_alive(self) -> bool:
+        """Check if the pool is running.
+
+        Returns:
+            True if the observer is active
+        """
+        return self._observer is not None and self._observer.is_alive()
+
+    @property
+    def watched(self) -> list[Path]:
+        """Directories currently scheduled or waiting for :meth:`start`."""
+        with self._lock:
+            return [*self._watches, *self._pending]
+
+    def debounce_state(self) -> dict[Path, dict[str, Any]]:
+        """Get the debounce state of every scheduled directory.
+
+        Returns:
+            Directory to state (see ``DebouncedEventHandler.debounce_state``)
+        """
+        with self._lock:
+            handlers = dict(self._handlers)
+        return {path: handler.debounce_state() for path, handler in handlers.items()}
+
+
 def start_watcher(
     lodestar_dir: Path,
     on_change: Callable[[], None],
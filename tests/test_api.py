@@ -1,11 +1,24 @@
 """Tests for FastAPI server endpoints."""
 
+import asyncio
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
 
-from lsspy.server import create_app, set_lodestar_dir
+from lsspy import server
+from lsspy.metrics import READ_RETRIES
+from lsspy.readers.pool import ReaderPool
+from lsspy.repos import Repo
+from lsspy.server import add_lodestar_dir, create_app, set_lodestar_dir
 
 
 @pytest.fixture
@@ -16,6 +29,18 @@ def test_client(lodestar_dir: Path, spec_file: Path, runtime_db: Path) -> TestCl
     return TestClient(app)
 
 
+@pytest.fixture
+def multi_client(
+    temp_dir: Path, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+) -> TestClient:
+    """Create a test client monitoring the fixture repository twice."""
+    other_dir = temp_dir / "other" / ".lodestar"
+    shutil.copytree(lodestar_dir, other_dir)
+    set_lodestar_dir(lodestar_dir, name="main")
+    add_lodestar_dir(other_dir)
+    return TestClient(create_app())
+
+
 class TestHealthEndpoints:
     """Tests for health and status endpoints."""
 
@@ -27,6 +52,7 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "ok"
         assert "version" in data
+        assert data["readers"]["queued"] >= 0
 
     def test_status_endpoint(self, test_client: TestClient) -> None:
         """Test /api/status endpoint."""
@@ -234,6 +260,598 @@ class TestEventsEndpoints:
         for event in events:
             assert event["type"] == "task.claimed"
 
+    def test_large_limit_streamed(self, test_client: TestClient, runtime_db: Path) -> None:
+        """Test limits above the page size stream the same JSON list."""
+        with sqlite3.connect(runtime_db) as conn:
+            conn.executemany(
+                "INSERT INTO events (created_at, event_type, data) VALUES (?, ?, ?)",
+                [("2025-01-01T00:00:00Z", "task.created", '{"n": 1}')] * 700,
+            )
+        page = test_client.get(f"/api/events?limit={server.EVENTS_PAGE_LIMIT}").json()
+
+        response = test_client.get("/api/events?limit=10000")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert server.VERSION_HEADER in response.headers
+        events = response.json()
+        assert len(events) > server.EVENTS_PAGE_LIMIT
+        assert events[: server.EVENTS_PAGE_LIMIT] == page
+
+    def test_stream_ndjson(self, test_client: TestClient) -> None:
+        """Test stream=true sends one event per NDJSON line."""
+        expected = test_client.get("/api/events?event_type=task.claimed").json()
+
+        response = test_client.get("/api/events?event_type=task.claimed&stream=true")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    def test_stream_without_database(self, test_client: TestClient, runtime_db: Path) -> None:
+        """Test a missing database streams an empty list."""
+        runtime_db.unlink()
+
+        response = test_client.get("/api/events?limit=1000")
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestDebugEndpoints:
+    """Tests for the opt-in /api/debug endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def reset_debug_endpoints(self) -> Iterator[None]:
+        """Leave the debug endpoints disabled after each test."""
+        yield
+        server.set_debug_endpoints(False)
+
+    def test_disabled_by_default(self, test_client: TestClient) -> None:
+        """Test the endpoints do not exist unless enabled."""
+        assert test_client.get("/api/debug/stats").status_code == 404
+        assert test_client.get("/api/debug/profile?seconds=0.1").status_code == 404
+
+    def test_remote_clients_rejected(self, test_client: TestClient) -> None:
+        """Test only loopback clients may use the endpoints."""
+        server.set_debug_endpoints(True)
+
+        assert test_client.get("/api/debug/stats").status_code == 403
+
+    def test_stats_and_profile(self, lodestar_dir: Path, spec_file: Path, runtime_db: Path) -> None:
+        """Test local clients get internal stats and collapsed stacks."""
+        server.set_debug_endpoints(True)
+        set_lodestar_dir(lodestar_dir, name="main")
+        with TestClient(create_app(), client=("127.0.0.1", 50000)) as client:
+            client.portal.call(server.connection_manager.broadcast_all, "main", 0.0)
+            stats = client.get("/api/debug/stats").json()
+            profile = client.get("/api/debug/profile?seconds=0.2&interval_ms=10")
+
+        assert stats["connections"] == 0
+        assert stats["background_tasks"] >= 1
+        assert "main" in stats["repos"]
+        assert stats["readers"]["workers"] > 0
+        assert str(lodestar_dir) in stats["debounce"]
+        assert stats["debounce"][str(lodestar_dir)]["pending"] is False
+        assert profile.status_code == 200
+        lines = profile.text.splitlines()
+        assert lines
+        _, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any("MainThread" in line for line in lines)
+
+
+class TestMetricsEndpoint:
+    """Tests for the Prometheus /metrics endpoint."""
+
+    def test_metrics_after_reads_and_broadcasts(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test reads, gathers and broadcasts show up in the exposition."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        with TestClient(create_app()) as client:
+            client.get("/api/tasks")
+            client.get("/api/agents")
+            with client.websocket_connect("/ws") as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "subscribe", "scopes": ["agents"]})
+                websocket.receive_json()
+                websocket.receive_json()
+                client.portal.call(server.connection_manager.broadcast_all, "main", 0.0)
+                websocket.receive_json()
+
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert "lsspy_spec_read_seconds_count" in text
+        assert 'lsspy_sqlite_query_seconds_count{query="agents"}' in text
+        assert 'lsspy_gather_seconds_count{scope="runtime"}' in text
+        assert 'lsspy_broadcast_clients_total{scope="agents"}' in text
+        assert "lsspy_trigger_to_broadcast_seconds_count" in text
+        assert "lsspy_reader_queued 0" in text
+
+
+class TestLongPoll:
+    """Tests for version-gated long polling of REST endpoints."""
+
+    def test_version_header(self, test_client: TestClient) -> None:
+        """Test scope endpoints report the version they reflect."""
+        response = test_client.get("/api/leases")
+
+        assert int(response.headers["X-Lsspy-Version"]) >= 0
+
+    def test_returns_immediately_when_behind(self, test_client: TestClient) -> None:
+        """Test a client holding an outdated version is answered right away."""
+        version = int(test_client.get("/api/tasks").headers["X-Lsspy-Version"])
+
+        start = time.monotonic()
+        response = test_client.get(f"/api/tasks?wait_for_change_since={version + 1}&timeout=5")
+        assert response.status_code == 200
+        assert time.monotonic() - start < 2
+
+    def test_times_out_without_change(self, test_client: TestClient) -> None:
+        """Test an unchanged scope is served after the timeout."""
+        version = test_client.get("/api/tasks").headers["X-Lsspy-Version"]
+
+        response = test_client.get(f"/api/tasks?wait_for_change_since={version}&timeout=0.2")
+        assert response.status_code == 200
+        assert response.headers["X-Lsspy-Version"] == version
+        assert len(response.json()) == 3
+
+    def test_wakes_on_change(self, lodestar_dir: Path, spec_file: Path, runtime_db: Path) -> None:
+        """Test a parked request returns as soon as the scope changes."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        with TestClient(create_app()) as client:
+            version = int(client.get("/api/leases").headers["X-Lsspy-Version"])
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                start = time.monotonic()
+                future = executor.submit(
+                    client.get, f"/api/leases?wait_for_change_since={version}&timeout=10"
+                )
+                time.sleep(0.2)
+                assert not future.done()
+
+                with sqlite3.connect(runtime_db) as conn:
+                    conn.execute(
+                        "INSERT INTO leases VALUES (?, ?, ?, ?, ?)",
+                        ("L002", "T002", "A001", "2025-01-01T00:00:00Z", "2100-01-01T00:00:00Z"),
+                    )
+                client.portal.call(server.connection_manager.broadcast_all, "main")
+                response = future.result(timeout=5)
+
+            assert time.monotonic() - start < 5
+            assert int(response.headers["X-Lsspy-Version"]) > version
+            assert [lease["leaseId"] for lease in response.json()] == ["L002"]
+
+    def test_other_changes_do_not_wake(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test a parked request sleeps through broadcasts leaving its scope unchanged."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        manager = server.connection_manager
+        with TestClient(create_app()) as client:
+            # A first long poll marks the repository as watched, and a first
+            # broadcast publishes every scope
+            client.get("/api/leases?wait_for_change_since=0&timeout=0.1")
+            client.portal.call(manager.broadcast_all, "main")
+            version = int(client.get("/api/leases").headers["X-Lsspy-Version"])
+            events_version = manager.current_version("main", "events")
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(
+                    client.get, f"/api/leases?wait_for_change_since={version}&timeout=1"
+                )
+                time.sleep(0.2)
+
+                with sqlite3.connect(runtime_db) as conn:
+                    conn.execute(
+                        "INSERT INTO events (created_at, event_type, data) VALUES (?, ?, ?)",
+                        ("2025-01-01T00:00:00Z", "task.created", "{}"),
+                    )
+                client.portal.call(manager.broadcast_all, "main")
+                time.sleep(0.2)
+                assert not future.done()
+                response = future.result(timeout=5)
+
+            assert int(response.headers["X-Lsspy-Version"]) == version
+            assert manager.current_version("main", "events") > events_version
+
+    def test_invalid_timeout(self, test_client: TestClient) -> None:
+        """Test waits longer than the maximum are rejected."""
+        response = test_client.get("/api/tasks?wait_for_change_since=0&timeout=3600")
+
+        assert response.status_code == 422
+
+
+class TestBroadcastCoalescing:
+    """Tests for single-flight broadcast_all runs and gather-time versions."""
+
+    def test_bursts_share_gathers(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test overlapping triggers fold into one follow-up gather."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        gathers: list[int] = []
+        gather_repo = server._gather_repo
+
+        def slow_gather(repo: Repo) -> dict[str, Any]:
+            gathers.append(1)
+            time.sleep(0.1)
+            return gather_repo(repo)
+
+        monkeypatch.setattr(server, "_gather_repo", slow_gather)
+        manager = server.connection_manager
+        subscriber = manager.streams.add({("main", "agents")})
+
+        async def burst() -> None:
+            await asyncio.gather(*(manager.broadcast_all("main") for _ in range(5)))
+
+        try:
+            with TestClient(create_app()) as client:
+                client.portal.call(burst)
+        finally:
+            manager.streams.remove(subscriber)
+
+        assert len(gathers) == 2
+
+    def test_sidecars_updated_on_reader_pool(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test sidecar updates run on the reader pool, under its size limit and stats."""
+        set_lodestar_dir(lodestar_dir, name="main", record_history=True)
+        threads: list[str] = []
+        update_sidecars = server._update_sidecars
+
+        def recorded_update(repo: Repo) -> None:
+            threads.append(threading.current_thread().name)
+            update_sidecars(repo)
+
+        monkeypatch.setattr(server, "_update_sidecars", recorded_update)
+        with TestClient(create_app()) as client:
+            client.portal.call(server.connection_manager.broadcast_all, "main")
+
+        assert len(threads) == 2  # Startup recording, then the broadcast
+        assert all(name.startswith("lsspy-reader") for name in threads)
+
+    @pytest.mark.asyncio
+    async def test_older_data_is_dropped(self) -> None:
+        """Test data gathered before already broadcast data is not sent."""
+        manager = server.ConnectionManager()
+        first = manager.reserve_version("main", "agents")
+        second = manager.reserve_version("main", "agents")
+
+        await manager.broadcast("agents", ["new"], repo_name="main", version=second)
+        assert await manager.broadcast("agents", ["old"], repo_name="main", version=first) == 0
+        assert manager.current_version("main", "agents") == second
+        behind, cached = manager.missed_update("main", "agents", first)
+        assert behind and cached is not None and '"new"' in cached
+
+
+class TestTimeseriesEndpoint:
+    """Tests for the event rollup timeseries endpoint."""
+
+    def test_get_timeseries(self, test_client: TestClient) -> None:
+        """Test GET /api/timeseries."""
+        response = test_client.get("/api/timeseries?resolution=day")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["resolution"] == "day"
+        assert data["groupBy"] == "event_type"
+        assert data["lastEventId"] == 1
+        assert data["points"][0]["key"] == "task.claimed"
+        assert data["points"][0]["count"] == 1
+
+    def test_get_timeseries_invalid_resolution(self, test_client: TestClient) -> None:
+        """Test GET /api/timeseries with an unknown resolution."""
+        response = test_client.get("/api/timeseries?resolution=week")
+
+        assert response.status_code == 422
+
+
+class TestHistoryEndpoint:
+    """Tests for the recorded history endpoint."""
+
+    def test_history_disabled(self, test_client: TestClient) -> None:
+        """Test GET /api/history without history recording."""
+        response = test_client.get("/api/history?at=2025-01-01T00:00:00Z")
+
+        assert response.status_code == 503
+
+    def test_get_history(self, lodestar_dir: Path, spec_file: Path, runtime_db: Path) -> None:
+        """Test GET /api/history reconstructs the recorded state."""
+        set_lodestar_dir(lodestar_dir, record_history=True)
+        with TestClient(create_app()) as client:
+            response = client.get("/api/history?at=2100-01-01T00:00:00Z&include_expired=true")
+
+            assert response.status_code == 200
+            data = response.json()
+            assert [a["id"] for a in data["agents"]] == ["A001"]
+            assert data["agents"][0]["status"] == "offline"
+            assert data["leases"][0]["leaseId"] == "L001"
+            assert data["taskStatuses"] == {"T001": "ready", "T002": "done", "T003": "verified"}
+
+            before = client.get("/api/history?at=2000-01-01T00:00:00Z").json()
+            assert before["agents"] == []
+            assert before["taskStatuses"] == {}
+
+
+class TestReplayWebSocket:
+    """Tests for history replay over the WebSocket."""
+
+    def test_replay_disabled(self, test_client: TestClient) -> None:
+        """Test a replay request without history recording."""
+        with test_client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "replay", "from": 0})
+
+            response = websocket.receive_json()
+            assert response["type"] == "error"
+            assert "not enabled" in response["error"]
+
+    def test_replay_streams_history(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test a replay streams the starting state, then recorded changes."""
+        store = set_lodestar_dir(lodestar_dir, record_history=True).history_store
+        assert store is not None
+        store.record({"agents": {}, "leases": {}, "tasks": {"T001": "ready"}}, ts=1000.0)
+        store.record({"agents": {}, "leases": {}, "tasks": {"T001": "done"}}, ts=1001.0)
+
+        with TestClient(create_app()) as client, client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "replay", "from": 999, "to": 1002, "speed": 100})
+
+            assert websocket.receive_json()["type"] == "replay_started"
+            initial = [websocket.receive_json() for _ in range(4)]
+            assert [m["scope"] for m in initial] == ["agents", "leases", "tasks", "events"]
+            assert all(m["type"] == "replay" for m in initial)
+            assert initial[2]["data"] == []
+
+            statuses = []
+            while (msg := websocket.receive_json())["type"] != "replay_complete":
+                if msg["scope"] == "tasks":
+                    statuses.append(msg["data"][0]["status"])
+            assert statuses == ["ready", "done"]
+
+    def test_replay_failure_is_logged(
+        self,
+        lodestar_dir: Path,
+        spec_file: Path,
+        runtime_db: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test a replay failing for another reason than a disconnect is logged."""
+        store = set_lodestar_dir(lodestar_dir, record_history=True).history_store
+        assert store is not None
+        store.record({"agents": {}, "leases": {}, "tasks": {"T001": "ready"}}, ts=1000.0)
+        store.record({"agents": {}, "leases": {}, "tasks": {"T001": "done"}}, ts=1001.0)
+
+        def broken_apply_change(*args: Any) -> None:
+            raise ValueError("broken change")
+
+        monkeypatch.setattr(server, "apply_change", broken_apply_change)
+        with TestClient(create_app()) as client, client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "replay", "from": 999, "to": 1002, "speed": 100})
+            assert websocket.receive_json()["type"] == "replay_started"
+
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and not caplog.records:
+                time.sleep(0.02)
+
+        failure = next(r for r in caplog.records if r.name == "lsspy.server")
+        assert "History replay" in failure.getMessage()
+        assert failure.exc_info is not None
+        assert isinstance(failure.exc_info[1], ValueError)
+
+    def test_replay_invalid_request(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test a replay request with an invalid speed."""
+        set_lodestar_dir(lodestar_dir, record_history=True)
+        with TestClient(create_app()) as client, client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "replay", "from": 0, "speed": 0})
+
+            response = websocket.receive_json()
+            assert response["type"] == "error"
+            assert "Invalid replay request" in response["error"]
+
+
+class TestResumeWebSocket:
+    """Tests for resuming a WebSocket session after a reconnect."""
+
+    def test_resume_sends_only_missed_updates(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test unchanged scopes are skipped and changed ones come from the cache."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        scopes = ["agents", "tasks"]
+        with TestClient(create_app()) as client:
+            with client.websocket_connect("/ws") as websocket:
+                epoch = websocket.receive_json()["epoch"]
+                websocket.send_json({"type": "subscribe", "scopes": scopes})
+                websocket.receive_json()
+                initial = {m["scope"]: m for m in (websocket.receive_json() for _ in scopes)}
+
+                client.portal.call(server.connection_manager.broadcast_all, "main")
+                updates = {m["scope"]: m for m in (websocket.receive_json() for _ in scopes)}
+                assert updates["agents"]["version"] == initial["agents"]["version"] + 1
+
+            # Reconnect holding the new agents version and the old tasks version
+            resume = {"main:agents": updates["agents"]["version"]}
+            resume["main:tasks"] = initial["tasks"]["version"]
+            with client.websocket_connect("/ws") as websocket:
+                websocket.receive_json()
+                websocket.send_json(
+                    {"type": "subscribe", "scopes": scopes, "resume": resume, "epoch": epoch}
+                )
+                websocket.receive_json()
+                websocket.send_json({"type": "ping"})
+
+                tasks = websocket.receive_json()
+                assert tasks == updates["tasks"]
+                assert websocket.receive_json()["type"] == "pong"
+
+    def test_initial_data_not_tagged_newer(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a broadcast landing during the initial read does not lend it its version."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        manager = server.connection_manager
+        gather_scope = server._gather_scope
+
+        def gather_during_broadcast(repo: Repo, scope: str) -> Any:
+            data = gather_scope(repo, scope)
+            # A newer update is published while this (older) data is on its way
+            key = (repo.name, scope)
+            manager._versions[key] = manager._versions.get(key, 0) + 1
+            return data
+
+        monkeypatch.setattr(server, "_gather_scope", gather_during_broadcast)
+        with TestClient(create_app()) as client, client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            before = manager.current_version("main", "agents")
+            websocket.send_json({"type": "subscribe", "scopes": ["agents"]})
+            websocket.receive_json()
+
+            update = websocket.receive_json()
+
+        assert update["version"] == before
+        assert manager.current_version("main", "agents") == before + 1
+
+    def test_resume_from_other_run_gets_snapshot(self, test_client: TestClient) -> None:
+        """Test versions from another server run are ignored."""
+        with test_client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json(
+                {
+                    "type": "subscribe",
+                    "scopes": ["agents"],
+                    "resume": {"agents": 0},
+                    "epoch": "elsewhere",
+                }
+            )
+            websocket.receive_json()
+
+            update = websocket.receive_json()
+            assert update["scope"] == "agents"
+            assert len(update["data"]) == 1
+
+
+class TestMultipleRepos:
+    """Tests for monitoring several repositories from one server."""
+
+    def test_list_repos(self, multi_client: TestClient) -> None:
+        """Test GET /api/repos."""
+        response = multi_client.get("/api/repos")
+
+        assert response.status_code == 200
+        repos = response.json()
+        assert [r["name"] for r in repos] == ["main", "other"]
+        assert [r["default"] for r in repos] == [True, False]
+        assert repos[1]["lodestarDir"].endswith(".lodestar")
+
+    def test_namespaced_routes(self, multi_client: TestClient) -> None:
+        """Test per-repository routes under /api/repos/{name}."""
+        response = multi_client.get("/api/repos/other/agents")
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+        status = multi_client.get("/api/repos/other/status").json()
+        assert status["repo"] == "other"
+        assert status["lodestar_dir"].endswith("other/.lodestar")
+
+        # Plain routes keep serving the default repository
+        assert multi_client.get("/api/status").json()["repo"] == "main"
+
+    def test_unknown_repo(self, multi_client: TestClient) -> None:
+        """Test namespaced routes for an unknown repository."""
+        response = multi_client.get("/api/repos/missing/tasks")
+
+        assert response.status_code == 404
+
+    def test_namespaced_websocket_scopes(self, multi_client: TestClient) -> None:
+        """Test subscribing to another repository's scope."""
+        with multi_client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "subscribe", "scopes": ["other:agents", "nope:agents"]})
+
+            ack = websocket.receive_json()
+            assert ack["subscriptions"] == ["other:agents"]
+
+            update = websocket.receive_json()
+            assert update["scope"] == "agents"
+            assert update["repo"] == "other"
+            assert len(update["data"]) == 1
+
+
+class TestFleetViews:
+    """Tests for the cross-repository aggregate views."""
+
+    def test_get_fleet(self, multi_client: TestClient) -> None:
+        """Test GET /api/fleet merges every repository."""
+        response = multi_client.get("/api/fleet?agent_status=all&task_status=done")
+
+        assert response.status_code == 200
+        fleet = response.json()
+        assert [(a["repo"], a["id"]) for a in fleet["agents"]] == [
+            ("main", "A001"),
+            ("other", "A001"),
+        ]
+        assert [t["repo"] for t in fleet["tasks"]] == ["main", "other"]
+        assert [r["status"] for r in fleet["repos"]] == ["fresh", "fresh"]
+
+    def test_get_fleet_agents_online_by_default(self, multi_client: TestClient) -> None:
+        """Test GET /api/fleet/agents only lists online agents by default."""
+        fleet = multi_client.get("/api/fleet/agents").json()
+        assert all(a["status"] == "online" for a in fleet["agents"])
+        assert fleet["tasks"] == []
+
+        fleet = multi_client.get("/api/fleet/agents?status=offline").json()
+        assert all(a["status"] == "offline" for a in fleet["agents"])
+
+    def test_slow_repo_does_not_stall_fleet(
+        self, multi_client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a repository that exceeds its timeout is reported, not waited for."""
+        gather_repo = server._gather_repo
+
+        def slow_gather(repo: Repo, scopes: Any) -> dict[str, Any]:
+            if repo.name == "other":
+                time.sleep(0.5)
+            return gather_repo(repo, scopes)
+
+        monkeypatch.setattr(server, "_gather_repo", slow_gather)
+        monkeypatch.setattr(server, "FLEET_REPO_TIMEOUT_SECONDS", 0.1)
+
+        fleet = multi_client.get("/api/fleet/tasks?status=all").json()
+        assert {t["repo"] for t in fleet["tasks"]} == {"main"}
+        assert [r["status"] for r in fleet["repos"]] == ["fresh", "unavailable"]
+        assert "Timed out" in fleet["repos"][1]["error"]
+
+        # With older cached data the repository is served stale instead
+        other = server._registry.get("other")
+        assert other is not None
+        other.store_snapshot({"agents": [], "leases": [], "tasks": []})
+        other.snapshot_at -= 60
+        fleet = multi_client.get("/api/fleet/tasks?status=all").json()
+        assert fleet["repos"][1]["status"] == "stale"
+
+    def test_all_repos_websocket_scope(self, multi_client: TestClient) -> None:
+        """Test subscribing to the fleet-wide view."""
+        with multi_client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "subscribe", "scopes": ["all-repos"]})
+
+            assert websocket.receive_json()["subscriptions"] == ["all-repos"]
+            update = websocket.receive_json()
+            assert update["scope"] == "all-repos"
+            assert [r["repo"] for r in update["data"]["repos"]] == ["main", "other"]
+
 
 class TestGraphEndpoint:
     """Tests for graph endpoint."""
@@ -265,6 +883,61 @@ class TestDashboardEndpoint:
         assert "events" in data
 
 
+class TestSnapshotEndpoint:
+    """Tests for the bulk snapshot endpoint."""
+
+    def test_get_snapshot(self, test_client: TestClient) -> None:
+        """Test GET /api/snapshot returns every scope with versions."""
+        response = test_client.get("/api/snapshot")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["agents"][0]["id"] == "A001"
+        assert len(data["tasks"]) >= 1
+        assert {"leases", "messages", "events", "timestamp"} <= set(data)
+        assert set(data["versions"]) == {"tasks", "agents", "leases", "messages", "events"}
+        assert data["data_version"]
+
+    def test_snapshot_data_version_changes_with_data(
+        self, test_client: TestClient, runtime_db: Path
+    ) -> None:
+        """Test the data version stays put until the runtime data changes."""
+        before = test_client.get("/api/snapshot").json()["data_version"]
+        assert test_client.get("/api/snapshot").json()["data_version"] == before
+
+        conn = sqlite3.connect(str(runtime_db))
+        conn.execute("UPDATE agents SET display_name = 'Renamed'")
+        conn.commit()
+        conn.close()
+
+        data = test_client.get("/api/snapshot").json()
+        assert data["agents"][0]["displayName"] == "Renamed"
+        assert data["data_version"] != before
+
+    def test_stream_snapshot(self, test_client: TestClient) -> None:
+        """Test ?stream=true sends one update message per scope as NDJSON."""
+        response = test_client.get("/api/snapshot", params={"stream": True})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        messages = [json.loads(line) for line in response.text.splitlines()]
+        assert {msg["scope"] for msg in messages} == {
+            "tasks",
+            "agents",
+            "leases",
+            "messages",
+            "events",
+        }
+        assert all(msg["type"] == "update" and "version" in msg for msg in messages)
+
+    def test_namespaced_snapshot(self, multi_client: TestClient) -> None:
+        """Test the snapshot of a named repository."""
+        response = multi_client.get("/api/repos/other/snapshot")
+
+        assert response.status_code == 200
+        assert response.json()["agents"][0]["id"] == "A001"
+
+
 class TestRootEndpoint:
     """Tests for root endpoint."""
 
@@ -302,3 +975,58 @@ class TestErrorHandling:
         response = test_client.post("/api/health")
 
         assert response.status_code == 405
+
+    def test_read_deadline(self, test_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a read missing its deadline fails the request with 503."""
+        pool = ReaderPool(deadline=0.0)
+        monkeypatch.setattr(server, "_reader_pool", pool)
+        try:
+            response = test_client.get("/api/agents")
+        finally:
+            pool.shutdown()
+
+        assert response.status_code == 503
+        assert "did not finish" in response.json()["detail"]
+
+    def test_locked_database_retried(
+        self, lodestar_dir: Path, runtime_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test reads of a locked database back off and succeed once it is released."""
+        repo = set_lodestar_dir(lodestar_dir)
+        repo.runtime_reader.timeout = 0.01
+        pool = ReaderPool(deadline=5.0, retry_delay=0.02)
+        monkeypatch.setattr(server, "_reader_pool", pool)
+        writer = sqlite3.connect(runtime_db, isolation_level=None, check_same_thread=False)
+        writer.execute("BEGIN EXCLUSIVE")
+        threading.Timer(0.3, writer.rollback).start()
+        retries_before = READ_RETRIES.value()
+        try:
+            with TestClient(create_app()) as client:
+                response = client.get("/api/agents")
+        finally:
+            pool.shutdown()
+            writer.close()
+
+        assert response.status_code == 200
+        assert [agent["id"] for agent in response.json()] == ["A001"]
+        assert READ_RETRIES.value() > retries_before
+
+    def test_locked_database_unavailable(
+        self, lodestar_dir: Path, runtime_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a database locked past the deadline fails the request with 503."""
+        repo = set_lodestar_dir(lodestar_dir)
+        repo.runtime_reader.timeout = 0.01
+        pool = ReaderPool(deadline=0.3, retry_delay=0.02)
+        monkeypatch.setattr(server, "_reader_pool", pool)
+        writer = sqlite3.connect(runtime_db, isolation_level=None)
+        writer.execute("BEGIN EXCLUSIVE")
+        try:
+            with TestClient(create_app()) as client:
+                responses = [client.get(f"/api/{scope}") for scope in ("agents", "leases")]
+        finally:
+            writer.rollback()
+            writer.close()
+            pool.shutdown()
+
+        assert [response.status_code for response in responses] == [503, 503]
@@ -0,0 +1,145 @@
+"""Tests for the benchmark suite and its repository generator."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from lsspy.bench import compare_results, generate_repo, run_benchmarks
+from lsspy.bench.imports import bench_imports, parse_importtime
+from lsspy.bench.load import run_load
+from lsspy.bench.memory import bench_memory, deep_sizeof
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.readers.spec import SpecReader
+
+
+@pytest.fixture
+def bench_repo(temp_dir: Path) -> Path:
+    """Generate a small synthetic repository."""
+    return generate_repo(temp_dir, tasks=60, events=300, agents=12, messages=30, leases=8)
+
+
+class TestGenerateRepo:
+    """Tests for generate_repo."""
+
+    def test_sizes_and_dag(self, bench_repo: Path) -> None:
+        """Test the generated files have the requested rows and an acyclic spec."""
+        tasks = SpecReader(bench_repo / "spec.yaml").get_tasks_typed()
+        runtime = RuntimeReader(bench_repo / "runtime.sqlite")
+
+        assert len(tasks) == 60
+        assert any(task.dependencies for task in tasks)
+        for task in tasks:
+            assert all(dep < task.id for dep in task.dependencies)
+        assert len(runtime.get_agents()) == 12
+        assert len(runtime.get_leases(include_expired=True)) == 8
+        assert len(runtime.get_messages(limit=100)) == 30
+        assert runtime.get_max_event_id() == 300
+
+    def test_deterministic(self, temp_dir: Path) -> None:
+        """Test the same seed and reference time give the same spec."""
+        now = datetime(2026, 1, 1, 12, 0)
+        first = generate_repo(temp_dir / "a", tasks=20, events=10, seed=7, now=now)
+        second = generate_repo(temp_dir / "b", tasks=20, events=10, seed=7, now=now)
+
+        assert (first / "spec.yaml").read_text() == (second / "spec.yaml").read_text()
+
+    def test_refuses_existing_database(self, bench_repo: Path) -> None:
+        """Test an existing runtime database is not overwritten."""
+        with pytest.raises(FileExistsError):
+            generate_repo(bench_repo.parent, tasks=1, events=1)
+
+
+class TestRunBenchmarks:
+    """Tests for run_benchmarks and compare_results."""
+
+    def test_results_are_json(self, bench_repo: Path) -> None:
+        """Test every group reports a latency summary per benchmark."""
+        results = run_benchmarks(bench_repo, repeat=2, clients=3, parameters={"tasks": 60})
+
+        assert json.loads(json.dumps(results)) == results
+        assert results["parameters"] == {"repeat": 2, "clients": 3, "tasks": 60}
+        names = set(results["results"])
+        assert {"spec.parse", "runtime.snapshot", "gather.all_scopes"} <= names
+        assert {"api./api/tasks", "fanout.tasks"} <= names
+        summary = results["results"]["spec.parse"]
+        assert summary["runs"] == 2
+        assert summary["min_ms"] <= summary["median_ms"] <= summary["max_ms"]
+
+    def test_unknown_group(self, bench_repo: Path) -> None:
+        """Test unknown groups are rejected before anything runs."""
+        with pytest.raises(ValueError, match="nope"):
+            run_benchmarks(bench_repo, groups=("readers", "nope"))
+
+    def test_compare_results(self) -> None:
+        """Test ratios are computed for benchmarks present in both runs."""
+        baseline = {"results": {"a": {"median_ms": 2.0}, "b": {"median_ms": 1.0}}}
+        current = {"results": {"a": {"median_ms": 3.0}, "c": {"median_ms": 1.0}}}
+
+        assert compare_results(baseline, current) == {"a": 1.5}
+
+
+class TestRunLoad:
+    """Tests for the load test."""
+
+    def test_writes_reach_clients(self) -> None:
+        """Test written events reach every client with a measured latency."""
+        report = run_load(duration=1.0, clients=3, event_rate=10, spec_rate=1, tasks=20, drain=1.5)
+
+        assert report["writes"]["events"] == 10
+        assert report["writes"]["spec"] == 1
+        assert report["latency"]["runs"] == 30
+        assert report["dropped_updates"] == 0
+        assert report["stale_clients"] == 0
+        assert report["updates"]["by_scope"]["events"] >= 3
+        assert report["cpu"]["percent"] > 0
+
+
+class TestImportTime:
+    """Tests for the CLI import time benchmark."""
+
+    def test_parse_importtime(self) -> None:
+        """Test nesting depth and times are read from the interpreter's report."""
+        report = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     rich.style\n"
+            "import time:       300 |        420 |   rich\n"
+            "import time:        50 |        470 | lsspy.cli\n"
+        )
+
+        assert parse_importtime(report) == [
+            ("rich.style", 2, 120, 120),
+            ("rich", 1, 300, 420),
+            ("lsspy.cli", 0, 50, 470),
+        ]
+
+    def test_cli_defers_heavy_imports(self) -> None:
+        """Test importing the CLI loads neither the server nor its dependencies."""
+        results = bench_imports(repeat=1, budget_ms=10_000)
+
+        assert results["heavy_modules"] == []
+        assert results["within_budget"] is True
+        assert results["results"]["import.lsspy.cli"]["runs"] == 1
+        assert results["results"]["cli.version"]["runs"] == 1
+        assert "typer" in {entry["module"] for entry in results["slowest_imports"]}
+
+
+class TestMemory:
+    """Tests for the memory benchmark."""
+
+    def test_compact_layout_is_smaller(self) -> None:
+        """Test both layouts hold every row and compact tables retain less."""
+        results = bench_memory(tasks=200, events=1_000)["results"]
+
+        assert results["memory.tasks.dicts"]["rows"] == 200
+        assert results["memory.events.compact"]["rows"] == 1_000
+        for scope in ("tasks", "events"):
+            compact = results[f"memory.{scope}.compact"]["retained_mb"]
+            assert compact < results[f"memory.{scope}.dicts"]["retained_mb"]
+
+    def test_deep_sizeof_counts_shared_objects_once(self) -> None:
+        """Test an object referenced twice is only counted once."""
+        shared = list(range(100))
+
+        assert deep_sizeof([shared, shared]) == deep_sizeof([shared]) + 8
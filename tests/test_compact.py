@@ -0,0 +1,141 @@
+"""Tests for the compact task and event tables."""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from lsspy import server
+from lsspy.compact import CompactTable, EventRecord, SharedValues, TaskRecord, as_json
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.readers.spec import SpecReader
+from lsspy.repos import Repo
+from lsspy.server import create_app, set_lodestar_dir
+
+
+class TestCompactTable:
+    """Tests for CompactTable and its records."""
+
+    def test_tasks_match_model_output(self, spec_file: Path) -> None:
+        """Test task records serialize exactly like the Task model."""
+        expected = [
+            task.model_dump(mode="json", by_alias=True)
+            for task in SpecReader(spec_file).get_tasks_typed()
+        ]
+
+        table = CompactTable(TaskRecord.from_json(task) for task in expected)
+
+        assert len(table) == 3
+        assert table.to_json() == expected
+        assert as_json(table) == expected
+
+    def test_events_match_model_output(self, runtime_db: Path) -> None:
+        """Test event records serialize exactly like the Event model."""
+        expected = [
+            server._event_from_row(row).model_dump(mode="json", by_alias=True)
+            for row in RuntimeReader(runtime_db).get_events()
+        ]
+
+        table = CompactTable(EventRecord.from_json(event) for event in expected)
+
+        assert table.to_json() == expected
+
+    def test_repeated_strings_are_shared(self, spec_file: Path) -> None:
+        """Test equal statuses and labels of different tasks are one object."""
+        dumped = [
+            task.model_dump(mode="json", by_alias=True)
+            for task in SpecReader(spec_file).get_tasks_typed()
+        ]
+        # Equal but distinct string objects, as parsed from separate rows
+        first, second = (
+            TaskRecord.from_json(
+                dict(task, status="".join(["in_", "progress"]), labels=["".join(["back", "end"])])
+            )
+            for task in dumped[:2]
+        )
+
+        assert first.status is second.status
+        assert first.labels[0] is second.labels[0]
+
+    def test_equality(self, spec_file: Path) -> None:
+        """Test tables with the same rows compare equal."""
+        repo_tables = [server._tasks_table(Repo("main", spec_file.parent)) for _ in range(2)]
+
+        assert repo_tables[0] == repo_tables[1]
+        assert repo_tables[0] != repo_tables[0].to_json()
+
+
+class TestSharedValues:
+    """Tests for SharedValues and its use when gathering runtime scopes."""
+
+    def test_same_text_shares_first_value(self) -> None:
+        """Test values parsed from equal texts of one column are one object."""
+        shared = SharedValues()
+        first = shared.share("caps", '["a"]', ["a"])
+
+        assert shared.share("caps", '["a"]', ["a"]) is first
+        assert shared.share("other", '["a"]', ["a"]) is not first
+        assert shared.share("caps", None, None) is None
+
+    def test_bounds(self) -> None:
+        """Test the oldest texts are forgotten and long texts are never kept."""
+        shared = SharedValues(max_entries=2, max_length=10)
+        first = shared.share("caps", "[1]", [1])
+        shared.share("caps", "[2]", [2])
+        shared.share("caps", "[3]", [3])
+
+        assert len(shared) == 2
+        assert shared.share("caps", "[1]", [1]) is not first
+        shared.share("caps", "[" + "1," * 10 + "1]", [1] * 11)
+        assert len(shared) == 2
+
+    def test_rows_share_parsed_values(self) -> None:
+        """Test gathered rows repeating JSON and IDs hold one copy of each."""
+        agent_rows = [
+            {
+                "agent_id": "".join(["A", "001"]),
+                "role": "".join(["code-", "review"]),
+                "last_seen_at": "2025-01-01T00:00:00Z",
+                "capabilities": '["python", "sql"]',
+            }
+            for _ in range(3)
+        ]
+        event_rows = [
+            {
+                "event_id": event_id,
+                "created_at": "2025-01-01T00:00:00Z",
+                "event_type": "".join(["task.", "claimed"]),
+                "agent_id": "".join(["A", "001"]),
+                "data": '{"key": "value"}',
+            }
+            for event_id in range(3)
+        ]
+
+        agents = server._agents_json(agent_rows)
+        events = list(server._events_table(event_rows))
+
+        assert agents[0]["capabilities"] == ["python", "sql"]
+        assert len({id(agent["capabilities"]) for agent in agents}) == 1
+        assert len({id(agent["role"]) for agent in agents}) == 1
+        assert events[0].payload == {"key": "value"}
+        assert len({id(event.payload) for event in events}) == 1
+        assert len({id(event.actor_agent_id) for event in events}) == 1
+
+
+class TestCachedTasks:
+    """Tests for serving /api/tasks from cached broadcast data."""
+
+    def test_tasks_served_from_fresh_snapshot(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test a fresh cached table answers without reading the spec."""
+        repo = set_lodestar_dir(lodestar_dir, name="main")
+        with TestClient(create_app()) as client:
+            expected = client.get("/api/tasks").json()
+            repo.store_snapshot({"tasks": server._tasks_table(repo)})
+            spec_file.write_text("tasks: {}\n")
+
+            response = client.get("/api/tasks")
+
+        assert response.status_code == 200
+        assert response.json() == expected
+        assert server.VERSION_HEADER in response.headers
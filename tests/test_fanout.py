@@ -0,0 +1,175 @@
+"""Tests for the leader-to-worker fan-out channel."""
+
+import asyncio
+import sqlite3
+import struct
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from lsspy import server
+from lsspy.fanout import FanoutPublisher, encode_frame, read_frame, subscribe
+from lsspy.server import create_app, set_lodestar_dir, start_fanout_leader, stop_fanout_leader
+from lsspy.snapshots import SnapshotStore
+
+
+class TestFanoutChannel:
+    """Tests for frame encoding and the publisher/subscriber pair."""
+
+    @pytest.mark.asyncio
+    async def test_frame_roundtrip(self) -> None:
+        """Test a frame decodes to its key and payload."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame("repo:agents", b'{"type":"update"}'))
+        reader.feed_eof()
+
+        assert await read_frame(reader) == ("repo:agents", b'{"type":"update"}')
+        with pytest.raises(asyncio.IncompleteReadError):
+            await read_frame(reader)
+
+    @pytest.mark.asyncio
+    async def test_subscriber_receives_latest_then_live_frames(self) -> None:
+        """Test a late subscriber gets the newest frames first, then new ones."""
+        publisher = FanoutPublisher()
+        address = publisher.start()
+        publisher.publish("repo:agents", b"old")
+        publisher.publish("repo:agents", b"new")
+        publisher.publish("repo:tasks", b"tasks")
+
+        received: asyncio.Queue[tuple[str, bytes]] = asyncio.Queue()
+
+        async def on_frame(key: str, payload: bytes) -> None:
+            await received.put((key, payload))
+
+        task = asyncio.create_task(subscribe(address, on_frame, retry_delay=0.01))
+        try:
+            first = [await asyncio.wait_for(received.get(), 2) for _ in range(2)]
+            assert sorted(first) == [("repo:agents", b"new"), ("repo:tasks", b"tasks")]
+
+            while publisher.worker_count == 0:
+                await asyncio.sleep(0.01)
+            publisher.publish("repo:events", b"live")
+            assert await asyncio.wait_for(received.get(), 2) == ("repo:events", b"live")
+        finally:
+            task.cancel()
+            publisher.stop()
+
+
+class TestWorkerMode:
+    """Tests for a worker process fed by the leader."""
+
+    def test_worker_forwards_leader_updates(
+        self,
+        lodestar_dir: Path,
+        spec_file: Path,
+        runtime_db: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test changes gathered by the leader reach the worker's WebSocket clients."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        address = start_fanout_leader()
+        try:
+            for key, value in server.worker_environment(address).items():
+                monkeypatch.setenv(key, value)
+
+            with TestClient(create_app()) as client, client.websocket_connect("/ws") as ws:
+                ws.receive_json()
+                ws.send_json({"type": "subscribe", "scopes": ["agents"]})
+                ws.receive_json()
+                initial = ws.receive_json()
+                assert initial["repo"] == "main"
+                assert len(initial["data"]) == 1
+
+                conn = sqlite3.connect(str(runtime_db))
+                conn.execute(
+                    "INSERT INTO agents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        "A002",
+                        "Agent 2",
+                        None,
+                        "2025-01-01T00:00:00Z",
+                        "2025-01-01T00:00:00Z",
+                        "[]",
+                        "{}",
+                    ),
+                )
+                conn.commit()
+                conn.close()
+                server._publish_repo("main")
+                assert server._leader_store is not None
+                published = server._leader_store.version("main:agents")
+
+                # Wait on the published version, not on the order frames arrive
+                # in: the leader may publish others meanwhile
+                update = ws.receive_json()
+                while update["version"] != published:
+                    update = ws.receive_json()
+                assert update["scope"] == "agents"
+                assert {a["id"] for a in update["data"]} == {"A001", "A002"}
+        finally:
+            stop_fanout_leader()
+
+    @pytest.mark.asyncio
+    async def test_initial_data_not_forwarded_again(
+        self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a version sent as initial data is dropped when the leader's frame for it arrives."""
+        store = SnapshotStore(temp_dir)
+        monkeypatch.setattr(server, "_snapshot_reader", store)
+        monkeypatch.setattr(server, "_fanout_versions", {})
+        key = ("main", "agents")
+        subscriber = server.connection_manager.streams.add({key})
+
+        def delivered() -> list[str]:
+            items = []
+            while not subscriber.queue.empty():
+                item = subscriber.queue.get_nowait()
+                assert item is not None
+                items.append(item[2])
+            return items
+
+        try:
+            first = store.write("main:agents", b"v1")
+            # Not forwarded by this worker yet: broadcast to every subscriber
+            assert [m async for _, m in server._initial_updates([key])] == []
+            assert delivered() == ["v1"]
+
+            # The leader replays its latest frame, then announces a new version
+            await server._on_fanout_frame("main:agents", str(first).encode())
+            second = store.write("main:agents", b"v2")
+            await server._on_fanout_frame("main:agents", str(second).encode())
+            assert delivered() == ["v2"]
+
+            # Already forwarded: only the subscribing client gets it
+            assert [m async for _, m in server._initial_updates([key])] == ["v2"]
+            assert delivered() == []
+        finally:
+            server.connection_manager.streams.remove(subscriber)
+
+    @pytest.mark.asyncio
+    async def test_unfinished_snapshot_does_not_block_loop(
+        self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a snapshot left mid-write by the leader is waited out off the event loop."""
+        store = SnapshotStore(temp_dir)
+        monkeypatch.setattr(server, "_snapshot_reader", store)
+        monkeypatch.setattr(server, "_fanout_versions", {})
+        subscriber = server.connection_manager.streams.add({("main", "agents")})
+
+        try:
+            version = store.write("main:agents", b"v1")
+            path = next(temp_dir.glob("*.snap"))
+            with open(path, "r+b") as f:
+                f.write(struct.pack("<Q", 3))
+
+            frame = asyncio.ensure_future(
+                server._on_fanout_frame("main:agents", str(version).encode())
+            )
+            # The loop stays responsive while the read waits for the writer
+            assert await asyncio.wait_for(asyncio.sleep(0.05, "free"), 0.5) == "free"
+            assert not frame.done()
+            await frame
+            assert subscriber.queue.empty()
+        finally:
+            server.connection_manager.streams.remove(subscriber)
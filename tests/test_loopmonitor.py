@@ -0,0 +1,90 @@
+"""Tests for the event loop monitor."""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from lsspy import server
+from lsspy.loopmonitor import LoopMonitor
+from lsspy.metrics import LOOP_LAG_SECONDS, LOOP_STALLS
+from lsspy.server import create_app, set_lodestar_dir
+
+
+def block_loop(seconds: float) -> None:
+    """Block the calling thread like a synchronous call on the loop would."""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Tests for LoopMonitor."""
+
+    def test_stall_reported_with_stack(self) -> None:
+        """Test a blocking callback is counted and attributed to its code."""
+
+        async def run() -> list[dict]:
+            monitor = LoopMonitor(threshold=0.05, interval=0.01)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            block_loop(0.3)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return monitor.recent_stalls()
+
+        stalls_before = LOOP_STALLS.value()
+        lag_before = LOOP_LAG_SECONDS.count()
+        stalls = asyncio.run(run())
+
+        assert len(stalls) == 1
+        assert stalls[0]["seconds"] >= 0.25
+        assert any("in block_loop" in frame for frame in stalls[0]["stack"])
+        assert LOOP_STALLS.value() == stalls_before + 1
+        assert LOOP_LAG_SECONDS.count() > lag_before
+
+    def test_no_stall_when_idle(self) -> None:
+        """Test short callbacks are not reported."""
+
+        async def run() -> list[dict]:
+            monitor = LoopMonitor(threshold=0.2, interval=0.01)
+            monitor.start()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+            return monitor.recent_stalls()
+
+        assert asyncio.run(run()) == []
+
+
+class TestServerLoopMonitor:
+    """Tests for the --loop-monitor server setting."""
+
+    @pytest.fixture(autouse=True)
+    def reset_loop_monitor(self) -> Iterator[None]:
+        """Leave the monitor and debug endpoints disabled after each test."""
+        yield
+        server.set_loop_monitor(None)
+        server.set_debug_endpoints(False)
+
+    def test_stalls_in_metrics_and_debug_stats(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test a stall of the server loop shows up in /metrics and debug stats."""
+        server.set_loop_monitor(0.05)
+        server.set_debug_endpoints(True)
+        set_lodestar_dir(lodestar_dir, name="main")
+
+        async def stall() -> None:
+            block_loop(0.2)
+            await asyncio.sleep(0.1)
+
+        with TestClient(create_app(), client=("127.0.0.1", 50000)) as client:
+            client.portal.call(stall)
+            stats = client.get("/api/debug/stats").json()
+            metrics = client.get("/metrics").text
+
+        assert stats["loop_stalls"]
+        assert any("in block_loop" in frame for frame in stats["loop_stalls"][-1]["stack"])
+        assert "lsspy_event_loop_lag_seconds_count" in metrics
+        assert "lsspy_event_loop_stalls_total" in metrics
@@ -0,0 +1,66 @@
+"""Tests for the in-process metrics registry."""
+
+import pytest
+
+from lsspy.metrics import Registry
+
+
+class TestRegistry:
+    """Tests for Registry and its metric types."""
+
+    def test_counter_and_gauge(self) -> None:
+        """Test counters add up and gauges keep their last value."""
+        registry = Registry()
+        errors = registry.counter("errors_total", "Errors", ("kind",))
+        depth = registry.gauge("depth", "Queue depth")
+
+        errors.inc(kind="locked")
+        errors.inc(2, kind="locked")
+        errors.inc(kind='say "hi"')
+        depth.set(3)
+        depth.set(1)
+
+        text = registry.render()
+        assert "# TYPE errors_total counter" in text
+        assert 'errors_total{kind="locked"} 3' in text
+        assert 'errors_total{kind="say \\"hi\\""} 1' in text
+        assert "depth 1\n" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test histogram bucket, sum and count samples."""
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "Latency", ("scope",), buckets=(0.1, 1.0))
+
+        latency.observe(0.05, scope="tasks")
+        latency.observe(0.5, scope="tasks")
+        latency.observe(5, scope="tasks")
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{scope="tasks",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{scope="tasks",le="1"} 2' in text
+        assert 'latency_seconds_bucket{scope="tasks",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{scope="tasks"} 5.55' in text
+        assert 'latency_seconds_count{scope="tasks"} 3' in text
+        assert latency.count(scope="tasks") == 3
+
+    def test_labels_must_match(self) -> None:
+        """Test samples with the wrong labels and duplicate names are rejected."""
+        registry = Registry()
+        errors = registry.counter("errors_total", "Errors", ("kind",))
+
+        with pytest.raises(ValueError):
+            errors.inc(query="agents")
+        with pytest.raises(ValueError):
+            registry.counter("errors_total", "Errors again")
+
+    def test_special_values(self) -> None:
+        """Test NaN and infinite samples render as the exposition format spells them."""
+        registry = Registry()
+        ratio = registry.gauge("ratio", "Ratio", ("kind",))
+
+        ratio.set(float("nan"), kind="nan")
+        ratio.set(float("-inf"), kind="low")
+
+        text = registry.render()
+        assert 'ratio{kind="nan"} NaN' in text
+        assert 'ratio{kind="low"} -Inf' in text
@@ -1,10 +1,15 @@
 """Tests for spec and runtime readers."""
 
+import asyncio
+import sqlite3
+import threading
+import time
 from pathlib import Path
 
 import pytest
 import yaml
 
+from lsspy.readers.pool import ReadDeadlineError, ReaderPool
 from lsspy.readers.runtime import RuntimeReader
 from lsspy.readers.spec import SpecReader
 
@@ -345,6 +350,56 @@ class TestRuntimeReader:
 
         assert events == []
 
+    def test_stream_events_in_batches(self, runtime_db: Path) -> None:
+        """Test streamed events come in batches matching a plain read."""
+        with sqlite3.connect(runtime_db) as conn:
+            conn.executemany(
+                "INSERT INTO events (created_at, event_type, data) VALUES (?, ?, ?)",
+                [("2025-01-01T00:00:00Z", "task.created", "{}")] * 30,
+            )
+        reader = RuntimeReader(runtime_db)
+        events = reader.stream_events(limit=30, batch_size=10)
+
+        batches = [events.fetch() for _ in range(4)]
+
+        assert [len(batch) for batch in batches] == [10, 10, 10, 0]
+        assert [e for batch in batches for e in batch] == reader.get_events(limit=30)
+
+    def test_stream_events_close(self, runtime_db: Path) -> None:
+        """Test a closed stream releases its connection and fetches nothing more."""
+        events = RuntimeReader(runtime_db).stream_events(batch_size=1)
+        assert len(events.fetch()) == 1
+
+        events.close()
+
+        assert events._conn is None
+        assert events.fetch() == []
+
+    def test_stream_events_nonexistent_db(self, temp_dir: Path) -> None:
+        """Test streaming events from a nonexistent database."""
+        events = RuntimeReader(temp_dir / "nonexistent.db").stream_events()
+
+        with pytest.raises(FileNotFoundError):
+            events.fetch()
+        assert events.fetch() == []
+
+    def test_snapshot_matches_individual_reads(self, runtime_db: Path) -> None:
+        """Test the single-transaction snapshot returns what the get_* helpers do."""
+        reader = RuntimeReader(runtime_db)
+        snapshot = reader.snapshot(messages_limit=50, events_limit=100)
+
+        assert snapshot["agents"] == reader.get_agents()
+        assert snapshot["leases"] == reader.get_leases(include_expired=False)
+        assert snapshot["messages"] == reader.get_messages(limit=50)
+        assert snapshot["events"] == reader.get_events(limit=100)
+
+    def test_snapshot_nonexistent_db(self, temp_dir: Path) -> None:
+        """Test the snapshot raises for a missing database."""
+        reader = RuntimeReader(temp_dir / "nonexistent.db")
+
+        with pytest.raises(FileNotFoundError):
+            reader.snapshot()
+
     def test_check_database_health_valid(self, runtime_db: Path) -> None:
         """Test health check on valid database."""
         reader = RuntimeReader(runtime_db)
@@ -386,3 +441,130 @@ class TestRuntimeReader:
         assert len(results) >= 1
 
         conn.close()
+
+    def test_busy_timeout_pragma(self, runtime_db: Path) -> None:
+        """Test connections wait for locks for the configured busy timeout."""
+        reader = RuntimeReader(runtime_db, timeout=0.25)
+        conn = reader._connect()
+
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 250
+        conn.close()
+
+
+class TestReaderPool:
+    """Tests for ReaderPool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_reader_calls(self, runtime_db: Path) -> None:
+        """Test calls run on the pool with their arguments."""
+        pool = ReaderPool(max_workers=2)
+        try:
+            events = await pool.run(RuntimeReader(runtime_db).get_events, limit=1)
+        finally:
+            pool.shutdown()
+
+        assert len(events) == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_locked_database(self, temp_dir: Path) -> None:
+        """Test lock errors are retried after a backoff."""
+        attempts: list[int] = []
+
+        def read() -> str:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return "ok"
+
+        pool = ReaderPool(retry_delay=0.01)
+        try:
+            assert await pool.run(read) == "ok"
+            # Other errors are not retried
+            empty_db = temp_dir / "empty.sqlite"
+            sqlite3.connect(str(empty_db)).close()
+            with pytest.raises(sqlite3.OperationalError, match="no such table"):
+                await pool.run(RuntimeReader(empty_db).read_table, "agents")
+        finally:
+            pool.shutdown()
+
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_deadline(self) -> None:
+        """Test a stalled read fails its request without blocking the loop."""
+        pool = ReaderPool(deadline=0.1)
+        try:
+            with pytest.raises(ReadDeadlineError):
+                await pool.run(time.sleep, 1.0)
+            # The loop stayed responsive while the read stalled
+            assert await asyncio.wait_for(asyncio.sleep(0, "free"), 0.1) == "free"
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_deadline_timed_from_start(self) -> None:
+        """Test a deadline can leave out the time a call waited for a thread."""
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(5)
+
+        def read(seconds: float) -> float:
+            time.sleep(seconds)
+            return seconds
+
+        pool = ReaderPool(max_workers=1)
+        try:
+            busy = asyncio.ensure_future(pool.run(block))
+            await asyncio.to_thread(started.wait, 5)
+            with pytest.raises(ReadDeadlineError):
+                await pool.run(read, 0.01, deadline=0.1)
+            # Queued behind the busy thread for longer than its deadline
+            queued = asyncio.ensure_future(
+                pool.run(read, 0.02, deadline=0.1, timed_from_start=True)
+            )
+            await asyncio.sleep(0.2)
+            assert not queued.done()
+            release.set()
+            assert await queued == 0.02
+            # A call still too slow once running fails its deadline
+            with pytest.raises(ReadDeadlineError):
+                await pool.run(read, 0.5, deadline=0.1, timed_from_start=True)
+            await busy
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self) -> None:
+        """Test identical concurrent calls share reads but never get older data."""
+        started = threading.Event()
+        release = threading.Event()
+        reads: list[int] = []
+
+        def read(name: str) -> int:
+            reads.append(1)
+            started.set()
+            release.wait(5)
+            return len(reads)
+
+        pool = ReaderPool()
+        try:
+            first = asyncio.ensure_future(pool.run(read, "tasks"))
+            await asyncio.to_thread(started.wait, 5)
+            # Arrive while the first read runs: all share one follow-up read
+            later = [asyncio.ensure_future(pool.run(read, "tasks")) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            release.set()
+            results = await asyncio.gather(first, *later)
+            stats = pool.stats()
+        finally:
+            pool.shutdown()
+
+        assert results == [1, 2, 2, 2, 2, 2]
+        assert len(reads) == 2
+        assert stats["coalesced"] == 5
+        assert stats["queued"] == 0
+        assert stats["completed"] == 2
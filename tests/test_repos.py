@@ -0,0 +1,72 @@
+"""Tests for the monitored repository registry."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from lsspy.repos import Repo, RepoRegistry, repo_name_for
+
+
+class TestRepoRegistry:
+    """Tests for RepoRegistry and Repo."""
+
+    def test_repo_name_for(self, temp_dir: Path) -> None:
+        """Test names are derived from the directory holding .lodestar."""
+        assert repo_name_for(temp_dir / "my project" / ".lodestar") == "my-project"
+        assert repo_name_for(temp_dir / "plain") == "plain"
+
+    def test_add_derives_unique_names(self, temp_dir: Path) -> None:
+        """Test derived names get a suffix when taken."""
+        registry = RepoRegistry()
+        first = registry.add(temp_dir / "a" / "app" / ".lodestar")
+        second = registry.add(temp_dir / "b" / "app" / ".lodestar")
+
+        assert (first.name, second.name) == ("app", "app-2")
+        assert registry.default is first
+        assert registry.names() == ["app", "app-2"]
+        assert registry.get("app-2") is second
+
+    def test_add_rejects_bad_names(self, lodestar_dir: Path) -> None:
+        """Test explicit names must be unique and URL-safe."""
+        registry = RepoRegistry()
+        registry.add(lodestar_dir, name="repo")
+
+        with pytest.raises(ValueError):
+            registry.add(lodestar_dir, name="repo")
+        with pytest.raises(ValueError):
+            registry.add(lodestar_dir, name="has:colon")
+
+    def test_readers_are_lazy(self, lodestar_dir: Path) -> None:
+        """Test readers are only created on first use."""
+        repo = Repo("repo", lodestar_dir)
+        assert repo.loaded is False
+
+        assert repo.runtime_reader is repo.runtime_reader
+        assert repo.loaded is True
+        assert repo.history_store is None
+
+    def test_evict_idle(self, lodestar_dir: Path) -> None:
+        """Test idle repositories are released unless kept."""
+        registry = RepoRegistry()
+        idle = registry.add(lodestar_dir, name="idle")
+        kept = registry.add(lodestar_dir, name="kept")
+        for repo in (idle, kept):
+            _ = repo.spec_reader
+            repo.store_snapshot({"agents": []})
+            repo.last_active = time.monotonic() - 60
+
+        assert registry.evict_idle(30, keep={"kept"}) == ["idle"]
+        assert idle.loaded is False
+        assert kept.loaded is True
+
+    def test_fresh_snapshot(self, lodestar_dir: Path) -> None:
+        """Test cached snapshots expire."""
+        repo = Repo("repo", lodestar_dir)
+        assert repo.fresh_snapshot(5) is None
+
+        repo.store_snapshot({"agents": []})
+        assert repo.fresh_snapshot(5) == {"agents": []}
+
+        repo.snapshot_at -= 10
+        assert repo.fresh_snapshot(5) is None
@@ -0,0 +1,95 @@
+"""Tests for the shared snapshot store."""
+
+import struct
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from lsspy.snapshots import SnapshotStore
+
+
+class TestSnapshotStore:
+    """Tests for SnapshotStore."""
+
+    def test_write_and_read(self, temp_dir: Path) -> None:
+        """Test a reader sees the newest snapshot and its version."""
+        directory = temp_dir / "snapshots"
+        directory.mkdir()
+        writer = SnapshotStore(directory)
+        reader = SnapshotStore(directory, readonly=True)
+
+        assert reader.read("main:agents") is None
+        assert writer.write("main:agents", b"[1]") == 1
+        assert writer.write("main:agents", b"[1,2]") == 2
+
+        assert reader.read("main:agents") == (2, b"[1,2]")
+        assert reader.version("main:agents") == 2
+        assert reader.version("main:tasks") == 0
+        with pytest.raises(PermissionError):
+            reader.write("main:agents", b"[]")
+
+        reader.close()
+        writer.close(remove=True)
+        assert not directory.exists()
+
+    def test_reader_follows_growing_file(self, temp_dir: Path) -> None:
+        """Test a reader remaps once a snapshot outgrows its mapping."""
+        writer = SnapshotStore(temp_dir)
+        reader = SnapshotStore(temp_dir, readonly=True)
+        writer.write("*:all-repos", b"x")
+        assert reader.read("*:all-repos") == (1, b"x")
+
+        large = b"y" * 200_000
+        writer.write("*:all-repos", large)
+        assert reader.read("*:all-repos") == (2, large)
+
+    def test_reader_waits_out_writer(self, temp_dir: Path) -> None:
+        """Test a snapshot mid-write (odd sequence) is never returned."""
+        writer = SnapshotStore(temp_dir)
+        writer.write("main:tasks", b"[]")
+        path = next(temp_dir.glob("*.snap"))
+        with open(path, "r+b") as f:
+            f.write(struct.pack("<Q", 3))
+
+        reader = SnapshotStore(temp_dir, readonly=True)
+        assert reader.read("main:tasks", timeout=0.01) is None
+
+        # Waiting out the writer does not hold up other keys
+        writer.write("main:agents", b"[]")
+        waiting = threading.Thread(target=reader.read, args=("main:tasks", 0.5))
+        waiting.start()
+        try:
+            started = time.monotonic()
+            assert reader.read("main:agents") == (1, b"[]")
+            assert reader.version("main:tasks") == 1
+            assert time.monotonic() - started < 0.25
+        finally:
+            waiting.join()
+
+    def test_concurrent_reads_are_never_torn(self, temp_dir: Path) -> None:
+        """Test readers racing a writer only see complete snapshots."""
+        writer = SnapshotStore(temp_dir)
+        reader = SnapshotStore(temp_dir, readonly=True)
+        writer.write("main:events", b"a")
+        stop = threading.Event()
+
+        def write_loop() -> None:
+            count = 0
+            while not stop.is_set():
+                count += 1
+                fill = b"ab"[count % 2 : count % 2 + 1]
+                writer.write("main:events", fill * (1000 + count % 5000))
+
+        thread = threading.Thread(target=write_loop)
+        thread.start()
+        try:
+            for _ in range(2000):
+                snapshot = reader.read("main:events")
+                assert snapshot is not None
+                _, payload = snapshot
+                assert len(set(payload)) == 1
+        finally:
+            stop.set()
+            thread.join()
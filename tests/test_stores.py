@@ -0,0 +1,220 @@
+"""Tests for lsspy-owned sidecar stores."""
+
+import sqlite3
+from datetime import UTC, datetime
+from pathlib import Path
+
+from lsspy.readers.runtime import RuntimeReader
+from lsspy.stores.history import HistoryStore, diff_states
+from lsspy.stores.rollups import EventRollupStore, bucket_start, format_bucket
+from lsspy.stores.sidecar import sidecar_dir
+
+
+def _insert_event(
+    db_path: Path, created_at: str, event_type: str, agent_id: str | None, task_id: str | None
+) -> None:
+    """Append an event row to a runtime database."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "INSERT INTO events (created_at, event_type, agent_id, task_id) VALUES (?, ?, ?, ?)",
+        (created_at, event_type, agent_id, task_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestEventRollupStore:
+    """Tests for EventRollupStore class."""
+
+    def test_sidecar_dir_is_gitignored(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test the sidecar directory is created lazily with a .gitignore."""
+        path = sidecar_dir(lodestar_dir)
+        assert not path.exists()
+
+        store = EventRollupStore(path / "rollups.sqlite")
+        store.update(RuntimeReader(runtime_db))
+
+        assert (path / "rollups.sqlite").exists()
+        assert (path / ".gitignore").read_text().strip() == "*"
+
+    def test_bucket_start(self) -> None:
+        """Test truncating timestamps to bucket boundaries."""
+        ts = datetime(2025, 1, 15, 10, 42, 17)
+        assert format_bucket(bucket_start(ts, "minute")) == "2025-01-15T10:42:00Z"
+        assert format_bucket(bucket_start(ts, "hour")) == "2025-01-15T10:00:00Z"
+        assert format_bucket(bucket_start(ts, "day")) == "2025-01-15T00:00:00Z"
+
+    def test_update_builds_rollups(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test events are counted per bucket and grouping key."""
+        _insert_event(runtime_db, "2025-01-01T00:30:00Z", "task.claimed", "A001", "T002")
+        _insert_event(runtime_db, "2025-01-01T01:05:00+00:00", "task.done", "A001", "T001")
+        store = EventRollupStore(sidecar_dir(lodestar_dir) / "rollups.sqlite")
+
+        assert store.update(RuntimeReader(runtime_db)) == 3
+        assert store.last_event_id == 3
+
+        hourly = store.query(resolution="hour")
+        assert hourly == [
+            {"bucket": "2025-01-01T00:00:00Z", "key": "task.claimed", "count": 2},
+            {"bucket": "2025-01-01T01:00:00Z", "key": "task.done", "count": 1},
+        ]
+        daily = store.query(resolution="day", group_by="none")
+        assert daily == [{"bucket": "2025-01-01T00:00:00Z", "key": None, "count": 3}]
+        by_task = store.query(resolution="day", group_by="task", event_type="task.claimed")
+        assert [p["key"] for p in by_task] == ["T001", "T002"]
+
+    def test_update_is_incremental(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test only events newer than the cursor are folded in."""
+        reader = RuntimeReader(runtime_db)
+        store = EventRollupStore(sidecar_dir(lodestar_dir) / "rollups.sqlite", batch_size=1)
+        assert store.update(reader) == 1
+        assert store.update(reader) == 0
+
+        _insert_event(runtime_db, "2025-01-01T00:10:00Z", "task.claimed", "A001", "T001")
+        assert store.update(reader) == 1
+        assert store.query(resolution="minute", group_by="none") == [
+            {"bucket": "2025-01-01T00:00:00Z", "key": None, "count": 1},
+            {"bucket": "2025-01-01T00:10:00Z", "key": None, "count": 1},
+        ]
+
+    def test_update_resets_when_runtime_recreated(
+        self, lodestar_dir: Path, runtime_db: Path
+    ) -> None:
+        """Test rollups are rebuilt if event IDs go backwards."""
+        reader = RuntimeReader(runtime_db)
+        store = EventRollupStore(sidecar_dir(lodestar_dir) / "rollups.sqlite")
+        _insert_event(runtime_db, "2025-01-01T00:10:00Z", "task.claimed", "A001", "T001")
+        store.update(reader)
+
+        conn = sqlite3.connect(str(runtime_db))
+        conn.execute("DELETE FROM events WHERE event_id = 2")
+        conn.execute("DELETE FROM sqlite_sequence")
+        conn.commit()
+        conn.close()
+
+        store.update(reader)
+        assert store.last_event_id == 1
+        assert store.query(resolution="day", group_by="none")[0]["count"] == 1
+
+    def test_update_missing_runtime_keeps_rollups(
+        self, lodestar_dir: Path, runtime_db: Path
+    ) -> None:
+        """Test an unreadable runtime database does not wipe the rollups."""
+        store = EventRollupStore(sidecar_dir(lodestar_dir) / "rollups.sqlite")
+        store.update(RuntimeReader(runtime_db))
+
+        assert store.update(RuntimeReader(lodestar_dir / "missing.sqlite")) == 0
+        assert store.last_event_id == 1
+
+    def test_query_time_range(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test since/until bound the returned buckets."""
+        _insert_event(runtime_db, "2025-01-02T12:00:00Z", "task.done", "A001", "T001")
+        store = EventRollupStore(sidecar_dir(lodestar_dir) / "rollups.sqlite")
+        store.update(RuntimeReader(runtime_db))
+
+        points = store.query(resolution="day", since=datetime(2025, 1, 2, 6), group_by="none")
+        assert points == [{"bucket": "2025-01-02T00:00:00Z", "key": None, "count": 1}]
+        points = store.query(resolution="day", until=datetime(2025, 1, 2), group_by="none")
+        assert points == [{"bucket": "2025-01-01T00:00:00Z", "key": None, "count": 1}]
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore class."""
+
+    @staticmethod
+    def _state(agents: dict | None = None, tasks: dict | None = None) -> dict:
+        """Build a history state with the given scopes."""
+        return {"agents": agents or {}, "leases": {}, "tasks": tasks or {}}
+
+    def test_diff_states(self) -> None:
+        """Test diffs contain only added, changed and removed entities."""
+        old = self._state(tasks={"T001": "ready", "T002": "ready", "T003": "done"})
+        new = self._state(tasks={"T001": "ready", "T002": "done", "T004": "ready"})
+
+        assert sorted(diff_states(old, new)) == [
+            ("tasks", "T002", "done"),
+            ("tasks", "T003", None),
+            ("tasks", "T004", "ready"),
+        ]
+
+    def test_diff_states_skips_missing_scopes(self) -> None:
+        """Test scopes absent from the new state are not treated as emptied."""
+        old = self._state(agents={"A001": {"role": "dev"}}, tasks={"T001": "ready"})
+
+        assert diff_states(old, {"tasks": {"T001": "done"}}) == [("tasks", "T001", "done")]
+
+    def test_record_appends_only_changes(self, lodestar_dir: Path) -> None:
+        """Test unchanged states append nothing."""
+        store = HistoryStore(sidecar_dir(lodestar_dir) / "history.sqlite")
+
+        assert store.record(self._state(tasks={"T001": "ready", "T002": "ready"}), ts=100) == 2
+        assert store.record(self._state(tasks={"T001": "ready", "T002": "ready"}), ts=110) == 0
+        assert store.record(self._state(tasks={"T001": "done", "T002": "ready"}), ts=120) == 1
+
+    def test_state_at(self, lodestar_dir: Path) -> None:
+        """Test reconstructing past states between and after checkpoints."""
+        store = HistoryStore(sidecar_dir(lodestar_dir) / "history.sqlite", checkpoint_every=2)
+        store.record(self._state(tasks={"T001": "ready"}), ts=100)
+        store.record(self._state(tasks={"T001": "done"}, agents={"A001": {"role": "dev"}}), ts=200)
+        store.record(self._state(tasks={"T001": "verified"}), ts=300)
+
+        assert store.state_at(50) == self._state()
+        assert store.state_at(150)["tasks"] == {"T001": "ready"}
+        assert store.state_at(250) == self._state(
+            tasks={"T001": "done"}, agents={"A001": {"role": "dev"}}
+        )
+        assert store.state_at(300) == self._state(tasks={"T001": "verified"})
+
+    def test_record_resumes_after_restart(self, lodestar_dir: Path) -> None:
+        """Test a new store instance diffs against what is already on disk."""
+        db_path = sidecar_dir(lodestar_dir) / "history.sqlite"
+        HistoryStore(db_path).record(self._state(tasks={"T001": "ready"}), ts=100)
+
+        store = HistoryStore(db_path)
+        assert store.record(self._state(tasks={"T001": "ready"}), ts=200) == 0
+        assert store.record(self._state(tasks={"T001": "done"}), ts=300) == 1
+
+    def test_compact(self, lodestar_dir: Path) -> None:
+        """Test compaction keeps states after the horizon reconstructible."""
+        store = HistoryStore(sidecar_dir(lodestar_dir) / "history.sqlite")
+        store.record(self._state(tasks={"T001": "ready"}), ts=100)
+        store.record(self._state(tasks={"T001": "done"}), ts=200)
+        store.record(self._state(tasks={"T001": "verified"}), ts=300)
+
+        assert store.compact(before=250) == 2
+        assert store.state_at(100) == self._state()
+        assert store.state_at(260)["tasks"] == {"T001": "done"}
+        assert store.state_at(300)["tasks"] == {"T001": "verified"}
+
+    def test_record_events(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test runtime events are copied incrementally and indexed by time."""
+        reader = RuntimeReader(runtime_db)
+        store = HistoryStore(sidecar_dir(lodestar_dir) / "history.sqlite")
+        assert store.record_events(reader) == 1
+        assert store.record_events(reader) == 0
+
+        _insert_event(runtime_db, "2025-01-01T00:10:00Z", "task.done", "A001", "T001")
+        assert store.record_events(reader) == 1
+
+        jan1 = datetime(2025, 1, 1, tzinfo=UTC).timestamp()
+        assert [e["event_type"] for e in store.events_before(jan1 + 3600)] == [
+            "task.done",
+            "task.claimed",
+        ]
+        assert store.events_before(jan1 - 1) == []
+
+    def test_timeline(self, lodestar_dir: Path, runtime_db: Path) -> None:
+        """Test changes and events are merged into time-ordered frames."""
+        store = HistoryStore(sidecar_dir(lodestar_dir) / "history.sqlite")
+        jan1 = datetime(2025, 1, 1, tzinfo=UTC).timestamp()
+        store.record(self._state(tasks={"T001": "ready"}), ts=jan1 - 10)
+        store.record(self._state(tasks={"T001": "done"}), ts=jan1 + 10)
+        store.record_events(RuntimeReader(runtime_db))
+
+        frames = list(store.timeline(jan1 - 10, jan1 + 60, page_size=1))
+
+        assert [ts for ts, _, _ in frames] == [jan1, jan1 + 10]
+        assert frames[0][1] == []
+        assert frames[0][2][0]["event_type"] == "task.claimed"
+        assert frames[1][1] == [("tasks", "T001", "done")]
+        assert frames[1][2] == []
@@ -0,0 +1,146 @@
+"""Tests for the Server-Sent Events stream."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+import pytest
+import uvicorn
+
+from lsspy import server
+from lsspy.server import create_app, set_lodestar_dir
+from lsspy.streams import StreamHub
+
+
+@contextmanager
+def serve() -> Iterator[str]:
+    """Run the app on a free local port (the test client buffers whole responses)."""
+    config = uvicorn.Config(create_app(), host="127.0.0.1", port=0, log_level="warning")
+    uv_server = uvicorn.Server(config)
+    thread = threading.Thread(target=uv_server.run, daemon=True)
+    thread.start()
+    while not uv_server.started:
+        time.sleep(0.01)
+    port = uv_server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        uv_server.should_exit = True
+        thread.join(timeout=10)
+
+
+def read_events(lines: Iterator[str], count: int) -> list[tuple[str, dict]]:
+    """Read the next events of a stream as (event ID, message) pairs."""
+    events: list[tuple[str, dict]] = []
+    event_id = ""
+    for line in lines:
+        if line.startswith("id: "):
+            event_id = line[4:]
+        elif line.startswith("data: "):
+            events.append((event_id, json.loads(line[6:])))
+            if len(events) == count:
+                break
+    return events
+
+
+class TestStreamHub:
+    """Tests for StreamHub."""
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_followers_only(self) -> None:
+        """Test messages are queued only for streams following their scope."""
+        hub = StreamHub()
+        agents = hub.add({("main", "agents")})
+        tasks = hub.add({("main", "tasks")})
+
+        assert hub.publish("main", "agents", "{}") == 1
+        assert agents.queue.get_nowait() == (1, "agents", "{}")
+        assert tasks.queue.empty()
+
+        hub.remove(agents)
+        assert hub.keys() == {("main", "tasks")}
+        assert hub.subscriber_count == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_sends_changed_and_untracked_scopes(self) -> None:
+        """Test stale keys after a reconnect."""
+        hub = StreamHub()
+        keys = {("main", "agents"), ("main", "tasks"), ("main", "events")}
+        hub.publish("main", "agents", "{}")
+        hub.publish("main", "tasks", "{}")
+        since = hub.last_seq
+        hub.publish("main", "tasks", "{}")
+        hub.forget("main", "events")
+
+        assert hub.parse_event_id(hub.event_id(since)) == since
+        assert hub.parse_event_id(f"other-{since}") is None
+        assert hub.stale_keys(keys, since) == {("main", "tasks"), ("main", "events")}
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self) -> None:
+        """Test a full queue ends the stream instead of blocking publishers."""
+        hub = StreamHub()
+        subscriber = hub.add({("main", "agents")})
+        for _ in range(subscriber.queue.maxsize + 1):
+            hub.publish("main", "agents", "{}")
+
+        assert hub.subscriber_count == 0
+        assert subscriber.queue.get_nowait() is None
+
+
+class TestStreamEndpoint:
+    """Tests for /api/stream."""
+
+    def test_invalid_scope(self, lodestar_dir: Path, spec_file: Path) -> None:
+        """Test unknown scopes and repositories are rejected before streaming."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        with serve() as base, httpx.Client(base_url=base) as client:
+            assert client.get("/api/stream", params={"scope": "nope"}).status_code == 400
+            assert client.get("/api/stream", params={"repo": "missing"}).status_code == 404
+
+    def test_initial_data_live_updates_and_resume(
+        self, lodestar_dir: Path, spec_file: Path, runtime_db: Path
+    ) -> None:
+        """Test the stream sends current state, live changes, then resumes."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        params = {"scope": "agents,tasks"}
+        with serve() as base, httpx.Client(base_url=base, timeout=10) as client:
+            with client.stream("GET", "/api/stream", params=params) as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                lines = response.iter_lines()
+                initial = read_events(lines, 2)
+                assert {msg["scope"] for _, msg in initial} == {"agents", "tasks"}
+
+                conn = sqlite3.connect(str(runtime_db))
+                conn.execute("UPDATE agents SET display_name = 'Renamed'")
+                conn.commit()
+                conn.close()
+                server.trigger_broadcast("main")
+
+                # Tasks may follow only if no broadcast had published them before
+                last_id, update = read_events(lines, 1)[0]
+                if update["scope"] == "tasks":
+                    last_id, update = read_events(lines, 1)[0]
+                assert update["scope"] == "agents"
+                assert update["data"][0]["displayName"] == "Renamed"
+
+            # Agents did not change since the last event, so only their next change follows
+            headers = {"Last-Event-ID": last_id}
+            with client.stream("GET", "/api/stream", params=params, headers=headers) as response:
+                conn = sqlite3.connect(str(runtime_db))
+                conn.execute("UPDATE agents SET display_name = 'Renamed again'")
+                conn.commit()
+                conn.close()
+                server.trigger_broadcast("main")
+                resumed_lines = response.iter_lines()
+                event_id, resumed = read_events(resumed_lines, 1)[0]
+                if resumed["scope"] == "tasks":
+                    event_id, resumed = read_events(resumed_lines, 1)[0]
+                assert event_id != last_id
+                assert resumed["scope"] == "agents"
+                assert resumed["data"][0]["displayName"] == "Renamed again"
@@ -0,0 +1,161 @@
+"""Tests for pipeline tracing."""
+
+import json
+import time
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from watchdog.events import FileModifiedEvent
+
+from lsspy import server, tracing
+from lsspy.server import create_app, set_lodestar_dir
+from lsspy.watcher import DebouncedEventHandler
+
+
+class ListExporter(tracing.SpanExporter):
+    """Keep finished spans in memory."""
+
+    def __init__(self) -> None:
+        """Initialize an empty span list."""
+        self.spans: list[tracing.Span] = []
+
+    def export(self, span: tracing.Span) -> None:
+        """Keep a finished span."""
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter() -> Iterator[ListExporter]:
+    """Turn tracing on for one test."""
+    exporter = ListExporter()
+    tracing.set_exporter(exporter)
+    yield exporter
+    tracing.set_exporter(None)
+
+
+class TestSpans:
+    """Tests for the span API."""
+
+    def test_disabled_by_default(self) -> None:
+        """Test spans are no-ops without an exporter."""
+        assert not tracing.enabled()
+        with tracing.span("step", scope="tasks") as span:
+            span.set(clients=3)
+            assert tracing.current_span() is None
+        assert span is tracing.NOOP_SPAN
+
+    def test_exporter_must_export(self) -> None:
+        """Test an exporter without export() cannot be created."""
+        with pytest.raises(TypeError):
+            tracing.SpanExporter()  # type: ignore[abstract]
+
+    def test_nested_spans(self, exporter: ListExporter) -> None:
+        """Test children join their parent's trace and errors are recorded."""
+        with tracing.span("outer") as outer:
+            with pytest.raises(ValueError), tracing.span("inner", scope="tasks"):
+                raise ValueError("boom")
+            assert tracing.current_span() is outer
+        assert tracing.current_span() is None
+
+        inner, recorded_outer = exporter.spans
+        assert recorded_outer is outer
+        assert inner.trace_id == outer.trace_id
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id is None
+        assert inner.attributes == {"scope": "tasks", "error": "ValueError"}
+        assert inner.duration is not None
+
+    def test_json_lines_exporter(self, temp_dir: Path) -> None:
+        """Test spans are appended as JSON lines."""
+        path = temp_dir / "trace.jsonl"
+        exporter = tracing.JsonLinesExporter(path)
+        tracing.set_exporter(exporter)
+        try:
+            with tracing.span("outer"), tracing.span("inner", clients=2):
+                pass
+        finally:
+            tracing.set_exporter(None)
+            exporter.close()
+
+        inner, outer = (json.loads(line) for line in path.read_text().splitlines())
+        assert inner["name"] == "inner"
+        assert inner["attributes"] == {"clients": 2}
+        assert inner["parent_id"] == outer["span_id"]
+        assert outer["duration_ms"] >= inner["duration_ms"]
+
+    def test_trace_file_open_while_serving(self, temp_dir: Path, lodestar_dir: Path) -> None:
+        """Test the server opens the trace file at startup and closes it at shutdown."""
+        path = temp_dir / "trace.jsonl"
+        set_lodestar_dir(lodestar_dir, name="main")
+        server.set_trace_file(path)
+        try:
+            with TestClient(create_app()):
+                assert tracing.enabled()
+                exporter = server._trace_exporter
+                assert isinstance(exporter, tracing.JsonLinesExporter)
+                with tracing.span("step"):
+                    pass
+        finally:
+            server.set_trace_file(None)
+
+        assert not tracing.enabled()
+        assert server._trace_exporter is None
+        assert exporter._file is None
+        assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == ["step"]
+
+
+class TestPipelineTracing:
+    """Tests for the spans of one file change."""
+
+    def test_file_change_to_delivery(
+        self,
+        exporter: ListExporter,
+        lodestar_dir: Path,
+        spec_file: Path,
+        runtime_db: Path,
+    ) -> None:
+        """Test every step from file event to delivery shares one trace."""
+        set_lodestar_dir(lodestar_dir, name="main")
+        manager = server.connection_manager
+        subscriber = manager.streams.add({("main", "agents")})
+        handler = DebouncedEventHandler(
+            lodestar_dir, partial(server.trigger_broadcast, "main"), debounce_ms=20
+        )
+
+        try:
+            with TestClient(create_app()):
+                handler.on_modified(FileModifiedEvent(str(runtime_db)))
+                handler.on_modified(FileModifiedEvent(str(spec_file)))
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    if any(
+                        s.name == "broadcast.deliver" and s.attributes["scope"] == "agents"
+                        for s in exporter.spans
+                    ):
+                        break
+                    time.sleep(0.02)
+        finally:
+            manager.streams.remove(subscriber)
+
+        root = next(s for s in exporter.spans if s.name == "watcher.file_event")
+        assert root.attributes["file"] == "runtime.sqlite"
+        assert root.attributes["events"] == 2
+        trace = [s for s in exporter.spans if s.trace_id == root.trace_id]
+        names = {s.name for s in trace}
+        assert {
+            "watcher.debounce",
+            "trigger_broadcast",
+            "broadcast_all",
+            "gather",
+            "gather.scope",
+            "broadcast",
+            "broadcast.serialize",
+            "broadcast.deliver",
+        } <= names
+        deliver = next(
+            s for s in trace if s.name == "broadcast.deliver" and s.attributes["scope"] == "agents"
+        )
+        assert deliver.attributes["clients"] == 1
@@ -4,7 +4,7 @@ import time
 from pathlib import Path
 from unittest.mock import Mock
 
-from lsspy.watcher import DebouncedEventHandler, LodestarWatcher
+from lsspy.watcher import DebouncedEventHandler, LodestarWatcher, WatcherPool
 
 
 class TestDebouncedEventHandler:
@@ -74,6 +74,21 @@ class TestDebouncedEventHandler:
         # Callback should be called once despite multiple events
         assert callback.call_count == 1
 
+    def test_debounce_state(self, lodestar_dir: Path) -> None:
+        """Test the pending change is reported until the debounce fires."""
+        callback = Mock()
+        handler = DebouncedEventHandler(lodestar_dir, callback, debounce_ms=50)
+
+        from watchdog.events import FileModifiedEvent
+
+        handler.on_modified(FileModifiedEvent(str(lodestar_dir / "spec.yaml")))
+        handler.on_modified(FileModifiedEvent(str(lodestar_dir / "runtime.sqlite")))
+        assert handler.debounce_state() == {"pending": True, "waiting": True, "events": 2}
+
+        time.sleep(0.15)
+        assert handler.debounce_state() == {"pending": False, "waiting": False, "events": 0}
+        callback.assert_called_once()
+
     def test_on_modified_directory_ignored(self, lodestar_dir: Path) -> None:
         """Test that directory modification events are ignored."""
         callback = Mock()
@@ -225,3 +240,51 @@ class TestLodestarWatcher:
 
         # Should be called fewer times than changes made
         assert callback.call_count < 5
+
+
+class TestWatcherPool:
+    """Tests for WatcherPool class."""
+
+    def test_watches_several_directories(
+        self, temp_dir: Path, lodestar_dir: Path, spec_file: Path
+    ) -> None:
+        """Test one pool delivering changes from several directories."""
+        other_dir = temp_dir / "other" / ".lodestar"
+        other_dir.mkdir(parents=True)
+        other_spec = other_dir / "spec.yaml"
+        other_spec.write_text("tasks: {}\n")
+
+        first, second = Mock(), Mock()
+        pool = WatcherPool(debounce_ms=50, max_workers=1)
+        pool.watch(lodestar_dir, first)
+        pool.watch(other_dir, second)
+        pool.start()
+        assert pool.is_alive() is True
+        assert set(pool.watched) == {lodestar_dir, other_dir}
+
+        with open(spec_file, "a") as f:
+            f.write("\n# Modified")
+        with open(other_spec, "a") as f:
+            f.write("\n# Modified")
+        time.sleep(0.3)
+
+        pool.stop()
+        assert first.call_count >= 1
+        assert second.call_count >= 1
+        assert pool.is_alive() is False
+
+    def test_unwatch(self, lodestar_dir: Path, spec_file: Path) -> None:
+        """Test that an unwatched directory no longer triggers callbacks."""
+        callback = Mock()
+        pool = WatcherPool(debounce_ms=50)
+        pool.start()
+        pool.watch(lodestar_dir, callback)
+        pool.unwatch(lodestar_dir)
+        assert pool.watched == []
+
+        with open(spec_file, "a") as f:
+            f.write("\n# Modified")
+        time.sleep(0.2)
+
+        pool.stop()
+        callback.assert_not_called()